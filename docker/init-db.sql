@@ -19,9 +19,26 @@ CREATE TABLE IF NOT EXISTS resumes (
 );
 
 -- Create index for vector similarity search (cosine similarity)
--- Note: ivfflat index works best with 1000+ rows; for smaller datasets, exact search is used
-CREATE INDEX IF NOT EXISTS resumes_embedding_idx ON resumes 
-USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
+-- HNSW needs no training data, so it is safe to create on the empty table.
+-- An ivfflat index built here would train its centroids on zero rows; after a large
+-- import, rebuild with parameters sized to the data:
+--   uv run resume-matcher index --method hnsw      (or --method ivfflat)
+CREATE INDEX IF NOT EXISTS resumes_embedding_idx ON resumes
+USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+
+-- Per-chunk embeddings of long resumes (EMBEDDING_CHUNKING=true), used by
+-- max-chunk matching (MATCH_SCORING=max_chunk)
+CREATE TABLE IF NOT EXISTS resume_chunks (
+    resume_id INTEGER NOT NULL REFERENCES resumes (id) ON DELETE CASCADE,
+    chunk_index INTEGER NOT NULL,
+    start_char INTEGER NOT NULL,
+    end_char INTEGER NOT NULL,
+    embedding vector(1024) NOT NULL,
+    PRIMARY KEY (resume_id, chunk_index)
+);
+
+CREATE INDEX IF NOT EXISTS resume_chunks_embedding_idx ON resume_chunks
+USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
 
 -- Create index for faster file path lookups
 CREATE INDEX IF NOT EXISTS resumes_file_path_idx ON resumes (file_path);
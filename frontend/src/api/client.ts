@@ -70,6 +70,7 @@ export interface LLMMatchedResumeResponse {
   strengths: string[];
   concerns: string[];
   explanation: string;
+  cached?: boolean;
 }
 
 export interface VacancyInfo {
@@ -79,6 +80,7 @@ export interface VacancyInfo {
   nice_to_have_skills: string[];
   min_years_experience: number | null;
   summary: string;
+  cached?: boolean;
 }
 
 export interface LLMMatchResponse {
@@ -86,6 +88,8 @@ export interface LLMMatchResponse {
   vacancy: VacancyInfo;
   matches_found: number;
   matches: LLMMatchedResumeResponse[];
+  llm_cache_hits?: number;
+  timings?: Record<string, number>; // stage durations in ms
 }
 
 export type MatchResponse = EmbeddingMatchResponse | LLMMatchResponse;
@@ -100,6 +104,14 @@ export interface MatchRequest {
   lang?: string; // Language for LLM responses: 'en' | 'ru'
 }
 
+// Events of POST /match/stream (Server-Sent Events), in order
+export interface MatchStreamHandlers {
+  onShortlist?: (matches: MatchedResumeResponse[]) => void;
+  onVacancy?: (vacancy: VacancyInfo) => void;
+  onScore?: (match: LLMMatchedResumeResponse, scored: number, total: number) => void;
+  onRanking?: (response: LLMMatchResponse) => void;
+}
+
 export interface ImportResponse {
   status: string;
   files_found: number;
@@ -170,6 +182,71 @@ export const api = {
       body: JSON.stringify(request),
     }),
 
+  // LLM matching with results pushed as they complete; resolves after the final ranking
+  matchStream: async (
+    request: MatchRequest,
+    handlers: MatchStreamHandlers,
+    signal?: AbortSignal
+  ): Promise<void> => {
+    let response: Response;
+    try {
+      response = await fetch(`${API_BASE}/match/stream`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ ...request, use_llm: true }),
+        signal,
+      });
+    } catch (error) {
+      if ((error as Error).name === 'AbortError') throw error;
+      throw new ApiError(0, 'Network error - is the backend running?');
+    }
+
+    if (!response.ok || !response.body) {
+      const error = await response.json().catch(() => ({ detail: 'Unknown error' }));
+      throw new ApiError(response.status, error.detail || `HTTP ${response.status}`);
+    }
+
+    const dispatch = (frame: string) => {
+      let event = 'message';
+      let data = '';
+      for (const line of frame.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      if (!data) return;
+      const payload = JSON.parse(data);
+      switch (event) {
+        case 'shortlist':
+          handlers.onShortlist?.(payload.matches);
+          break;
+        case 'vacancy':
+          handlers.onVacancy?.(payload);
+          break;
+        case 'score':
+          handlers.onScore?.(payload.match, payload.scored, payload.total);
+          break;
+        case 'ranking':
+          handlers.onRanking?.(payload);
+          break;
+        case 'error':
+          throw new ApiError(500, payload.detail);
+      }
+    };
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += value;
+      let end: number;
+      while ((end = buffer.indexOf('\n\n')) !== -1) {
+        dispatch(buffer.slice(0, end));
+        buffer = buffer.slice(end + 2);
+      }
+    }
+  },
+
   matchFile: async (
     file: File,
     params?: { top_n?: number; use_llm?: boolean }
@@ -9,7 +9,12 @@ import {
   FileText,
   X
 } from 'lucide-react';
-import { api, MatchResponse, MatchRequest } from '../api/client';
+import {
+  api,
+  LLMMatchedResumeResponse,
+  MatchResponse,
+  MatchRequest,
+} from '../api/client';
 import { MatchResults } from './MatchResults';
 import clsx from 'clsx';
 
@@ -82,6 +87,7 @@ export function Match() {
       
       if (uploadedFile) {
         response = await api.matchFile(uploadedFile, { top_n: topN, use_llm: useLLM });
+        setResults(response);
       } else {
         const request: MatchRequest = {
           vacancy_text: vacancyText,
@@ -90,10 +96,30 @@ export function Match() {
           min_score: minScore,
           lang: currentLang, // Pass language for LLM responses
         };
-        response = await api.match(request);
+        if (useLLM) {
+          // Show candidates as the LLM scores them, then the final ranking
+          const scored: LLMMatchedResumeResponse[] = [];
+          await api.matchStream(request, {
+            onVacancy: (vacancy) =>
+              setResults({ mode: 'llm', vacancy, matches_found: 0, matches: [] }),
+            onScore: (match, done, total) => {
+              scored.push(match);
+              const matches = [...scored]
+                .sort((a, b) => b.combined_score - a.combined_score)
+                .slice(0, topN)
+                .map((m, i) => ({ ...m, rank: i + 1 }));
+              setResults((prev) =>
+                prev?.mode === 'llm' ? { ...prev, matches, matches_found: matches.length } : prev
+              );
+              setLoadingProgress((prev) => Math.max(prev, Math.round((done / total) * 90)));
+            },
+            onRanking: setResults,
+          });
+        } else {
+          response = await api.match(request);
+          setResults(response);
+        }
       }
-      
-      setResults(response);
     } catch (err) {
       const message = err instanceof Error ? err.message : 'Failed to match resumes';
       // Provide more helpful error messages
@@ -14,15 +14,25 @@ API Docs available at:
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import tempfile
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Annotated, Any
+from typing import TYPE_CHECKING, Annotated, Any, Literal
 
 from fastapi import FastAPI, File, Form, HTTPException, Query, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+if TYPE_CHECKING:
+    from resume_matcher.models.llm_scorer import CandidateScore, VacancyRequirements
+    from resume_matcher.services.matcher import MatchedResume, StageTimings
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +46,12 @@ class HealthResponse(BaseModel):
 
     status: str = "ok"
     version: str = "0.1.0"
+    model_loaded: bool = False
+    warmup_seconds: float | None = None
+    query_cache: dict[str, Any] = {}
+    embedding_batches: dict[str, Any] = {}
+    executors: dict[str, Any] = {}
+    llm_dispatch: dict[str, Any] = {}
 
 
 class StatsResponse(BaseModel):
@@ -93,6 +109,7 @@ class LLMMatchedResumeResponse(BaseModel):
     strengths: list[str]
     concerns: list[str]
     explanation: str
+    cached: bool = False  # score answered from the LLM cache
 
 
 class VacancyInfo(BaseModel):
@@ -104,6 +121,7 @@ class VacancyInfo(BaseModel):
     nice_to_have_skills: list[str]
     min_years_experience: int | None
     summary: str
+    cached: bool = False  # requirements answered from the LLM cache
 
 
 class LLMMatchResponse(BaseModel):
@@ -113,6 +131,8 @@ class LLMMatchResponse(BaseModel):
     vacancy: VacancyInfo
     matches_found: int
     matches: list[LLMMatchedResumeResponse]
+    llm_cache_hits: int = 0  # vacancy + returned candidates answered from the LLM cache
+    timings: dict[str, float] = {}  # stage durations in ms, incl. overlap_saved_ms
 
 
 class ResumeResponse(BaseModel):
@@ -154,6 +174,95 @@ class MatchRequest(BaseModel):
         default=30, ge=1, le=100, description="Candidates for LLM re-ranking"
     )
     lang: str = Field(default="en", description="Language for LLM responses: 'en' or 'ru'")
+    ef_search: int | None = Field(
+        default=None, ge=1, le=1000, description="HNSW search breadth (recall vs latency)"
+    )
+    probes: int | None = Field(
+        default=None, ge=1, le=10000, description="IVFFlat lists to scan (recall vs latency)"
+    )
+    scoring: Literal["document", "max_chunk"] | None = Field(
+        default=None,
+        description="'document' (resume vector) or 'max_chunk' (best matching chunk); "
+        "default: MATCH_SCORING",
+    )
+
+
+# =============================================================================
+# Response builders
+# =============================================================================
+
+
+def _vacancy_info(requirements: VacancyRequirements) -> VacancyInfo:
+    return VacancyInfo(
+        job_title=requirements.job_title or "Unknown Position",
+        seniority_level=requirements.seniority_level,
+        must_have_skills=requirements.must_have_skills or [],
+        nice_to_have_skills=requirements.nice_to_have_skills or [],
+        min_years_experience=requirements.min_years_experience,
+        summary=requirements.summary or "No summary available",
+        cached=requirements.cached,
+    )
+
+
+def _llm_match(score: CandidateScore, rank: int) -> LLMMatchedResumeResponse:
+    return LLMMatchedResumeResponse(
+        rank=rank,
+        id=score.candidate_id,
+        file_name=score.file_name,
+        combined_score=score.combined_score,
+        llm_score=score.llm_score,
+        embedding_score_percent=round(score.embedding_score * 100, 2),
+        match_level=score.match_level,
+        matching_skills=score.matching_skills,
+        missing_skills=score.missing_skills,
+        strengths=score.strengths,
+        concerns=score.concerns,
+        explanation=score.explanation,
+        cached=score.cached,
+    )
+
+
+def _matched_resume(match: MatchedResume, rank: int) -> MatchedResumeResponse:
+    return MatchedResumeResponse(
+        rank=rank,
+        id=match.id,
+        file_name=match.file_name,
+        file_path=match.file_path,
+        similarity_percent=match.score_percent,
+        candidate=CandidateInfo(
+            name=match.json_data.get("full_name"),
+            position=match.json_data.get("current_position"),
+            email=match.json_data.get("email"),
+            phone=match.json_data.get("phone"),
+            skills=match.json_data.get("skills", []),
+            years_experience=match.json_data.get("years_experience"),
+            summary=match.json_data.get("summary"),
+        ),
+    )
+
+
+def _llm_match_response(
+    requirements: VacancyRequirements,
+    scores: list[CandidateScore],
+    request: MatchRequest,
+    timings: StageTimings,
+) -> LLMMatchResponse:
+    """Final LLM ranking: applies the request's score range and ranks the rest"""
+    if request.min_score > 0 or request.max_score < 100:
+        scores = [s for s in scores if request.min_score <= s.combined_score <= request.max_score]
+
+    return LLMMatchResponse(
+        vacancy=_vacancy_info(requirements),
+        matches_found=len(scores),
+        llm_cache_hits=requirements.cached + sum(s.cached for s in scores),
+        timings=timings.as_dict(),
+        matches=[_llm_match(s, i + 1) for i, s in enumerate(scores)],
+    )
+
+
+def _sse(event: str, data: Any) -> str:
+    """One Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
 
 # =============================================================================
@@ -161,8 +270,62 @@ class MatchRequest(BaseModel):
 # =============================================================================
 
 
-def create_app() -> FastAPI:
-    """Create and configure the FastAPI application."""
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Optionally warms up the embedding model on startup (create_app(warmup=...),
+    default WARMUP_MODEL=true), loads the in-process vector index
+    (SEARCH_BACKEND=numpy; saved again on shutdown when VECTOR_INDEX_PATH is set)
+    and releases the route executors and the database pools (sync and async) on
+    shutdown.
+    """
+    from resume_matcher.config import SEARCH_BACKEND, VECTOR_INDEX_PATH, WARMUP_MODEL
+
+    app.state.warmup_seconds = None
+    warmup_on_startup = app.state.warmup_on_startup
+    if warmup_on_startup is None:
+        warmup_on_startup = WARMUP_MODEL
+    if warmup_on_startup:
+        from resume_matcher.models.embedding import warmup
+
+        app.state.warmup_seconds = round(await asyncio.to_thread(warmup), 2)
+        logger.info(f"API startup warmup took {app.state.warmup_seconds}s")
+
+    index = None
+    if SEARCH_BACKEND == "numpy":
+        from resume_matcher.services.vector_index import get_vector_index
+
+        try:
+            index = await asyncio.to_thread(get_vector_index)
+            logger.info(f"In-process vector index loaded: {len(index)} resumes")
+        except Exception as e:
+            # Retried on the first search
+            logger.error(f"Failed to load the vector index: {e}")
+
+    yield
+
+    from resume_matcher.api.executors import shutdown_executors
+
+    shutdown_executors()
+
+    if index is not None and VECTOR_INDEX_PATH:
+        # The next startup memory-maps it and only fetches rows changed since
+        index.save(VECTOR_INDEX_PATH)
+
+    from resume_matcher.db import close_pool
+    from resume_matcher.db_async import close_async_pool
+
+    await close_async_pool()
+    close_pool()
+
+
+def create_app(warmup: bool | None = None) -> FastAPI:
+    """
+    Create and configure the FastAPI application.
+
+    Args:
+        warmup: Load the embedding model on startup (default: WARMUP_MODEL)
+    """
     app = FastAPI(
         title="Resume Matcher API",
         description="""
@@ -180,8 +343,11 @@ AI-powered resume matching and ranking system.
         version="0.1.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
+    app.state.warmup_on_startup = warmup
+
     # CORS middleware for frontend integration
     app.add_middleware(
         CORSMiddleware,
@@ -215,31 +381,38 @@ def register_routes(app: FastAPI) -> None:
 
     @app.get("/health", response_model=HealthResponse, tags=["Health"])
     async def health_check() -> HealthResponse:
-        """Health check endpoint."""
-        return HealthResponse()
+        """
+        Health check endpoint. Never loads the embedding model or touches the
+        database, so it answers while heavy matches run on the executors.
+        """
+        from resume_matcher.api.executors import executor_stats
+        from resume_matcher.models.embedding import (
+            get_batcher,
+            get_query_cache_stats,
+            is_model_loaded,
+        )
+        from resume_matcher.models.llm_dispatch import get_llm_dispatch_stats
+
+        return HealthResponse(
+            model_loaded=is_model_loaded(),
+            warmup_seconds=getattr(app.state, "warmup_seconds", None),
+            query_cache=get_query_cache_stats(),
+            embedding_batches=get_batcher().stats(),
+            executors=executor_stats(),
+            llm_dispatch=get_llm_dispatch_stats(),
+        )
 
     @app.get("/stats", response_model=StatsResponse, tags=["Info"])
     async def get_stats() -> StatsResponse:
         """Get database statistics."""
-        from resume_matcher.db import get_connection
+        from resume_matcher.db_async import get_resume_counts
 
         try:
-            with get_connection() as conn, conn.cursor() as cur:
-                cur.execute("SELECT COUNT(*) as count FROM resumes")
-                total = cur.fetchone()["count"]
-
-                cur.execute("SELECT COUNT(*) as count FROM resumes WHERE embedding IS NOT NULL")
-                with_embedding = cur.fetchone()["count"]
-
-                cur.execute(
-                    "SELECT COUNT(*) as count FROM resumes WHERE json_data IS NOT NULL AND json_data != '{}'"
-                )
-                with_json = cur.fetchone()["count"]
-
+            counts = await get_resume_counts()
             return StatsResponse(
-                total_resumes=total,
-                with_embeddings=with_embedding,
-                with_parsed_data=with_json,
+                total_resumes=counts["total"],
+                with_embeddings=counts["with_embeddings"],
+                with_parsed_data=counts["with_parsed_data"],
             )
         except Exception as e:
             logger.error(f"Database connection failed: {e}")
@@ -261,64 +434,58 @@ def register_routes(app: FastAPI) -> None:
         - `use_llm=false` (default): Fast embedding-based semantic search
         - `use_llm=true`: LLM re-ranks candidates for role fit, skills match, etc.
         """
+        from resume_matcher.api.executors import get_executor, run_blocking
         from resume_matcher.services.matcher import (
-            match_vacancy_text,
+            StageTimings,
+            amatch_vacancy_text,
+            embed_vacancy_async,
             match_vacancy_with_llm,
+            start_vacancy_parse,
         )
 
         min_similarity = request.min_score / 100.0
+        timings = StageTimings()
+        requirements_future = None
+        if request.use_llm and request.vacancy_text.strip():
+            # The vacancy parse of stage 2 runs while the vacancy is embedded and searched
+            requirements_future = start_vacancy_parse(request.vacancy_text, timings)
+
+        started = time.perf_counter()
+        vacancy_embedding = await embed_vacancy_async(
+            request.vacancy_text, executor=get_executor("embedding")
+        )
+        timings.embedding = time.perf_counter() - started
 
         if request.use_llm:
-            # LLM-powered matching
-            requirements, scores = match_vacancy_with_llm(
+            # LLM-powered matching (search + Groq calls)
+            requirements, scores = await run_blocking(
+                "llm",
+                match_vacancy_with_llm,
                 vacancy_text=request.vacancy_text,
                 top_n=request.top_n,
                 embedding_candidates=request.embedding_candidates,
                 min_similarity=min_similarity,
                 lang=request.lang,
+                ef_search=request.ef_search,
+                probes=request.probes,
+                scoring=request.scoring,
+                vacancy_embedding=vacancy_embedding,
+                requirements_future=requirements_future,
+                timings=timings,
             )
 
-            # Apply score range filter
-            if request.min_score > 0 or request.max_score < 100:
-                scores = [
-                    s for s in scores if request.min_score <= s.combined_score <= request.max_score
-                ]
-
-            return LLMMatchResponse(
-                vacancy=VacancyInfo(
-                    job_title=requirements.job_title or "Unknown Position",
-                    seniority_level=requirements.seniority_level,
-                    must_have_skills=requirements.must_have_skills or [],
-                    nice_to_have_skills=requirements.nice_to_have_skills or [],
-                    min_years_experience=requirements.min_years_experience,
-                    summary=requirements.summary or "No summary available",
-                ),
-                matches_found=len(scores),
-                matches=[
-                    LLMMatchedResumeResponse(
-                        rank=i + 1,
-                        id=s.candidate_id,
-                        file_name=s.file_name,
-                        combined_score=s.combined_score,
-                        llm_score=s.llm_score,
-                        embedding_score_percent=round(s.embedding_score * 100, 2),
-                        match_level=s.match_level,
-                        matching_skills=s.matching_skills,
-                        missing_skills=s.missing_skills,
-                        strengths=s.strengths,
-                        concerns=s.concerns,
-                        explanation=s.explanation,
-                    )
-                    for i, s in enumerate(scores)
-                ],
-            )
+            return _llm_match_response(requirements, scores, request, timings)
 
         else:
-            # Embedding-only matching
-            result = match_vacancy_text(
+            # Embedding-only matching (queries awaited on the async pool)
+            result = await amatch_vacancy_text(
                 vacancy_text=request.vacancy_text,
                 top_n=request.top_n,
                 min_similarity=min_similarity,
+                ef_search=request.ef_search,
+                probes=request.probes,
+                scoring=request.scoring,
+                vacancy_embedding=vacancy_embedding,
             )
 
             # Apply score range filter
@@ -331,25 +498,7 @@ def register_routes(app: FastAPI) -> None:
             return EmbeddingMatchResponse(
                 total_resumes_in_db=result.total_resumes_in_db,
                 matches_found=len(matches),
-                matches=[
-                    MatchedResumeResponse(
-                        rank=i + 1,
-                        id=m.id,
-                        file_name=m.file_name,
-                        file_path=m.file_path,
-                        similarity_percent=m.score_percent,
-                        candidate=CandidateInfo(
-                            name=m.json_data.get("full_name"),
-                            position=m.json_data.get("current_position"),
-                            email=m.json_data.get("email"),
-                            phone=m.json_data.get("phone"),
-                            skills=m.json_data.get("skills", []),
-                            years_experience=m.json_data.get("years_experience"),
-                            summary=m.json_data.get("summary"),
-                        ),
-                    )
-                    for i, m in enumerate(matches)
-                ],
+                matches=[_matched_resume(m, i + 1) for i, m in enumerate(matches)],
             )
 
     @app.post("/match/file", tags=["Matching"])
@@ -360,12 +509,16 @@ def register_routes(app: FastAPI) -> None:
         max_score: float = Query(default=100, ge=0, le=100),
         use_llm: bool = Query(default=False),
         embedding_candidates: int = Query(default=30, ge=1, le=100),
+        ef_search: int | None = Query(default=None, ge=1, le=1000),
+        probes: int | None = Query(default=None, ge=1, le=10000),
+        scoring: Literal["document", "max_chunk"] | None = Query(default=None),
     ) -> EmbeddingMatchResponse | LLMMatchResponse:
         """
         Match resumes against a vacancy file upload.
 
         Supports PDF, DOCX, and TXT files.
         """
+        from resume_matcher.api.executors import run_blocking
         from resume_matcher.utils.convert_file_to_text import convert_file_to_text
 
         # Save uploaded file temporarily
@@ -376,8 +529,8 @@ def register_routes(app: FastAPI) -> None:
             tmp_path = tmp.name
 
         try:
-            # Extract text from file
-            vacancy_text = convert_file_to_text(tmp_path)
+            # Extract text from file (OCR is CPU-bound: runs in a worker process)
+            vacancy_text = await run_blocking("extract", convert_file_to_text, tmp_path)
             if not vacancy_text.strip():
                 raise HTTPException(
                     status_code=400,
@@ -392,6 +545,9 @@ def register_routes(app: FastAPI) -> None:
                 max_score=max_score,
                 use_llm=use_llm,
                 embedding_candidates=embedding_candidates,
+                ef_search=ef_search,
+                probes=probes,
+                scoring=scoring,
             )
             return await match_vacancy(request)
 
@@ -399,6 +555,104 @@ def register_routes(app: FastAPI) -> None:
             # Clean up temp file
             Path(tmp_path).unlink(missing_ok=True)
 
+    @app.post("/match/stream", tags=["Matching"])
+    async def match_vacancy_stream(request: MatchRequest) -> StreamingResponse:
+        """
+        LLM matching with results streamed as Server-Sent Events (`use_llm` is implied).
+
+        **Events**, in order:
+        - `shortlist`: embedding-ranked candidates sent to the LLM (`matches`)
+        - `vacancy`: parsed vacancy requirements
+        - `score`: one per candidate as soon as it is scored (`scored`, `total`, `match`;
+          `match.rank` is 0 until the final ranking)
+        - `ranking`: the final response, same body as `/match` with `use_llm=true`
+        - `error`: `detail` of a failure; the stream ends after it
+        """
+        from resume_matcher.api.executors import get_executor, run_blocking
+        from resume_matcher.services.matcher import (
+            StageTimings,
+            embed_vacancy_async,
+            match_vacancy_with_llm,
+            start_vacancy_parse,
+        )
+
+        if not request.vacancy_text.strip():
+            raise HTTPException(status_code=400, detail="Vacancy text is empty")
+
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue[str | None] = asyncio.Queue()
+        total = 0
+        scored = 0
+
+        def progress(kind: str, value: Any) -> None:
+            # Called on the LLM worker thread; frames are queued on the event loop in order
+            nonlocal total, scored
+            data: dict[str, Any]
+            if kind == "shortlist":
+                total = len(value)
+                data = {
+                    "matches": [_matched_resume(m, i + 1).model_dump() for i, m in enumerate(value)]
+                }
+            elif kind == "vacancy":
+                data = _vacancy_info(value).model_dump()
+            else:
+                scored += 1
+                data = {
+                    "scored": scored,
+                    "total": total,
+                    "match": _llm_match(value, rank=0).model_dump(),
+                }
+            loop.call_soon_threadsafe(events.put_nowait, _sse(kind, data))
+
+        async def run() -> None:
+            try:
+                timings = StageTimings()
+                requirements_future = start_vacancy_parse(request.vacancy_text, timings)
+                started = time.perf_counter()
+                vacancy_embedding = await embed_vacancy_async(
+                    request.vacancy_text, executor=get_executor("embedding")
+                )
+                timings.embedding = time.perf_counter() - started
+
+                requirements, scores = await run_blocking(
+                    "llm",
+                    match_vacancy_with_llm,
+                    vacancy_text=request.vacancy_text,
+                    top_n=request.top_n,
+                    embedding_candidates=request.embedding_candidates,
+                    min_similarity=request.min_score / 100.0,
+                    lang=request.lang,
+                    ef_search=request.ef_search,
+                    probes=request.probes,
+                    scoring=request.scoring,
+                    vacancy_embedding=vacancy_embedding,
+                    requirements_future=requirements_future,
+                    timings=timings,
+                    progress=progress,
+                )
+                response = _llm_match_response(requirements, scores, request, timings)
+                events.put_nowait(_sse("ranking", response.model_dump()))
+            except Exception as e:
+                logger.error(f"Streamed match failed: {e}")
+                events.put_nowait(_sse("error", {"detail": str(e)}))
+            finally:
+                events.put_nowait(None)
+
+        async def stream() -> AsyncIterator[str]:
+            task = asyncio.create_task(run())
+            try:
+                while (frame := await events.get()) is not None:
+                    yield frame
+            finally:
+                # Client gone: stop waiting (candidates already submitted still finish)
+                task.cancel()
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     # =========================================================================
     # Resumes
     # =========================================================================
@@ -410,48 +664,10 @@ def register_routes(app: FastAPI) -> None:
         search: str | None = Query(default=None, description="Search in file name or parsed data"),
     ) -> ResumeListResponse:
         """List resumes in the database."""
-        from resume_matcher.db import get_connection
+        from resume_matcher.db_async import list_resumes as db_list_resumes
 
         try:
-            with get_connection() as conn, conn.cursor() as cur:
-                # Get total count
-                if search:
-                    cur.execute(
-                        """
-                        SELECT COUNT(*) as count FROM resumes
-                        WHERE file_name ILIKE %s
-                           OR json_data::text ILIKE %s
-                        """,
-                        (f"%{search}%", f"%{search}%"),
-                    )
-                else:
-                    cur.execute("SELECT COUNT(*) as count FROM resumes")
-                total = cur.fetchone()["count"]
-
-                # Get resumes
-                if search:
-                    cur.execute(
-                        """
-                        SELECT id, file_name, file_path, embedding IS NOT NULL as has_embedding, json_data
-                        FROM resumes
-                        WHERE file_name ILIKE %s
-                           OR json_data::text ILIKE %s
-                        ORDER BY id DESC
-                        LIMIT %s OFFSET %s
-                        """,
-                        (f"%{search}%", f"%{search}%", limit, offset),
-                    )
-                else:
-                    cur.execute(
-                        """
-                        SELECT id, file_name, file_path, embedding IS NOT NULL as has_embedding, json_data
-                        FROM resumes
-                        ORDER BY id DESC
-                        LIMIT %s OFFSET %s
-                        """,
-                        (limit, offset),
-                    )
-                rows = cur.fetchall()
+            total, rows = await db_list_resumes(limit, offset, search)
 
             return ResumeListResponse(
                 total=total,
@@ -483,14 +699,14 @@ def register_routes(app: FastAPI) -> None:
     async def find_duplicates() -> dict[str, Any]:
         """
         Find duplicate resumes (same content, different file names).
-        
+
         Returns groups of duplicates with their file names and IDs.
         Useful for reviewing duplicates before cleaning.
         """
-        from resume_matcher.db import find_duplicates as db_find_duplicates
+        from resume_matcher.db_async import find_duplicates as db_find_duplicates
 
         try:
-            duplicates = db_find_duplicates()
+            duplicates = await db_find_duplicates()
             return {
                 "duplicate_groups": len(duplicates),
                 "total_duplicates": sum(d["count"] - 1 for d in duplicates),
@@ -513,14 +729,14 @@ def register_routes(app: FastAPI) -> None:
     ) -> dict[str, Any]:
         """
         Remove duplicate resumes, keeping the most recently updated version.
-        
+
         By default, runs in dry_run mode (preview only).
         Set dry_run=false to actually delete duplicates.
         """
-        from resume_matcher.db import clean_duplicates as db_clean_duplicates
+        from resume_matcher.db_async import clean_duplicates as db_clean_duplicates
 
         try:
-            result = db_clean_duplicates(dry_run=dry_run)
+            result = await db_clean_duplicates(dry_run=dry_run)
             return result
         except Exception as e:
             logger.error(f"Error cleaning duplicates: {e}")
@@ -529,19 +745,10 @@ def register_routes(app: FastAPI) -> None:
     @app.get("/resumes/{resume_id}", response_model=ResumeResponse, tags=["Resumes"])
     async def get_resume(resume_id: int) -> ResumeResponse:
         """Get a single resume by ID."""
-        from resume_matcher.db import get_connection
+        from resume_matcher.db_async import get_resume as db_get_resume
 
         try:
-            with get_connection() as conn, conn.cursor() as cur:
-                cur.execute(
-                    """
-                    SELECT id, file_name, file_path, embedding IS NOT NULL as has_embedding, json_data
-                    FROM resumes
-                    WHERE id = %s
-                    """,
-                    (resume_id,),
-                )
-                row = cur.fetchone()
+            row = await db_get_resume(resume_id)
 
             if not row:
                 raise HTTPException(status_code=404, detail="Resume not found")
@@ -565,13 +772,10 @@ def register_routes(app: FastAPI) -> None:
     @app.delete("/resumes/{resume_id}", tags=["Resumes"])
     async def delete_resume(resume_id: int) -> dict[str, str]:
         """Delete a resume by ID."""
-        from resume_matcher.db import get_connection
+        from resume_matcher.db_async import delete_resume as db_delete_resume
 
         try:
-            with get_connection() as conn, conn.cursor() as cur:
-                cur.execute("DELETE FROM resumes WHERE id = %s RETURNING id", (resume_id,))
-                deleted = cur.fetchone()
-                conn.commit()
+            deleted = await db_delete_resume(resume_id)
 
             if not deleted:
                 raise HTTPException(status_code=404, detail="Resume not found")
@@ -599,23 +803,26 @@ def register_routes(app: FastAPI) -> None:
         """
         Trigger resume import from a directory.
 
-        Note: This is a synchronous operation that may take a while for large directories.
-        For production use, consider implementing as a background task.
+        The request waits for the import to finish; it runs on the "import"
+        executor, so other requests are served meanwhile and imports are
+        serialized (API_IMPORT_WORKERS).
         """
+        from resume_matcher.api.executors import run_blocking
         from resume_matcher.scripts.cli_import import import_folder
 
         dir_path = Path(directory)
         if not dir_path.is_dir():
             raise HTTPException(status_code=400, detail=f"Directory not found: {directory}")
 
-        files = list(dir_path.rglob("*.*"))
+        files = await asyncio.to_thread(lambda: list(dir_path.rglob("*.*")))
         total_files = len(files)
 
         if limit:
             files = files[:limit]
 
-        # Note: For a production system, this should be a background task
-        import_folder(
+        await run_blocking(
+            "import",
+            import_folder,
             resumes_dir=dir_path,
             workers=4,
             force_update=force,
@@ -640,6 +847,7 @@ def register_routes(app: FastAPI) -> None:
 
         Supports PDF, DOCX, and image files (with OCR).
         """
+        from resume_matcher.api.executors import run_blocking
         from resume_matcher.services.importer import import_resume
 
         # Save uploaded file temporarily
@@ -650,7 +858,7 @@ def register_routes(app: FastAPI) -> None:
             tmp_path = tmp.name
 
         try:
-            result = import_resume(tmp_path, force_update=force)
+            result = await run_blocking("import", import_resume, tmp_path, force_update=force)
 
             if "error" in result:
                 raise HTTPException(status_code=400, detail=result["error"])
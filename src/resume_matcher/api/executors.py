@@ -0,0 +1,103 @@
+# src/resume_matcher/api/executors.py
+"""
+Bounded executors for blocking work done by API routes.
+
+model.encode, Groq HTTP calls, OCR and imports are synchronous. Running
+them on the event loop freezes every other request (including /health), so
+routes hand them to a pool sized for that kind of work:
+
+    embedding  vacancy encodes when batching is off  (API_EMBEDDING_WORKERS)
+    llm        LLM matching: search + Groq calls     (API_LLM_WORKERS)
+    import     single-file and folder imports        (API_IMPORT_WORKERS)
+    extract    text extraction / OCR, in processes   (API_EXTRACT_PROCESSES)
+
+A saturated kind queues its own requests without taking capacity from the others.
+Plain queries don't need a thread: routes await them on the async pool (db_async).
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from resume_matcher.config import (
+    API_EMBEDDING_WORKERS,
+    API_EXTRACT_PROCESSES,
+    API_IMPORT_WORKERS,
+    API_LLM_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+EXECUTOR_SIZES = {
+    "embedding": API_EMBEDDING_WORKERS,
+    "llm": API_LLM_WORKERS,
+    "import": API_IMPORT_WORKERS,
+    "extract": API_EXTRACT_PROCESSES,
+}
+
+_executors: dict[str, Executor] = {}
+_executors_lock = threading.Lock()
+# Submitted and not yet finished, per kind (only touched from the event loop)
+_in_flight = dict.fromkeys(EXECUTOR_SIZES, 0)
+
+
+def get_executor(kind: str) -> Executor:
+    """Returns the executor for a kind of work, creating it on first use"""
+    if kind not in EXECUTOR_SIZES:
+        raise ValueError(f"Unknown executor {kind!r}, expected one of {list(EXECUTOR_SIZES)}")
+
+    executor = _executors.get(kind)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(kind)
+            if executor is None:
+                size = max(1, EXECUTOR_SIZES[kind])
+                if kind == "extract":
+                    # spawn: never fork a process that holds the model, pool and threads
+                    executor = ProcessPoolExecutor(
+                        max_workers=size, mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    executor = ThreadPoolExecutor(
+                        max_workers=size, thread_name_prefix=f"api-{kind}"
+                    )
+                _executors[kind] = executor
+                logger.info(f"API executor '{kind}' started ({size} workers)")
+    return executor
+
+
+async def run_blocking(kind: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Runs fn(*args, **kwargs) on the executor for kind and awaits the result.
+    For "extract", fn and its arguments must be picklable.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor(kind)  # validates kind before it is counted
+    _in_flight[kind] += 1
+    try:
+        return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+    finally:
+        _in_flight[kind] -= 1
+
+
+def executor_stats() -> dict[str, dict[str, int]]:
+    """Workers and in-flight (running + queued) calls per kind"""
+    return {
+        kind: {"workers": max(1, size), "in_flight": _in_flight[kind]}
+        for kind, size in EXECUTOR_SIZES.items()
+    }
+
+
+def shutdown_executors() -> None:
+    """Stops all executors, waiting for running calls to finish"""
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=True, cancel_futures=True)
+        _executors.clear()
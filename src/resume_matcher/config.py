@@ -3,9 +3,10 @@
 import csv
 import logging
 import os
+import threading
+from functools import cache
 from pathlib import Path
 
-import torch
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
@@ -52,9 +53,114 @@ for d in [DATA_DIR, RESUMES_DIR, VACANCIES_DIR, OUTPUT_DIR]:
 
 EMBEDDING_MODEL_NAME = "intfloat/multilingual-e5-large"
 EMBEDDING_CACHE_DIR = DATA_DIR / "embedding_cache"
-DEVICE = (
-    "mps" if torch.backends.mps.is_available() else "cuda" if torch.cuda.is_available() else "cpu"
+# Inference backend: torch, onnx or onnx-int8 (CPU; see `resume-matcher model export`)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_DIR = Path(
+    os.getenv(
+        "EMBEDDING_ONNX_DIR", str(DATA_DIR / "onnx" / EMBEDDING_MODEL_NAME.replace("/", "__"))
+    )
 )
+# Target instruction set of the int8 model: arm64, avx2, avx512 or avx512_vnni
+EMBEDDING_QUANTIZATION = os.getenv("EMBEDDING_QUANTIZATION", "avx512_vnni")
+EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float32")  # or float16
+EMBEDDING_CACHE_MAX_MB = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "0"))  # 0 = unbounded
+# In-process LRU of vacancy (query) embeddings: max entries (0 = off) and TTL (0 = none)
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "256"))
+QUERY_EMBEDDING_CACHE_TTL = float(os.getenv("QUERY_EMBEDDING_CACHE_TTL", "3600"))
+# Chunking mode: embed long texts as overlapping token windows (stored in
+# resume_chunks) and pool them into the document vector
+EMBEDDING_CHUNKING = os.getenv("EMBEDDING_CHUNKING", "false").lower() in ("1", "true", "yes")
+EMBEDDING_CHUNK_OVERLAP = int(os.getenv("EMBEDDING_CHUNK_OVERLAP", "64"))  # tokens
+EMBEDDING_MAX_CHUNKS = int(os.getenv("EMBEDDING_MAX_CHUNKS", "16"))
+# Max padded tokens (texts x longest text) per forward pass of batch encoding
+EMBEDDING_TOKEN_BUDGET = int(os.getenv("EMBEDDING_TOKEN_BUDGET", "16384"))
+# Concurrent single-text encodes are coalesced into one forward pass: collection
+# window in ms (0 = encode each call directly) and max texts per pass
+EMBEDDING_BATCH_WINDOW_MS = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5"))
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "32"))
+# Load and warm up the embedding model when the API starts instead of on the first request
+WARMUP_MODEL = os.getenv("WARMUP_MODEL", "false").lower() in ("1", "true", "yes")
+
+
+@cache
+def get_device() -> str:
+    """Torch device for the embedding model (torch is imported on first call)"""
+    import torch
+
+    return (
+        "mps"
+        if torch.backends.mps.is_available()
+        else "cuda"
+        if torch.cuda.is_available()
+        else "cpu"
+    )
+
+
+def __getattr__(name: str):
+    # DEVICE is resolved lazily so that importing config doesn't import torch
+    if name == "DEVICE":
+        return get_device()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ─── Vector search variables ────────────────────────────────────────–––––––––––––
+
+# Defaults for per-query ANN settings (can be overridden per request).
+# hnsw.ef_search is raised to the query's LIMIT automatically, since HNSW never
+# returns more rows than ef_search.
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "40"))
+IVFFLAT_PROBES = int(os.getenv("IVFFLAT_PROBES", "10"))
+# Index tier searched for document scoring: full (float32 vectors), halfvec (half
+# precision) or coarse (first COARSE_DIMENSIONS dims, half precision); halfvec and
+# coarse candidates are rescored exactly on the full vectors
+VECTOR_SEARCH_TIER = os.getenv("VECTOR_SEARCH_TIER", "full")
+COARSE_DIMENSIONS = int(os.getenv("COARSE_DIMENSIONS", "256"))
+# Search backend: pgvector (SQL) or numpy (in-process exact index, see
+# services/vector_index.py), refreshed from changed rows every N seconds and
+# optionally persisted to VECTOR_INDEX_PATH for fast, memory-mapped startup
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "pgvector")
+VECTOR_INDEX_REFRESH_SECONDS = float(os.getenv("VECTOR_INDEX_REFRESH_SECONDS", "30"))
+VECTOR_INDEX_PATH = Path(p) if (p := os.getenv("VECTOR_INDEX_PATH")) else None
+# How resumes are scored: "document" (resume vector) or "max_chunk" (best matching
+# chunk, needs resumes imported with EMBEDDING_CHUNKING=true)
+MATCH_SCORING = os.getenv("MATCH_SCORING", "document")
+# Seconds the resume counts (total_resumes_in_db, /stats, /resumes) are cached per
+# process; writes through db.py invalidate them immediately, 0 = always count
+RESUME_COUNT_TTL = float(os.getenv("RESUME_COUNT_TTL", "60"))
+
+
+# ─── LLM variables ────────────────────────────────────────–––––––––––––––––––––––
+
+# Persistent cache of LLM completions (resume parsing, vacancy parsing, candidate
+# scoring), keyed by task, prompt-template version, model and prompt hash
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = Path(os.getenv("LLM_CACHE_PATH", str(DATA_DIR / "llm_cache.sqlite")))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))  # seconds, 0 = none
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "100000"))  # 0 = unbounded
+# Groq requests of all stages (importer, scorer) go through one dispatcher per process
+# (models/llm_dispatch.py): its concurrency starts at LLM_INITIAL_CONCURRENCY, grows
+# while Groq keeps up and halves on 429s, within [1, LLM_MAX_CONCURRENCY]
+LLM_INITIAL_CONCURRENCY = int(os.getenv("LLM_INITIAL_CONCURRENCY", "4"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+# Tokens per minute the process may send to Groq across all stages (0 = only
+# throttled by Groq's rate-limit headers)
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+# LLM re-ranking packs up to LLM_SCORING_BATCH_SIZE candidate profiles (at most
+# LLM_SCORING_BATCH_TOKENS prompt tokens) into one scoring request; 1 = one per candidate
+LLM_SCORING_BATCH_SIZE = int(os.getenv("LLM_SCORING_BATCH_SIZE", "8"))
+LLM_SCORING_BATCH_TOKENS = int(os.getenv("LLM_SCORING_BATCH_TOKENS", "6000"))
+
+
+# ─── API variables ────────────────────────────────────────–––––––––––––––––––––––
+
+# Workers of the executors API routes run blocking work on (see api/executors.py):
+# vacancy encodes (when batching is off), LLM matching, imports, and
+# processes for text extraction / OCR of uploaded files
+API_EMBEDDING_WORKERS = int(os.getenv("API_EMBEDDING_WORKERS", "2"))
+API_LLM_WORKERS = int(os.getenv("API_LLM_WORKERS", "4"))
+API_IMPORT_WORKERS = int(os.getenv("API_IMPORT_WORKERS", "1"))
+API_EXTRACT_PROCESSES = int(os.getenv("API_EXTRACT_PROCESSES", "2"))
 
 
 # ─── Taxonomy variables ────────────────────────────────────────––––––––––––––––––
@@ -163,11 +269,28 @@ def load_esco_relations():
         logger.error(f"Failed to download occupationSkillRelations_en.csv: {e}")
 
 
-# ─── Download call during module import ──────────────────────────────────────────
+# ─── Lazy loading ────────────────────────────────────────────────────────────────
 
-load_esco_occupations()
-load_esco_skills()
-# load_esco_relations()
+_taxonomy_loaded = False
+_taxonomy_lock = threading.Lock()
 
-logger.info(f"Total unique occupations: {len(KNOWN_OCCUPATIONS):,}")
-logger.info(f"Total unique skills: {len(KNOWN_SKILLS):,}")
+
+def load_taxonomy():
+    """
+    Loads the ESCO taxonomy on first call; later calls are no-ops.
+    The sets/dicts above are filled in place, so modules that imported them
+    by name see the data once this has run.
+    """
+    global _taxonomy_loaded
+    if _taxonomy_loaded:
+        return
+    with _taxonomy_lock:
+        if _taxonomy_loaded:
+            return
+        load_esco_occupations()
+        load_esco_skills()
+        # load_esco_relations()
+
+        logger.info(f"Total unique occupations: {len(KNOWN_OCCUPATIONS):,}")
+        logger.info(f"Total unique skills: {len(KNOWN_SKILLS):,}")
+        _taxonomy_loaded = True
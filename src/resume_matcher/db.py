@@ -1,9 +1,11 @@
 # src/resume_matcher/db.py
 
+import atexit
 import hashlib
 import json
 import logging
 import os
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -12,6 +14,11 @@ import psycopg
 from dotenv import load_dotenv
 from pgvector.psycopg import register_vector
 from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
+
+from .config import COARSE_DIMENSIONS, RESUME_COUNT_TTL
+from .utils.lru_cache import LRUCache
 
 load_dotenv()
 
@@ -25,17 +32,92 @@ DB_CONFIG = {
     "port": os.getenv("DB_PORT", "5433"),
 }
 
+POOL_CONFIG = {
+    "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+    "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+    "timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "600")),
+}
+
+_pool: ConnectionPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def _configure_connection(conn: psycopg.Connection) -> None:
+    """Registers pgvector types once, when the pool creates a new connection"""
+    register_vector(conn)
+    logger.debug("Connection to PostgreSQL established")
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Returns the process-wide connection pool, creating it on first use.
+
+    The pool is recreated after a fork, so multiprocessing workers never
+    share sockets with their parent.
+    """
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            try:
+                _pool = ConnectionPool(
+                    kwargs={**DB_CONFIG, "row_factory": dict_row, "autocommit": True},
+                    configure=_configure_connection,
+                    check=ConnectionPool.check_connection,
+                    name="resume_matcher",
+                    open=True,
+                    **POOL_CONFIG,
+                )
+                _pool_pid = pid
+                atexit.register(close_pool)
+                logger.info(
+                    f"Connection pool opened "
+                    f"(min_size={POOL_CONFIG['min_size']}, max_size={POOL_CONFIG['max_size']})"
+                )
+            except Exception as e:
+                logger.error(f"Database connection error: {e}")
+                raise
+    return _pool
+
+
+def close_pool() -> None:
+    """Closes the process-wide connection pool (if it was opened by this process)"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.close()
+            logger.info("Connection pool closed")
+        _pool = None
+        _pool_pid = None
+
 
 def get_connection():
-    """Returns the connection to PostgreSQL with pgvector"""
-    try:
-        conn = psycopg.connect(**DB_CONFIG, row_factory=dict_row, autocommit=True)
-        register_vector(conn)
-        logger.debug("Connection to PostgreSQL established")
-        return conn
-    except Exception as e:
-        logger.error(f"Database connection error: {e}")
-        raise
+    """
+    Borrows a connection to PostgreSQL with pgvector from the pool.
+
+    Use as a context manager - the connection is returned to the pool on exit:
+        with get_connection() as conn, conn.cursor() as cur:
+            ...
+    """
+    return get_pool().connection()
+
+
+def get_dedicated_connection() -> psycopg.Connection[dict[str, Any]]:
+    """
+    Opens a connection outside the pool, configured like pooled ones, for
+    long-running work (e.g. a corpus-wide scan) that would otherwise hold a
+    pool slot for its whole duration. Closed when used as a context manager:
+        with get_dedicated_connection() as conn, conn.cursor() as cur:
+            ...
+    """
+    conn = psycopg.connect(**DB_CONFIG, row_factory=dict_row, autocommit=True)
+    _configure_connection(conn)
+    return conn
 
 
 def get_file_hash(path: Path) -> str:
@@ -61,15 +143,23 @@ def store_resume(
     json_data: dict[str, Any],
     embedding: np.ndarray,
     force_update: bool = False,
+    file_hash: str | None = None,
+    chunks: list[tuple[int, int, np.ndarray]] | None = None,
 ) -> int:
     """
     Saves or updates resume in PostgreSQL
     Returns the ID of the record.
+
+    chunks: (start_char, end_char, embedding) per chunk in chunking mode; they
+    replace the resume's rows in resume_chunks. None leaves resume_chunks alone.
     """
-    file_hash = get_file_hash(file_path)
+    if chunks is not None:
+        ensure_resume_chunks_table()
+    file_hash = file_hash or get_file_hash(file_path)
     abs_path = str(file_path.absolute())
 
-    with get_connection() as conn, conn.cursor() as cur:
+    # One transaction: the resume never becomes visible without its chunks
+    with get_connection() as conn, conn.transaction(), conn.cursor() as cur:
         cur.execute(
             """
                 INSERT INTO resumes (
@@ -92,13 +182,203 @@ def store_resume(
                 raw_text,
                 cleaned_text,
                 json.dumps(json_data),
-                embedding.tolist(),
+                np.asarray(embedding, dtype=np.float32),
             ),
         )
 
         inserted_id = cur.fetchone()["id"]
-        logger.info(f"Saved/Updated resume: {file_path.name} (id={inserted_id})")
-        return inserted_id
+        if chunks is not None:
+            _replace_chunks(cur, {inserted_id: chunks})
+
+    invalidate_resume_counts()
+    logger.info(f"Saved/Updated resume: {file_path.name} (id={inserted_id})")
+    return inserted_id
+
+
+def store_resumes_batch(records: list[dict[str, Any]]) -> int:
+    """
+    Saves or updates many resumes in a single transaction.
+
+    Rows are streamed with binary COPY (embeddings in pgvector's binary format)
+    into a temporary staging table and merged into resumes with one
+    INSERT ... ON CONFLICT, instead of one round trip per file.
+
+    Args:
+        records: Dicts with the store_resume arguments: file_path, raw_text,
+            cleaned_text, json_data, embedding and optionally file_hash
+            (computed from the file if missing) and chunks.
+
+    Returns:
+        Number of inserted or updated rows.
+    """
+    # ON CONFLICT can't touch the same row twice in one statement: last record wins
+    by_path: dict[str, dict[str, Any]] = {}
+    for record in records:
+        by_path[str(Path(record["file_path"]).absolute())] = record
+
+    if not by_path:
+        return 0
+
+    with_chunks = {p: r["chunks"] for p, r in by_path.items() if r.get("chunks") is not None}
+    if with_chunks:
+        ensure_resume_chunks_table()
+
+    with get_connection() as conn, conn.transaction(), conn.cursor() as cur:
+        cur.execute(
+            """
+                CREATE TEMP TABLE resumes_staging (
+                    file_name TEXT,
+                    file_path TEXT,
+                    file_hash TEXT,
+                    raw_text TEXT,
+                    cleaned_text TEXT,
+                    json_data JSONB,
+                    embedding vector
+                ) ON COMMIT DROP
+            """
+        )
+
+        with cur.copy(
+            """
+                COPY resumes_staging (
+                    file_name, file_path, file_hash, raw_text, cleaned_text, json_data, embedding
+                ) FROM STDIN WITH (FORMAT BINARY)
+            """
+        ) as copy:
+            copy.set_types(["text", "text", "text", "text", "text", "jsonb", "vector"])
+            for abs_path, record in by_path.items():
+                path = Path(record["file_path"])
+                copy.write_row(
+                    (
+                        path.name,
+                        abs_path,
+                        record.get("file_hash") or get_file_hash(path),
+                        record["raw_text"],
+                        record["cleaned_text"],
+                        Jsonb(record["json_data"] or {}),
+                        np.asarray(record["embedding"], dtype=np.float32),
+                    )
+                )
+
+        cur.execute(
+            """
+                INSERT INTO resumes (
+                    file_name, file_path, file_hash, raw_text, cleaned_text, json_data, embedding
+                )
+                SELECT file_name, file_path, file_hash, raw_text, cleaned_text, json_data, embedding
+                FROM resumes_staging
+                ON CONFLICT (file_path) DO UPDATE SET
+                    file_hash = EXCLUDED.file_hash,
+                    raw_text = EXCLUDED.raw_text,
+                    cleaned_text = EXCLUDED.cleaned_text,
+                    json_data = EXCLUDED.json_data,
+                    embedding = EXCLUDED.embedding,
+                    updated_at = NOW()
+                RETURNING id, file_path
+            """
+        )
+        ids = {row["file_path"]: row["id"] for row in cur.fetchall()}
+        stored = len(ids)
+
+        if with_chunks:
+            _replace_chunks(cur, {ids[p]: chunks for p, chunks in with_chunks.items()})
+
+    invalidate_resume_counts()
+    logger.info(f"Saved/Updated {stored} resumes in batch")
+    return stored
+
+
+# ─── Resume counts ────────────────────────────────────────–––––––––––––––––––––––
+#
+# COUNT(*) is a full scan, and every match reports the corpus size. The counts are
+# taken in one pass and cached for RESUME_COUNT_TTL seconds; writes made through
+# this process (store_*, deletes) invalidate them, writes made by other processes
+# (a CLI import next to the API) show up once the TTL expires.
+
+_RESUME_COUNTS_QUERY = """
+    SELECT
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE embedding IS NOT NULL) AS with_embeddings,
+        COUNT(*) FILTER (WHERE json_data IS NOT NULL AND json_data != '{}') AS with_parsed_data
+    FROM resumes
+"""
+
+_counts_cache = LRUCache(max_entries=1 if RESUME_COUNT_TTL > 0 else 0, ttl_seconds=RESUME_COUNT_TTL)
+
+
+def get_resume_counts() -> dict[str, int]:
+    """
+    Resume counts: {"total", "with_embeddings", "with_parsed_data"}.
+    Cached for RESUME_COUNT_TTL seconds (see invalidate_resume_counts).
+    """
+    counts = _counts_cache.get("counts")
+    if counts is None:
+        with get_connection() as conn, conn.cursor() as cur:
+            cur.execute(_RESUME_COUNTS_QUERY)
+            counts = {key: int(value) for key, value in cur.fetchone().items()}
+        _counts_cache.put("counts", counts)
+    return dict(counts)
+
+
+def invalidate_resume_counts() -> None:
+    """Drops the cached resume counts; call after inserting or deleting resumes"""
+    _counts_cache.clear()
+
+
+# ─── Resume chunks ────────────────────────────────────────–––––––––––––––––––––––
+
+_chunks_table_ready = False
+_chunks_table_lock = threading.Lock()
+
+
+def ensure_resume_chunks_table() -> None:
+    """Creates resume_chunks (see docker/init-db.sql) on databases that predate it"""
+    global _chunks_table_ready
+    if _chunks_table_ready:
+        return
+    with _chunks_table_lock:
+        if _chunks_table_ready:
+            return
+        with get_connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                    CREATE TABLE IF NOT EXISTS resume_chunks (
+                        resume_id INTEGER NOT NULL REFERENCES resumes (id) ON DELETE CASCADE,
+                        chunk_index INTEGER NOT NULL,
+                        start_char INTEGER NOT NULL,
+                        end_char INTEGER NOT NULL,
+                        embedding vector(1024) NOT NULL,
+                        PRIMARY KEY (resume_id, chunk_index)
+                    )
+                """
+            )
+            cur.execute(
+                """
+                    CREATE INDEX IF NOT EXISTS resume_chunks_embedding_idx ON resume_chunks
+                    USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)
+                """
+            )
+        _chunks_table_ready = True
+
+
+def _replace_chunks(
+    cur: psycopg.Cursor,
+    chunks_by_id: dict[int, list[tuple[int, int, np.ndarray]]],
+) -> None:
+    """Replaces the resume_chunks rows of the given resumes (binary COPY)"""
+    cur.execute("DELETE FROM resume_chunks WHERE resume_id = ANY(%s)", (list(chunks_by_id),))
+    with cur.copy(
+        """
+            COPY resume_chunks (resume_id, chunk_index, start_char, end_char, embedding)
+            FROM STDIN WITH (FORMAT BINARY)
+        """
+    ) as copy:
+        copy.set_types(["int4", "int4", "int4", "int4", "vector"])
+        for resume_id, chunks in chunks_by_id.items():
+            for index, (start, end, embedding) in enumerate(chunks):
+                copy.write_row(
+                    (resume_id, index, start, end, np.asarray(embedding, dtype=np.float32))
+                )
 
 
 def get_resume_by_path(file_path: Path) -> dict[str, Any] | None:
@@ -120,12 +400,12 @@ def get_resume_by_path(file_path: Path) -> dict[str, Any] | None:
         return None
 
 
-def content_hash_exists(file_path: Path) -> dict[str, Any] | None:
+def content_hash_exists(file_path: Path, file_hash: str | None = None) -> dict[str, Any] | None:
     """
     Checks if a resume with the same content (file_hash) already exists.
     Returns the existing resume info if found, None otherwise.
     """
-    file_hash = get_file_hash(file_path)
+    file_hash = file_hash or get_file_hash(file_path)
     with get_connection() as conn, conn.cursor() as cur:
         cur.execute(
             """
@@ -139,54 +419,58 @@ def content_hash_exists(file_path: Path) -> dict[str, Any] | None:
         return cur.fetchone()
 
 
+def sample_resume_texts(limit: int = 100) -> list[str]:
+    """Returns the cleaned text of up to `limit` randomly chosen resumes"""
+    with get_connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+                SELECT cleaned_text
+                FROM resumes
+                WHERE cleaned_text IS NOT NULL AND cleaned_text != ''
+                ORDER BY random()
+                LIMIT %s
+            """,
+            (limit,),
+        )
+        return [row["cleaned_text"] for row in cur.fetchall()]
+
+
+_FIND_DUPLICATES_QUERY = """
+    SELECT 
+        file_hash,
+        COUNT(*) as count,
+        array_agg(id ORDER BY updated_at DESC) as ids,
+        array_agg(file_name ORDER BY updated_at DESC) as file_names
+    FROM resumes
+    GROUP BY file_hash
+    HAVING COUNT(*) > 1
+    ORDER BY COUNT(*) DESC
+"""
+
+
 def find_duplicates() -> list[dict[str, Any]]:
     """
     Finds all duplicate resumes (same file_hash).
     Returns groups of duplicates with their info.
     """
     with get_connection() as conn, conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT 
-                file_hash,
-                COUNT(*) as count,
-                array_agg(id ORDER BY updated_at DESC) as ids,
-                array_agg(file_name ORDER BY updated_at DESC) as file_names
-            FROM resumes
-            GROUP BY file_hash
-            HAVING COUNT(*) > 1
-            ORDER BY COUNT(*) DESC
-            """
-        )
+        cur.execute(_FIND_DUPLICATES_QUERY)
         return cur.fetchall() or []
 
 
 def clean_duplicates(dry_run: bool = True) -> dict[str, Any]:
     """
     Removes duplicate resumes, keeping the most recently updated version.
-    
+
     Args:
         dry_run: If True, only reports what would be deleted without actually deleting.
-    
+
     Returns:
         Summary of duplicates found and (optionally) deleted.
     """
     duplicates = find_duplicates()
-    
-    if not duplicates:
-        return {
-            "duplicate_groups": 0,
-            "total_duplicates": 0,
-            "deleted_count": 0,
-            "deleted_ids": [],
-            "dry_run": dry_run,
-        }
-    
-    ids_to_delete = []
-    for group in duplicates:
-        # Keep the first ID (most recently updated), delete the rest
-        ids_to_delete.extend(group["ids"][1:])
-    
+    ids_to_delete = _duplicate_ids_to_delete(duplicates)
+
     deleted_count = 0
     if not dry_run and ids_to_delete:
         with get_connection() as conn, conn.cursor() as cur:
@@ -196,7 +480,34 @@ def clean_duplicates(dry_run: bool = True) -> dict[str, Any]:
             )
             deleted_count = cur.rowcount
             logger.info(f"Deleted {deleted_count} duplicate resumes")
-    
+        invalidate_resume_counts()
+
+    return _clean_duplicates_report(duplicates, ids_to_delete, deleted_count, dry_run)
+
+
+def _duplicate_ids_to_delete(duplicates: list[dict[str, Any]]) -> list[int]:
+    ids_to_delete = []
+    for group in duplicates:
+        # Keep the first ID (most recently updated), delete the rest
+        ids_to_delete.extend(group["ids"][1:])
+    return ids_to_delete
+
+
+def _clean_duplicates_report(
+    duplicates: list[dict[str, Any]],
+    ids_to_delete: list[int],
+    deleted_count: int,
+    dry_run: bool,
+) -> dict[str, Any]:
+    if not duplicates:
+        return {
+            "duplicate_groups": 0,
+            "total_duplicates": 0,
+            "deleted_count": 0,
+            "deleted_ids": [],
+            "dry_run": dry_run,
+        }
+
     return {
         "duplicate_groups": len(duplicates),
         "total_duplicates": sum(d["count"] - 1 for d in duplicates),
@@ -214,3 +525,202 @@ def clean_duplicates(dry_run: bool = True) -> dict[str, Any]:
             for d in duplicates
         ],
     }
+
+
+# ─── Vector index management ────────────────────────────────────────–––––––––––––
+
+VECTOR_INDEX_NAME = "resumes_embedding_idx"
+VECTOR_INDEX_METHODS = ("hnsw", "ivfflat")
+VECTOR_DIMENSIONS = 1024  # resumes.embedding vector(1024), see docker/init-db.sql
+
+# Search tiers: which representation of resumes.embedding an index is built on.
+# The column itself stays float32 - it is what coarse results are rescored with.
+# - full:    the vector as stored (4 bytes / dimension)
+# - halfvec: cast to half precision (2 bytes / dimension, half the index size)
+# - coarse:  the first COARSE_DIMENSIONS dimensions in half precision
+VECTOR_SEARCH_TIERS = ("full", "halfvec", "coarse")
+_TIER_INDEX_NAMES = {
+    "full": VECTOR_INDEX_NAME,
+    "halfvec": "resumes_embedding_half_idx",
+    "coarse": "resumes_embedding_coarse_idx",
+}
+
+
+def vector_expression(tier: str, operand: str = "embedding") -> str:
+    """
+    SQL expression of a search tier, applied to a column or a query parameter.
+    Queries must use the same expression as the index for the planner to use it.
+    """
+    if tier == "full":
+        return operand
+    if tier == "halfvec":
+        return f"({operand})::halfvec({VECTOR_DIMENSIONS})"
+    if tier == "coarse":
+        return (
+            f"subvector({operand}, 1, {int(COARSE_DIMENSIONS)})::halfvec({int(COARSE_DIMENSIONS)})"
+        )
+    raise ValueError(f"Unknown search tier: {tier}. Use one of {VECTOR_SEARCH_TIERS}")
+
+
+def vector_index_name(tier: str = "full") -> str:
+    """Name of the ANN index of a search tier"""
+    vector_expression(tier)  # validates tier
+    return _TIER_INDEX_NAMES[tier]
+
+
+def count_embedded_resumes() -> int:
+    """Returns the number of resumes that have an embedding"""
+    with get_connection() as conn, conn.cursor() as cur:
+        cur.execute("SELECT COUNT(*) as count FROM resumes WHERE embedding IS NOT NULL")
+        return int(cur.fetchone()["count"])
+
+
+def suggest_vector_index_params(method: str, row_count: int) -> dict[str, int]:
+    """
+    Index build parameters sized to the number of rows, following pgvector guidance:
+    - ivfflat: lists = rows / 1000 up to 1M rows, sqrt(rows) above; probes ~ sqrt(lists)
+    - hnsw: m / ef_construction grow with the corpus to keep recall at larger scale
+    """
+    if method == "ivfflat":
+        lists = max(row_count // 1000, 1) if row_count <= 1_000_000 else int(row_count**0.5)
+        return {"lists": lists, "probes": max(int(lists**0.5), 1)}
+
+    if method == "hnsw":
+        if row_count < 100_000:
+            return {"m": 16, "ef_construction": 64}
+        if row_count < 1_000_000:
+            return {"m": 16, "ef_construction": 128}
+        return {"m": 32, "ef_construction": 200}
+
+    raise ValueError(f"Unknown vector index method: {method}. Use one of {VECTOR_INDEX_METHODS}")
+
+
+def get_vector_index_info(tier: str = "full") -> dict[str, Any] | None:
+    """Returns the name and definition of the tier's embedding index, if any"""
+    with get_connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = 'resumes' AND indexname = %s",
+            (vector_index_name(tier),),
+        )
+        return cur.fetchone()
+
+
+def build_vector_index(
+    method: str = "hnsw",
+    m: int | None = None,
+    ef_construction: int | None = None,
+    lists: int | None = None,
+    concurrently: bool = False,
+    maintenance_work_mem: str | None = None,
+    tier: str = "full",
+) -> dict[str, Any]:
+    """
+    Builds (or rebuilds) the ANN index on resumes.embedding for cosine distance.
+
+    Parameters that are not given are sized to the current row count. The new index
+    is built under a temporary name and swapped in, so searches keep using the old
+    one until the build is finished. tier selects the indexed representation
+    (full, halfvec or coarse, see VECTOR_SEARCH_TIERS).
+
+    Returns:
+        Summary with the tier, the method, the effective parameters and the row count.
+    """
+    index_name = vector_index_name(tier)
+    if tier == "full":
+        index_target = "embedding vector_cosine_ops"
+    else:
+        index_target = f"({vector_expression(tier)}) halfvec_cosine_ops"
+    row_count = count_embedded_resumes()
+    params = suggest_vector_index_params(method, row_count)
+
+    if method == "hnsw":
+        params["m"] = m or params["m"]
+        params["ef_construction"] = ef_construction or params["ef_construction"]
+        with_clause = f"m = {int(params['m'])}, ef_construction = {int(params['ef_construction'])}"
+    else:
+        params["lists"] = lists or params["lists"]
+        with_clause = f"lists = {int(params['lists'])}"
+
+    tmp_name = f"{index_name}_new"
+    concurrently_sql = "CONCURRENTLY " if concurrently else ""
+
+    with get_connection() as conn, conn.cursor() as cur:
+        # CREATE INDEX CONCURRENTLY can't run inside a transaction block; the
+        # connection goes back to the pool with its original mode and settings
+        autocommit = conn.autocommit
+        conn.autocommit = True
+        try:
+            if maintenance_work_mem:
+                cur.execute(
+                    "SELECT set_config('maintenance_work_mem', %s, false)", (maintenance_work_mem,)
+                )
+
+            logger.info(
+                f"Building {method} index ({tier}) on {row_count:,} rows ({with_clause})..."
+            )
+            cur.execute(f"DROP INDEX IF EXISTS {tmp_name}")
+            cur.execute(
+                f"CREATE INDEX {concurrently_sql}{tmp_name} ON resumes "
+                f"USING {method} ({index_target}) WITH ({with_clause})"
+            )
+
+            with conn.transaction():
+                cur.execute(f"DROP INDEX IF EXISTS {index_name}")
+                cur.execute(f"ALTER INDEX {tmp_name} RENAME TO {index_name}")
+
+            cur.execute("ANALYZE resumes")
+        finally:
+            try:
+                if maintenance_work_mem and not conn.closed:
+                    cur.execute("RESET maintenance_work_mem")
+            finally:
+                conn.autocommit = autocommit
+
+    logger.info(f"Vector index {index_name} ready ({method}, {tier})")
+    return {"tier": tier, "method": method, "rows": row_count, **params}
+
+
+def sample_resume_embeddings(limit: int = 50) -> list[np.ndarray]:
+    """Returns the embeddings of up to `limit` randomly chosen resumes"""
+    with get_connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+                SELECT embedding
+                FROM resumes
+                WHERE embedding IS NOT NULL
+                ORDER BY random()
+                LIMIT %s
+            """,
+            (limit,),
+        )
+        return [np.asarray(row["embedding"], dtype=np.float32) for row in cur.fetchall()]
+
+
+def iter_resume_embedding_blocks(block_size: int = 4096):
+    """
+    Streams the embedding of the latest version of every resume (one per file_hash)
+    in blocks, through a server-side cursor so the corpus never sits in memory at once.
+
+    Yields (ids, embeddings): an int64 array and a float32 (n, dimension) matrix.
+    The scan runs on a dedicated connection: the consumer's work between blocks
+    keeps its transaction open, which must not tie up a pool slot.
+    """
+    with (
+        get_dedicated_connection() as conn,
+        conn.transaction(),
+        conn.cursor(name="resume_embedding_blocks") as cur,
+    ):
+        cur.itersize = block_size
+        cur.execute(
+            """
+                SELECT DISTINCT ON (file_hash) id, embedding
+                FROM resumes
+                WHERE embedding IS NOT NULL
+                ORDER BY file_hash, updated_at DESC
+            """
+        )
+        while rows := cur.fetchmany(block_size):
+            yield (
+                np.fromiter((row["id"] for row in rows), dtype=np.int64, count=len(rows)),
+                np.stack([np.asarray(row["embedding"], dtype=np.float32) for row in rows]),
+            )
@@ -0,0 +1,219 @@
+# src/resume_matcher/db_async.py
+"""
+Async twin of db.py for the API, on psycopg's AsyncConnectionPool.
+
+Routes await these queries on the event loop instead of holding a worker thread
+per request, so one uvicorn worker can keep many queries in flight; the number
+of open connections is still bounded by DB_ASYNC_POOL_MAX_SIZE. Queries and
+caches are shared with db.py, so both layers return the same results.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from pgvector.psycopg import register_vector_async
+from psycopg import AsyncConnection
+from psycopg.rows import DictRow, dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from .db import (
+    _FIND_DUPLICATES_QUERY,
+    _RESUME_COUNTS_QUERY,
+    DB_CONFIG,
+    POOL_CONFIG,
+    _clean_duplicates_report,
+    _counts_cache,
+    _duplicate_ids_to_delete,
+    invalidate_resume_counts,
+)
+
+logger = logging.getLogger(__name__)
+
+ASYNC_POOL_CONFIG = {
+    **POOL_CONFIG,
+    "max_size": int(os.getenv("DB_ASYNC_POOL_MAX_SIZE", "20")),
+}
+
+_pool: AsyncConnectionPool[AsyncConnection[DictRow]] | None = None
+_pool_lock: asyncio.Lock | None = None
+
+
+async def _configure_connection(conn: AsyncConnection[DictRow]) -> None:
+    """Registers pgvector types once, when the pool creates a new connection"""
+    await register_vector_async(conn)
+    logger.debug("Async connection to PostgreSQL established")
+
+
+async def get_async_pool() -> AsyncConnectionPool[AsyncConnection[DictRow]]:
+    """
+    Returns the async connection pool, opening it on first use.
+
+    The pool belongs to the event loop that opened it; the API opens it in its
+    lifespan and closes it on shutdown (close_async_pool).
+    """
+    global _pool, _pool_lock
+    if _pool is not None:
+        return _pool
+
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+    async with _pool_lock:
+        if _pool is None:
+            try:
+                pool = AsyncConnectionPool(
+                    connection_class=AsyncConnection[DictRow],
+                    kwargs={**DB_CONFIG, "row_factory": dict_row, "autocommit": True},
+                    configure=_configure_connection,
+                    check=AsyncConnectionPool.check_connection,
+                    name="resume_matcher_async",
+                    open=False,
+                    **ASYNC_POOL_CONFIG,
+                )
+                await pool.open()
+                _pool = pool
+                logger.info(
+                    f"Async connection pool opened (min_size={ASYNC_POOL_CONFIG['min_size']}, "
+                    f"max_size={ASYNC_POOL_CONFIG['max_size']})"
+                )
+            except Exception as e:
+                logger.error(f"Database connection error: {e}")
+                raise
+    return _pool
+
+
+async def close_async_pool() -> None:
+    """Closes the async connection pool, if open"""
+    global _pool, _pool_lock
+    if _pool is not None:
+        await _pool.close()
+        logger.info("Async connection pool closed")
+    _pool = None
+    _pool_lock = None
+
+
+@asynccontextmanager
+async def get_async_connection() -> AsyncIterator[AsyncConnection[DictRow]]:
+    """
+    Borrows an async connection from the pool, returned on exit:
+        async with get_async_connection() as conn, conn.cursor() as cur:
+            ...
+    """
+    pool = await get_async_pool()
+    async with pool.connection() as conn:
+        yield conn
+
+
+# ─── Resume counts ────────────────────────────────────────–––––––––––––––––––––––
+
+
+async def get_resume_counts() -> dict[str, int]:
+    """Async db.get_resume_counts (same cache and invalidation)"""
+    counts = _counts_cache.get("counts")
+    if counts is None:
+        async with get_async_connection() as conn, conn.cursor() as cur:
+            await cur.execute(_RESUME_COUNTS_QUERY)
+            counts = {key: int(value) for key, value in (await cur.fetchone()).items()}
+        _counts_cache.put("counts", counts)
+    return dict(counts)
+
+
+# ─── Resumes ──────────────────────────────────────────────────────────────────────
+
+
+async def list_resumes(
+    limit: int, offset: int, search: str | None = None
+) -> tuple[int, list[dict[str, Any]]]:
+    """(total, page of resumes), newest first; search matches file name or parsed data"""
+    # Counted before borrowing: get_resume_counts may check out a connection of its own
+    total = 0 if search else (await get_resume_counts())["total"]
+    async with get_async_connection() as conn, conn.cursor() as cur:
+        if search:
+            pattern = f"%{search}%"
+            await cur.execute(
+                """
+                SELECT COUNT(*) as count FROM resumes
+                WHERE file_name ILIKE %s
+                   OR json_data::text ILIKE %s
+                """,
+                (pattern, pattern),
+            )
+            row = await cur.fetchone()
+            total = row["count"] if row else 0
+            await cur.execute(
+                """
+                SELECT id, file_name, file_path, embedding IS NOT NULL as has_embedding, json_data
+                FROM resumes
+                WHERE file_name ILIKE %s
+                   OR json_data::text ILIKE %s
+                ORDER BY id DESC
+                LIMIT %s OFFSET %s
+                """,
+                (pattern, pattern, limit, offset),
+            )
+        else:
+            await cur.execute(
+                """
+                SELECT id, file_name, file_path, embedding IS NOT NULL as has_embedding, json_data
+                FROM resumes
+                ORDER BY id DESC
+                LIMIT %s OFFSET %s
+                """,
+                (limit, offset),
+            )
+        return total, await cur.fetchall()
+
+
+async def get_resume(resume_id: int) -> dict[str, Any] | None:
+    """A single resume (without its texts and embedding), or None"""
+    async with get_async_connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            SELECT id, file_name, file_path, embedding IS NOT NULL as has_embedding, json_data
+            FROM resumes
+            WHERE id = %s
+            """,
+            (resume_id,),
+        )
+        return await cur.fetchone()
+
+
+async def delete_resume(resume_id: int) -> bool:
+    """Deletes a resume; returns False if it did not exist"""
+    async with get_async_connection() as conn, conn.cursor() as cur:
+        await cur.execute("DELETE FROM resumes WHERE id = %s RETURNING id", (resume_id,))
+        deleted = await cur.fetchone()
+    invalidate_resume_counts()
+    return deleted is not None
+
+
+# ─── Duplicates ───────────────────────────────────────────────────────────────────
+
+
+async def find_duplicates() -> list[dict[str, Any]]:
+    """Async db.find_duplicates"""
+    async with get_async_connection() as conn, conn.cursor() as cur:
+        await cur.execute(_FIND_DUPLICATES_QUERY)
+        return await cur.fetchall() or []
+
+
+async def clean_duplicates(dry_run: bool = True) -> dict[str, Any]:
+    """Async db.clean_duplicates"""
+    duplicates = await find_duplicates()
+    ids_to_delete = _duplicate_ids_to_delete(duplicates)
+
+    deleted_count = 0
+    if not dry_run and ids_to_delete:
+        async with get_async_connection() as conn, conn.cursor() as cur:
+            await cur.execute(
+                "DELETE FROM resumes WHERE id = ANY(%s) RETURNING id",
+                (ids_to_delete,),
+            )
+            deleted_count = cur.rowcount
+            logger.info(f"Deleted {deleted_count} duplicate resumes")
+        invalidate_resume_counts()
+
+    return _clean_duplicates_report(duplicates, ids_to_delete, deleted_count, dry_run)
@@ -20,6 +20,12 @@ Usage:
     # Match with LLM re-ranking (more accurate)
     uv run resume-matcher match --vacancy data/vacancies/Vacancy1.docx --llm --top 10
 
+    # Batch: every vacancy in a folder, results to data/output
+    uv run resume-matcher match --vacancies-dir data/vacancies --top 20
+
+    # Build / rebuild the ANN index (sized to the current row count)
+    uv run resume-matcher index --method hnsw
+
     # Show database info
     uv run resume-matcher info
 
@@ -30,6 +36,7 @@ Usage:
 import argparse
 import logging
 import multiprocessing as mp
+import os
 import sys
 from pathlib import Path
 
@@ -44,6 +51,7 @@ logger = logging.getLogger(__name__)
 
 def cmd_import(args: argparse.Namespace) -> int:
     """Handle the 'import' subcommand."""
+    from resume_matcher.config import LLM_MAX_CONCURRENCY
     from resume_matcher.scripts.cli_import import import_folder
     from resume_matcher.services.importer import sync_deleted_resumes
 
@@ -61,6 +69,9 @@ def cmd_import(args: argparse.Namespace) -> int:
         dry_run=args.dry_run,
         limit=args.limit,
         only_sync=False,
+        batch_size=args.batch_size,
+        embed_batch_size=args.embed_batch_size,
+        llm_workers=args.llm_workers or LLM_MAX_CONCURRENCY,
     )
     return 0
 
@@ -73,8 +84,10 @@ def cmd_match(args: argparse.Namespace) -> int:
         llm_result_to_dict,
         parse_score_range,
         result_to_dict,
+        run_batch_match,
     )
     from resume_matcher.services.matcher import (
+        StageTimings,
         match_vacancy_file,
         match_vacancy_file_with_llm,
         match_vacancy_text,
@@ -82,6 +95,9 @@ def cmd_match(args: argparse.Namespace) -> int:
         print_match_results,
     )
 
+    if args.vacancies_dir:
+        return run_batch_match(args)
+
     # Parse score range if provided
     score_range = parse_score_range(args.score_range) if args.score_range else None
     min_similarity = args.min_score / 100.0
@@ -89,6 +105,7 @@ def cmd_match(args: argparse.Namespace) -> int:
     if args.llm:
         # LLM-powered matching
         logger.info("Using LLM-powered matching (2-stage: embedding + LLM re-ranking)")
+        timings = StageTimings()
 
         if args.vacancy:
             requirements, scores = match_vacancy_file_with_llm(
@@ -96,6 +113,10 @@ def cmd_match(args: argparse.Namespace) -> int:
                 top_n=args.top,
                 embedding_candidates=args.candidates,
                 min_similarity=min_similarity,
+                ef_search=args.ef_search,
+                probes=args.probes,
+                scoring=args.scoring,
+                timings=timings,
             )
         else:
             requirements, scores = match_vacancy_with_llm(
@@ -103,6 +124,10 @@ def cmd_match(args: argparse.Namespace) -> int:
                 top_n=args.top,
                 embedding_candidates=args.candidates,
                 min_similarity=min_similarity,
+                ef_search=args.ef_search,
+                probes=args.probes,
+                scoring=args.scoring,
+                timings=timings,
             )
 
         # Apply score range filter
@@ -113,7 +138,9 @@ def cmd_match(args: argparse.Namespace) -> int:
         # Output
         if args.json:
             print(
-                json.dumps(llm_result_to_dict(requirements, scores), indent=2, ensure_ascii=False)
+                json.dumps(
+                    llm_result_to_dict(requirements, scores, timings), indent=2, ensure_ascii=False
+                )
             )
         else:
             from resume_matcher.models.llm_scorer import print_scored_results
@@ -131,12 +158,18 @@ def cmd_match(args: argparse.Namespace) -> int:
                 args.vacancy,
                 top_n=args.top,
                 min_similarity=min_similarity,
+                ef_search=args.ef_search,
+                probes=args.probes,
+                scoring=args.scoring,
             )
         else:
             result = match_vacancy_text(
                 args.text,
                 top_n=args.top,
                 min_similarity=min_similarity,
+                ef_search=args.ef_search,
+                probes=args.probes,
+                scoring=args.scoring,
             )
 
         # Apply score range filter
@@ -157,11 +190,21 @@ def cmd_serve(args: argparse.Namespace) -> int:
     """Handle the 'serve' subcommand - start the API server."""
     import uvicorn
 
+    if args.reload:
+        # The reloader imports the app in a fresh worker process, whose config reads this
+        if args.warmup:
+            os.environ["WARMUP_MODEL"] = "true"
+        app = "resume_matcher.api:app"
+    else:
+        from resume_matcher.api import create_app
+
+        app = create_app(warmup=args.warmup or None)
+
     logger.info(f"Starting Resume Matcher API server on {args.host}:{args.port}")
     logger.info(f"API docs available at: http://{args.host}:{args.port}/docs")
 
     uvicorn.run(
-        "resume_matcher.api:app",
+        app,
         host=args.host,
         port=args.port,
         reload=args.reload,
@@ -172,22 +215,12 @@ def cmd_serve(args: argparse.Namespace) -> int:
 
 def cmd_info(args: argparse.Namespace) -> int:
     """Handle the 'info' subcommand - show database statistics."""
-    from resume_matcher.db import get_connection
+    from resume_matcher.db import get_resume_counts
 
-    with get_connection() as conn, conn.cursor() as cur:
-        # Total resumes
-        cur.execute("SELECT COUNT(*) as count FROM resumes")
-        total = cur.fetchone()["count"]
-
-        # With embeddings
-        cur.execute("SELECT COUNT(*) as count FROM resumes WHERE embedding IS NOT NULL")
-        with_embedding = cur.fetchone()["count"]
-
-        # With JSON data
-        cur.execute(
-            "SELECT COUNT(*) as count FROM resumes WHERE json_data IS NOT NULL AND json_data != '{}'"
-        )
-        with_json = cur.fetchone()["count"]
+    counts = get_resume_counts()
+    total = counts["total"]
+    with_embedding = counts["with_embeddings"]
+    with_json = counts["with_parsed_data"]
 
     print("\n" + "=" * 50)
     print("RESUME DATABASE INFO")
@@ -200,6 +233,166 @@ def cmd_info(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_index(args: argparse.Namespace) -> int:
+    """Handle the 'index' subcommand - build or rebuild the ANN index."""
+    from resume_matcher.db import (
+        VECTOR_SEARCH_TIERS,
+        build_vector_index,
+        count_embedded_resumes,
+        get_vector_index_info,
+        suggest_vector_index_params,
+    )
+
+    if args.benchmark:
+        from resume_matcher.services.matcher import benchmark_search_recall
+
+        report = benchmark_search_recall(tier=args.tier, k=args.k, queries=args.queries)
+        print("\n" + "=" * 50)
+        print(f"SEARCH RECALL: {args.tier} vs exact scan")
+        print("=" * 50)
+        for name, value in report.items():
+            print(f"{name + ':':<17}{value}")
+        print("=" * 50 + "\n")
+        return 0
+
+    if args.show:
+        row_count = count_embedded_resumes()
+
+        print("\n" + "=" * 50)
+        print("VECTOR INDEX INFO")
+        print("=" * 50)
+        print(f"Resumes with embeddings: {row_count}")
+        for tier in VECTOR_SEARCH_TIERS:
+            info = get_vector_index_info(tier)
+            print(f"Index ({tier + '):':<9}{info['indexdef'] if info else 'none'}")
+        for method in ("hnsw", "ivfflat"):
+            print(f"Suggested {method + ':':<14}{suggest_vector_index_params(method, row_count)}")
+        print("=" * 50 + "\n")
+        return 0
+
+    summary = build_vector_index(
+        method=args.method,
+        m=args.m,
+        ef_construction=args.ef_construction,
+        lists=args.lists,
+        concurrently=args.concurrently,
+        maintenance_work_mem=args.maintenance_work_mem,
+        tier=args.tier,
+    )
+
+    print(f"\nIndex built: {summary}")
+    if args.method == "ivfflat":
+        print(f"Tip: query with probes ~ {summary['probes']} (IVFFLAT_PROBES or --probes)")
+    return 0
+
+
+def cmd_cache(args: argparse.Namespace) -> int:
+    """Handle the 'cache' subcommand - embedding (or LLM response) cache maintenance."""
+    if args.llm:
+        return _cmd_llm_cache(args)
+
+    from resume_matcher.config import (
+        EMBEDDING_CACHE_DIR,
+        EMBEDDING_CACHE_DTYPE,
+        EMBEDDING_CACHE_MAX_MB,
+    )
+    from resume_matcher.models.embedding_cache import EmbeddingShardCache
+
+    cache = EmbeddingShardCache(
+        EMBEDDING_CACHE_DIR,
+        dtype=EMBEDDING_CACHE_DTYPE,
+        max_bytes=EMBEDDING_CACHE_MAX_MB * 1024 * 1024 or None,
+    )
+
+    if args.action == "compact":
+        if args.max_mb:
+            cache.evict(args.max_mb * 1024 * 1024)
+        summary = cache.compact()
+        print(f"\nCompacted {summary['entries']} embeddings: ", end="")
+        print(f"{summary['bytes_before']:,} -> {summary['bytes_after']:,} bytes\n")
+    elif args.action == "clear":
+        cache.clear()
+        print("\nEmbedding cache cleared\n")
+    else:
+        stats = cache.stats()
+        print("\n" + "=" * 50)
+        print("EMBEDDING CACHE")
+        print("=" * 50)
+        print(f"Directory:       {EMBEDDING_CACHE_DIR}")
+        for name, value in stats.items():
+            print(
+                f"{name + ':':<17}{value:,}"
+                if isinstance(value, int)
+                else f"{name + ':':<17}{value}"
+            )
+        print("=" * 50 + "\n")
+    return 0
+
+
+def _cmd_llm_cache(args: argparse.Namespace) -> int:
+    """'cache --llm': stats, compact (evict expired / over-size entries) or clear."""
+    from resume_matcher.config import LLM_CACHE_PATH
+    from resume_matcher.models.llm_cache import get_llm_cache
+
+    cache = get_llm_cache()
+    if cache is None:
+        print("\nLLM cache is disabled (LLM_CACHE_ENABLED=false)\n")
+        return 1
+
+    if args.action == "compact":
+        print(f"\nEvicted {cache.evict()} LLM responses\n")
+    elif args.action == "clear":
+        cache.clear()
+        print("\nLLM cache cleared\n")
+    else:
+        stats = cache.stats()
+        print("\n" + "=" * 50)
+        print("LLM RESPONSE CACHE")
+        print("=" * 50)
+        print(f"File:            {LLM_CACHE_PATH}")
+        print(f"Entries:         {stats['entries']:,}")
+        for task, count in sorted(stats["by_task"].items()):
+            print(f"  {task + ':':<15}{count:,}")
+        print(f"Max entries:     {stats['max_entries'] or 'unbounded'}")
+        print(f"TTL (seconds):   {stats['ttl_seconds'] or 'none'}")
+        print("=" * 50 + "\n")
+    return 0
+
+
+def cmd_model(args: argparse.Namespace) -> int:
+    """Handle the 'model' subcommand - ONNX export and backend parity check."""
+    if args.action == "export":
+        from resume_matcher.models.embedding import export_onnx_model
+
+        files = export_onnx_model(
+            quantize=not args.no_quantize,
+            quantization_config=args.quantization,
+        )
+        print("\nExported:")
+        for path in files:
+            print(f"  {path} ({path.stat().st_size / 1024 / 1024:.0f} MB)")
+        print("Select with EMBEDDING_BACKEND=onnx or EMBEDDING_BACKEND=onnx-int8\n")
+        return 0
+
+    from resume_matcher.db import sample_resume_texts
+    from resume_matcher.models.embedding import check_backend_parity
+
+    texts = sample_resume_texts(args.sample)
+    if not texts:
+        logger.error("No resumes with text in the database to compare on")
+        return 1
+
+    report = check_backend_parity(texts, backend=args.backend)
+
+    print("\n" + "=" * 50)
+    print(f"BACKEND PARITY: torch vs {report['backend']}")
+    print("=" * 50)
+    for name, value in report.items():
+        print(f"{name + ':':<17}{value}")
+    print("=" * 50 + "\n")
+    return 0
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create the argument parser with all subcommands."""
     parser = argparse.ArgumentParser(
@@ -212,6 +405,8 @@ Examples:
   %(prog)s import --dir data/resumes      # Import resumes
   %(prog)s match -v vacancy.docx --top 10 # Match resumes
   %(prog)s match -v vacancy.docx --llm    # Match with LLM
+  %(prog)s index --method hnsw            # Rebuild ANN index
+  %(prog)s cache compact                  # Compact embedding cache
   %(prog)s info                           # Show DB stats
         """,
     )
@@ -243,7 +438,16 @@ Examples:
         "-w",
         type=int,
         default=mp.cpu_count(),
-        help=f"Number of parallel workers (default: {mp.cpu_count()})",
+        help=f"Number of text extraction / OCR processes (default: {mp.cpu_count()})",
+    )
+    import_parser.add_argument(
+        "--llm-workers",
+        type=int,
+        default=None,
+        help=(
+            "Threads of the LLM parsing stage; Groq concurrency adapts below it "
+            "(default: LLM_MAX_CONCURRENCY)"
+        ),
     )
     import_parser.add_argument(
         "--force",
@@ -267,6 +471,18 @@ Examples:
         action="store_true",
         help="Only sync deleted files, don't import new ones",
     )
+    import_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=200,
+        help="Resumes per database write (default: 200)",
+    )
+    import_parser.add_argument(
+        "--embed-batch-size",
+        type=int,
+        default=64,
+        help="Resumes encoded together by the embedding stage (default: 64)",
+    )
 
     # =========================================================================
     # MATCH subcommand
@@ -289,6 +505,11 @@ Examples:
         type=str,
         help="Vacancy text directly",
     )
+    match_input.add_argument(
+        "--vacancies-dir",
+        type=str,
+        help="Folder of vacancy files: match all in one pass, top-K as CSV + JSON in OUTPUT_DIR",
+    )
     match_parser.add_argument(
         "--top",
         "-n",
@@ -318,12 +539,151 @@ Examples:
         default=30,
         help="Number of embedding candidates for LLM re-ranking (default: 30)",
     )
+    match_parser.add_argument(
+        "--ef-search",
+        type=int,
+        help="HNSW search breadth for this query (higher = better recall, slower)",
+    )
+    match_parser.add_argument(
+        "--probes",
+        type=int,
+        help="IVFFlat lists to scan for this query (higher = better recall, slower)",
+    )
+    match_parser.add_argument(
+        "--scoring",
+        choices=["document", "max_chunk"],
+        help="Score resumes by their vector or by their best matching chunk "
+        "(default: MATCH_SCORING)",
+    )
     match_parser.add_argument(
         "--json",
         action="store_true",
         help="Output results as JSON",
     )
 
+    # =========================================================================
+    # INDEX subcommand
+    # =========================================================================
+    index_parser = subparsers.add_parser(
+        "index",
+        help="Build or rebuild the ANN vector index",
+        description="Build an HNSW or IVFFlat index on resume embeddings, "
+        "with parameters sized to the current row count unless given explicitly",
+    )
+    index_parser.add_argument(
+        "--method",
+        choices=["hnsw", "ivfflat"],
+        default="hnsw",
+        help="Index type (default: hnsw)",
+    )
+    index_parser.add_argument("--m", type=int, help="HNSW: max connections per layer")
+    index_parser.add_argument(
+        "--ef-construction",
+        type=int,
+        help="HNSW: candidate list size during build",
+    )
+    index_parser.add_argument("--lists", type=int, help="IVFFlat: number of lists (centroids)")
+    index_parser.add_argument(
+        "--concurrently",
+        action="store_true",
+        help="Build without locking writes (slower)",
+    )
+    index_parser.add_argument(
+        "--maintenance-work-mem",
+        help="maintenance_work_mem for the build, e.g. '2GB'",
+    )
+    index_parser.add_argument(
+        "--show",
+        action="store_true",
+        help="Only show the current index and suggested parameters",
+    )
+    index_parser.add_argument(
+        "--tier",
+        choices=["full", "halfvec", "coarse"],
+        default="full",
+        help="Indexed representation: full float32 vectors, halfvec, or coarse "
+        "(first COARSE_DIMENSIONS dims as halfvec) (default: full)",
+    )
+    index_parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Don't build: measure recall@k and latency of --tier against the exact scan",
+    )
+    index_parser.add_argument(
+        "--k", type=int, default=10, help="benchmark: results per query (default: 10)"
+    )
+    index_parser.add_argument(
+        "--queries",
+        type=int,
+        default=50,
+        help="benchmark: stored resumes used as queries (default: 50)",
+    )
+
+    # =========================================================================
+    # CACHE subcommand
+    # =========================================================================
+    cache_parser = subparsers.add_parser(
+        "cache",
+        help="Embedding / LLM response cache maintenance",
+        description="Show statistics, compact (optionally evicting down to a size) or clear "
+        "the on-disk embedding cache, or the LLM response cache with --llm",
+    )
+    cache_parser.add_argument(
+        "action",
+        choices=["stats", "compact", "clear"],
+        nargs="?",
+        default="stats",
+        help="Action to run (default: stats)",
+    )
+    cache_parser.add_argument(
+        "--max-mb",
+        type=int,
+        help="compact: evict least recently used embeddings down to this size first",
+    )
+    cache_parser.add_argument(
+        "--llm",
+        action="store_true",
+        help="Act on the LLM response cache instead (compact evicts expired / excess entries)",
+    )
+
+    # =========================================================================
+    # MODEL subcommand
+    # =========================================================================
+    model_parser = subparsers.add_parser(
+        "model",
+        help="Embedding backend tools (ONNX export, parity check)",
+        description="Export the embedding model to ONNX (fp32 + int8) or compare a backend "
+        "against the torch model on a sample of stored resumes",
+    )
+    model_parser.add_argument(
+        "action",
+        choices=["export", "parity"],
+        help="export: write ONNX models to EMBEDDING_ONNX_DIR; parity: report cosine drift",
+    )
+    model_parser.add_argument(
+        "--no-quantize",
+        action="store_true",
+        help="export: skip the int8 quantized variant",
+    )
+    model_parser.add_argument(
+        "--quantization",
+        choices=["arm64", "avx2", "avx512", "avx512_vnni"],
+        default=None,
+        help="export: int8 target instruction set (default: EMBEDDING_QUANTIZATION)",
+    )
+    model_parser.add_argument(
+        "--backend",
+        choices=["onnx", "onnx-int8"],
+        default="onnx-int8",
+        help="parity: backend to compare with torch (default: onnx-int8)",
+    )
+    model_parser.add_argument(
+        "--sample",
+        type=int,
+        default=100,
+        help="parity: number of stored resumes to encode (default: 100)",
+    )
+
     # =========================================================================
     # INFO subcommand
     # =========================================================================
@@ -360,6 +720,11 @@ Examples:
         action="store_true",
         help="Enable auto-reload for development",
     )
+    serve_parser.add_argument(
+        "--warmup",
+        action="store_true",
+        help="Load the embedding model on startup instead of on the first request",
+    )
 
     return parser
 
@@ -381,6 +746,9 @@ def main() -> int:
         "import": cmd_import,
         "match": cmd_match,
         "info": cmd_info,
+        "index": cmd_index,
+        "cache": cmd_cache,
+        "model": cmd_model,
         "serve": cmd_serve,
     }
 
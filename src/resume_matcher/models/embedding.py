@@ -1,33 +1,238 @@
 # src/resume_matcher/models/embedding.py
+"""
+Sentence-transformer embeddings with a content-addressed on-disk cache.
 
+The model is loaded lazily, on first use (get_model), so importing this module is
+cheap: CLI commands, /health and tests that never embed don't pay for it.
+Call warmup() to load it ahead of time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
 import logging
-import pickle
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
 from ..config import (
-    DEVICE,
+    EMBEDDING_BACKEND,
+    EMBEDDING_BATCH_MAX_SIZE,
+    EMBEDDING_BATCH_WINDOW_MS,
     EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_DTYPE,
+    EMBEDDING_CACHE_MAX_MB,
+    EMBEDDING_CHUNK_OVERLAP,
+    EMBEDDING_MAX_CHUNKS,
     EMBEDDING_MODEL_NAME,
+    EMBEDDING_ONNX_DIR,
+    EMBEDDING_QUANTIZATION,
+    EMBEDDING_TOKEN_BUDGET,
+    QUERY_EMBEDDING_CACHE_SIZE,
+    QUERY_EMBEDDING_CACHE_TTL,
+    get_device,
 )
+from ..utils.lru_cache import LRUCache
+from .embedding_cache import EmbeddingShardCache
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
-try:
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+_model: SentenceTransformer | None = None
+_model_lock = threading.Lock()
+
+
+# ─── Backends ────────────────────────────────────────────────────────────────────
+#
+# torch      - the original model, on config.get_device()
+# onnx       - ONNX Runtime (CPU), fp32 export in EMBEDDING_ONNX_DIR
+# onnx-int8  - ONNX Runtime (CPU), dynamically quantized int8 export
+#
+# The ONNX variants are produced by export_onnx_model() (`resume-matcher model
+# export`) and need the `onnx` extra (optimum + onnxruntime).
+
+
+def _onnx_file_name(backend: str) -> str:
+    if backend == "onnx-int8":
+        return f"onnx/model_qint8_{EMBEDDING_QUANTIZATION}.onnx"
+    return "onnx/model.onnx"
+
+
+def load_model(backend: str | None = None) -> SentenceTransformer:
+    """Loads a new instance of the embedding model with the given backend"""
+    from sentence_transformers import SentenceTransformer
+
+    backend = backend or EMBEDDING_BACKEND
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(
+            f"Unknown embedding backend {backend!r}, expected one of {EMBEDDING_BACKENDS}"
+        )
+
+    started = time.perf_counter()
+    try:
+        if backend == "torch":
+            device = get_device()
+            model = SentenceTransformer(
+                EMBEDDING_MODEL_NAME,
+                device=device,
+                trust_remote_code=True,
+            )
+        else:
+            device = "cpu"
+            file_name = _onnx_file_name(backend)
+            if not (EMBEDDING_ONNX_DIR / file_name).exists():
+                raise FileNotFoundError(
+                    f"{EMBEDDING_ONNX_DIR / file_name} not found, "
+                    "run `resume-matcher model export` first"
+                )
+            model = SentenceTransformer(
+                str(EMBEDDING_ONNX_DIR),
+                device=device,
+                backend="onnx",
+                model_kwargs={"file_name": file_name},
+                trust_remote_code=True,
+            )
+    except Exception as e:
+        logger.error(f"Failed to load embedding model ({backend}): {e}")
+        raise
+
+    logger.info(
+        f"Loaded embedding model: {EMBEDDING_MODEL_NAME} ({backend}) on {device} "
+        f"in {time.perf_counter() - started:.1f}s "
+        f"(dimension {model.get_sentence_embedding_dimension()})"
+    )
+    return model
+
+
+def get_model() -> SentenceTransformer:
+    """Returns the embedding model (EMBEDDING_BACKEND), loading it on first use"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = load_model()
+    return _model
+
+
+def export_onnx_model(
+    quantize: bool = True,
+    quantization_config: str | None = None,
+    output_dir: Path = EMBEDDING_ONNX_DIR,
+) -> list[Path]:
+    """
+    Exports the model to ONNX in output_dir and, with quantize, adds the int8
+    dynamically quantized variant (quantization_config: arm64, avx2, avx512 or
+    avx512_vnni - pick the one the production CPUs support; defaults to
+    EMBEDDING_QUANTIZATION, which is also what the onnx-int8 backend loads).
+    Returns the written .onnx files.
+    """
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    quantization_config = quantization_config or EMBEDDING_QUANTIZATION
+    output_dir.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Exporting {EMBEDDING_MODEL_NAME} to ONNX in {output_dir}")
     model = SentenceTransformer(
         EMBEDDING_MODEL_NAME,
-        device=DEVICE,
+        device="cpu",
+        backend="onnx",
         trust_remote_code=True,
     )
-    logger.info(f"Loaded embedding model: {EMBEDDING_MODEL_NAME} on {DEVICE}")
-except Exception as e:
-    logger.error(f"Failed to load embedding model: {e}")
-    raise
+    model.save_pretrained(str(output_dir))
+
+    if quantize:
+        logger.info(f"Quantizing to int8 ({quantization_config})")
+        export_dynamic_quantized_onnx_model(
+            model,
+            quantization_config=quantization_config,
+            model_name_or_path=str(output_dir),
+        )
+
+    return sorted(output_dir.glob("onnx/*.onnx"))
+
+
+def check_backend_parity(
+    texts: list[str],
+    backend: str | None = None,
+    batch_size: int = 16,
+) -> dict:
+    """
+    Encodes texts with the torch model and with backend and reports the cosine
+    similarity between the two embeddings of each text (1.0 = identical) along
+    with the encode time of both.
+    """
+    backend = backend or EMBEDDING_BACKEND
+    texts = [t for t in texts if t and t.strip()]
+    if not texts:
+        raise ValueError("No texts to compare")
+
+    timings = {}
+    embeddings = {}
+    for name in ("torch", backend):
+        model = load_model(name)
+        started = time.perf_counter()
+        embeddings[name] = model.encode(
+            texts,
+            normalize_embeddings=True,
+            batch_size=batch_size,
+            show_progress_bar=False,
+        ).astype(np.float32)
+        timings[name] = time.perf_counter() - started
+        del model
+
+    cosine = np.sum(embeddings["torch"] * embeddings[backend], axis=1)
+    return {
+        "backend": backend,
+        "texts": len(texts),
+        "mean_cosine": round(float(cosine.mean()), 5),
+        "min_cosine": round(float(cosine.min()), 5),
+        "p5_cosine": round(float(np.percentile(cosine, 5)), 5),
+        "torch_seconds": round(timings["torch"], 2),
+        "backend_seconds": round(timings[backend], 2),
+        "speedup": round(timings["torch"] / timings[backend], 2) if timings[backend] else None,
+    }
 
-DIMENSION = model.get_sentence_embedding_dimension()
-logger.info(f"Embedding dimension: {DIMENSION}")
+
+def is_model_loaded() -> bool:
+    """Whether the embedding model has been loaded in this process"""
+    return _model is not None
+
+
+def get_dimension() -> int:
+    """Embedding dimension of the model (loads the model if needed)"""
+    return get_model().get_sentence_embedding_dimension()
+
+
+def warmup() -> float:
+    """
+    Loads the model and runs one encode, so the first real request doesn't pay
+    for it. Returns the time it took in seconds.
+    """
+    started = time.perf_counter()
+    get_model().encode("warmup", show_progress_bar=False)
+    elapsed = time.perf_counter() - started
+    logger.info(f"Embedding model warmed up in {elapsed:.1f}s")
+    return elapsed
+
+
+def __getattr__(name: str):
+    # Lazy module attributes kept for backwards compatibility (model, DIMENSION)
+    if name == "model":
+        return get_model()
+    if name == "DIMENSION":
+        return get_dimension()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_embedding(
@@ -38,12 +243,18 @@ def get_embedding(
     """
     Generates embedding for a single text.
     Returns an np.ndarray of size (DIMENSION)
+
+    With EMBEDDING_BATCH_WINDOW_MS > 0, concurrent calls are coalesced into one
+    forward pass by the shared EmbeddingBatcher.
     """
     if not text or not text.strip():
         logger.warning("Empty text for embedding -> returning zero vector")
-        return np.zeros(DIMENSION, dtype=np.float32)
+        return np.zeros(get_dimension(), dtype=np.float32)
 
-    embedding = model.encode(
+    if EMBEDDING_BATCH_WINDOW_MS > 0:
+        return get_batcher().submit(text, normalize).result()
+
+    embedding = get_model().encode(
         text,
         normalize_embeddings=normalize,
         batch_size=batch_size,
@@ -59,74 +270,558 @@ def batch_get_embeddings(
 ) -> np.ndarray:
     """
     Generates embeddings for a list of texts.
-    Returns an np.ndarray of size (len(texts), DIMENSION)
+    Returns an np.ndarray of size (len(texts), DIMENSION), in input order.
+
+    Texts are grouped by token length into batches of at most batch_size texts
+    and EMBEDDING_TOKEN_BUDGET padded tokens (see plan_token_batches), so short
+    resumes are not padded to the length of long ones. Empty texts get zero
+    vectors without being encoded.
     """
     if not texts:
-        return np.array([], dtype=np.float32).reshape(0, DIMENSION)
+        return np.array([], dtype=np.float32).reshape(0, get_dimension())
 
-    cleaned_texts = [t if t and t.strip() else "" for t in texts]
+    model = get_model()
+    embeddings = np.zeros((len(texts), model.get_sentence_embedding_dimension()), dtype=np.float32)
+    indices = [i for i, t in enumerate(texts) if t and t.strip()]
+    if not indices:
+        return embeddings
 
-    embeddings = model.encode(
-        cleaned_texts,
-        normalize_embeddings=normalize,
-        batch_size=batch_size,
-        show_progress_bar=True,
+    lengths = _token_lengths(model, [texts[i] for i in indices])
+    batches = plan_token_batches(lengths, EMBEDDING_TOKEN_BUDGET, batch_size)
+
+    for batch in batches:
+        rows = [indices[j] for j in batch]
+        embeddings[rows] = model.encode(
+            [texts[i] for i in rows],
+            normalize_embeddings=normalize,
+            batch_size=len(rows),
+            show_progress_bar=False,
+        )
+
+    fixed = [
+        list(range(s, min(s + batch_size, len(lengths))))
+        for s in range(0, len(lengths), batch_size)
+    ]
+    real, padded = _padding_stats.record(lengths, batches)
+    logger.info(
+        f"Encoded {len(indices)} texts in {len(batches)} batches: padding efficiency "
+        f"{real / padded:.0%} (fixed-size batches: {padding_efficiency(lengths, fixed):.0%})"
     )
+    return embeddings
 
-    for i, text in enumerate(cleaned_texts):
-        if not text.strip():
-            embeddings[i] = 0.0
 
-    return embeddings.astype(np.float32)
+# ─── Length-bucketed batching ────────────────────────────────────────────────────
+#
+# A batch is padded to its longest member, so mixing a 100-token and a 512-token
+# resume wastes most of the forward pass on padding. Batches are built from texts
+# of similar token length and sized by a token budget instead of a text count.
 
 
-# –– Caching based on file –––––––––––––––––––––––––––––––––––––––––––––––––––––
+def _token_lengths(model: SentenceTransformer, texts: list[str]) -> list[int]:
+    """Token count of each text as the model will see it (special tokens, truncation)"""
+    encoded = model.tokenizer(
+        texts,
+        add_special_tokens=True,
+        truncation=True,
+        max_length=model.max_seq_length,
+    )
+    return [len(ids) for ids in encoded["input_ids"]]
 
 
-def get_cached_embedding(file_path: str | Path) -> np.ndarray | None:
-    """Attempts to load embedding from cache"""
-    cache_path = EMBEDDING_CACHE_DIR / f"{Path(file_path).stem}.pkl"
-    if cache_path.exists():
+def _length_bucket(length: int) -> int:
+    # Buckets double in size: <=32, 33-64, 65-128, 129-256, 257-512, ...
+    return max(0, (length - 1).bit_length() - 5)
+
+
+def plan_token_batches(
+    lengths: list[int],
+    token_budget: int,
+    max_batch_size: int,
+) -> list[list[int]]:
+    """
+    Groups indices of `lengths` into batches of similar length.
+
+    Indices are taken longest first (an out-of-memory batch shows up immediately)
+    and batches never mix length buckets (see _length_bucket). A batch is also
+    closed when it holds max_batch_size texts or when adding the next one would
+    make len(batch) * longest exceed token_budget. A text longer than the budget
+    gets a batch of its own.
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+    longest = 0
+    for i in sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True):
+        if current and (
+            len(current) >= max_batch_size
+            or _length_bucket(lengths[i]) != _length_bucket(longest)
+            or (len(current) + 1) * longest > token_budget
+        ):
+            batches.append(current)
+            current, longest = [], 0
+        current.append(i)
+        longest = max(longest, lengths[i])
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _padded_tokens(lengths: list[int], batches: list[list[int]]) -> int:
+    return sum(len(b) * max(lengths[i] for i in b) for b in batches if b)
+
+
+def padding_efficiency(lengths: list[int], batches: list[list[int]]) -> float:
+    """Share of real tokens among all (padded) tokens encoded for these batches"""
+    padded = _padded_tokens(lengths, batches)
+    return sum(lengths) / padded if padded else 1.0
+
+
+class _PaddingStats:
+    """Process-wide counters of real vs padded tokens encoded by batch_get_embeddings"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.texts = self.batches = self.real_tokens = self.padded_tokens = 0
+
+    def record(self, lengths: list[int], batches: list[list[int]]) -> tuple[int, int]:
+        real, padded = sum(lengths), _padded_tokens(lengths, batches)
+        with self._lock:
+            self.texts += len(lengths)
+            self.batches += len(batches)
+            self.real_tokens += real
+            self.padded_tokens += padded
+        return real, padded
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "texts": self.texts,
+                "batches": self.batches,
+                "real_tokens": self.real_tokens,
+                "padded_tokens": self.padded_tokens,
+                "padding_efficiency": (
+                    round(self.real_tokens / self.padded_tokens, 3) if self.padded_tokens else 1.0
+                ),
+            }
+
+
+_padding_stats = _PaddingStats()
+
+
+def get_padding_stats() -> dict:
+    """Real vs padded token totals of batch_get_embeddings in this process"""
+    return _padding_stats.as_dict()
+
+
+# ─── Micro-batching ──────────────────────────────────────────────────────────────
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent single-text encode requests into batched forward passes.
+
+    A daemon thread waits for the first request, keeps collecting for up to
+    max_wait_ms (or until max_batch_size texts) and encodes them in one call.
+    Each caller gets a concurrent.futures.Future; async code can await it with
+    asyncio.wrap_future without blocking the event loop.
+    """
+
+    def __init__(self, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.requests = 0
+        self._queue: queue.Queue[tuple[str, bool, Future] | None] = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str, normalize: bool = True) -> Future:
+        """Queues a text for encoding; the future resolves to its embedding"""
+        future: Future = Future()
+        self._queue.put((text, normalize, future))
+        return future
+
+    def close(self):
+        """Encodes what is already queued, then stops the worker thread"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> dict:
+        """Number of requests, forward passes and the average batch size"""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def _collect(self) -> list[tuple[str, bool, Future]] | None:
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # stop after this batch
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while (batch := self._collect()) is not None:
+            # Callers that gave up (cancelled futures) are dropped from the batch
+            batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+            for normalize in (True, False):
+                group = [item for item in batch if item[1] == normalize]
+                if group:
+                    self._encode(group, normalize)
+
+    def _encode(self, group: list[tuple[str, bool, Future]], normalize: bool):
         try:
-            with open(cache_path, "rb") as f:
-                emb = pickle.load(f)
-            if emb.shape == (DIMENSION,):
-                logger.debug(f"Loaded cached embedding for {file_path}")
-                return emb
+            embeddings = get_model().encode(
+                [text for text, _, _ in group],
+                normalize_embeddings=normalize,
+                batch_size=len(group),
+                show_progress_bar=False,
+            )
         except Exception as e:
-            logger.warning(f"Failed to load cache {cache_path}: {e}")
+            logger.error(f"Batched embedding of {len(group)} texts failed: {e}")
+            for _, _, future in group:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.requests += len(group)
+        for (_, _, future), emb in zip(group, embeddings, strict=True):
+            future.set_result(emb.astype(np.float32))
+
+
+_batcher: EmbeddingBatcher | None = None
+_batcher_pid: int | None = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher() -> EmbeddingBatcher:
+    """Returns this process's EmbeddingBatcher, starting it on first use"""
+    global _batcher, _batcher_pid
+    pid = os.getpid()
+    if _batcher is None or _batcher_pid != pid:
+        with _batcher_lock:
+            if _batcher is None or _batcher_pid != pid:
+                _batcher = EmbeddingBatcher(
+                    max_batch_size=EMBEDDING_BATCH_MAX_SIZE,
+                    max_wait_ms=EMBEDDING_BATCH_WINDOW_MS,
+                )
+                _batcher_pid = pid
+    return _batcher
+
+
+async def aget_embedding(
+    text: str, normalize: bool = True, executor: Executor | None = None
+) -> np.ndarray:
+    """
+    Async get_embedding: awaits the batcher instead of blocking the event loop.
+    Without batching, the encode runs on executor (default: the loop's executor).
+    """
+    if not text or not text.strip() or EMBEDDING_BATCH_WINDOW_MS <= 0:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, get_embedding, text, normalize)
+    return await asyncio.wrap_future(get_batcher().submit(text, normalize))
+
+
+# –– Content-addressed caching ––––––––––––––––––––––––––––––––––––––––––––––––––
+#
+# Cache entries are keyed by a hash of the cleaned text, the model name and the
+# normalization flag: hits are correct across renames and moves, and entries
+# are invalidated automatically when the content or the model changes.
+
+
+def _cache_model_id() -> str:
+    # fp32 ONNX matches torch to float precision and shares its entries;
+    # int8 output differs, so it gets entries of its own.
+    if EMBEDDING_BACKEND == "onnx-int8":
+        return f"{EMBEDDING_MODEL_NAME}#int8-{EMBEDDING_QUANTIZATION}"
+    return EMBEDDING_MODEL_NAME
+
+
+def embedding_cache_key(text: str, normalize: bool = True) -> str:
+    """Returns the cache key of the embedding of text"""
+    digest = hashlib.sha256()
+    digest.update(f"{_cache_model_id()}\0normalize={int(normalize)}\0".encode())
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+_cache: EmbeddingShardCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingShardCache:
+    """Returns the on-disk embedding cache (shard store in EMBEDDING_CACHE_DIR)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingShardCache(
+                EMBEDDING_CACHE_DIR,
+                dtype=EMBEDDING_CACHE_DTYPE,
+                max_bytes=EMBEDDING_CACHE_MAX_MB * 1024 * 1024 or None,
+            )
+    return _cache
+
+
+def get_cached_embedding(text: str, normalize: bool = True) -> np.ndarray | None:
+    """Attempts to load embedding from cache"""
+    try:
+        emb = get_embedding_cache().get(embedding_cache_key(text, normalize))
+    except Exception as e:
+        logger.warning(f"Failed to read embedding cache: {e}")
+        return None
+    # The key includes the model name, so a hit always has the model's dimension;
+    # checking it against get_dimension() would load the model on every hit.
+    if emb is not None and emb.ndim == 1:
+        return emb
     return None
 
 
-def save_embedding_to_cache(file_path: str | Path, embedding: np.ndarray):
+def save_embedding_to_cache(text: str, embedding: np.ndarray, normalize: bool = True):
     """Saves embedding in cache"""
-    EMBEDDING_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    cache_path = EMBEDDING_CACHE_DIR / f"{Path(file_path).stem}.pkl"
     try:
-        with open(cache_path, "wb") as f:
-            pickle.dump(embedding, f)
-        logger.debug(f"Saved embedding cache: {cache_path}")
+        get_embedding_cache().put(embedding_cache_key(text, normalize), embedding)
     except Exception as e:
-        logger.warning(f"Failed to save cache {cache_path}: {e}")
+        logger.warning(f"Failed to save embedding cache: {e}")
 
 
 def get_or_compute_embedding(
     text: str,
     file_path: str | Path | None = None,
     force_recompute: bool = False,
+    normalize: bool = True,
 ) -> np.ndarray:
     """
     Smart method: takes from cache if available and does not force_recompute,
     otherwise calculates and saves to cache.
+
+    The cache is keyed by content (see embedding_cache_key), so re-importing an
+    unchanged resume - even renamed or with --force - never re-encodes it.
+    file_path is only used for log messages.
     """
-    if file_path and not force_recompute:
-        cached = get_cached_embedding(file_path)
+    if not force_recompute:
+        cached = get_cached_embedding(text, normalize)
         if cached is not None:
+            if file_path:
+                logger.debug(f"Embedding cache hit for {Path(file_path).name}")
             return cached
 
-    emb = get_embedding(text)
+    emb = get_embedding(text, normalize=normalize)
 
-    if file_path:
-        save_embedding_to_cache(file_path, emb)
+    if text and text.strip():
+        save_embedding_to_cache(text, emb, normalize)
 
     return emb
+
+
+def get_or_compute_embeddings(
+    texts: list[str],
+    force_recompute: bool = False,
+    normalize: bool = True,
+    batch_size: int = 32,
+) -> np.ndarray:
+    """
+    Batch version of get_or_compute_embedding: cached embeddings are reused and
+    all the missing ones are encoded together with batch_get_embeddings.
+    Returns an np.ndarray of size (len(texts), DIMENSION)
+    """
+    if not texts:
+        return batch_get_embeddings([])
+
+    keys = [embedding_cache_key(text, normalize) for text in texts]
+
+    cached: dict[str, np.ndarray] = {}
+    if not force_recompute:
+        try:
+            cached = get_embedding_cache().get_many(keys)
+        except Exception as e:
+            logger.warning(f"Failed to read embedding cache: {e}")
+
+    found: list[np.ndarray | None] = [None] * len(texts)
+    missing: list[int] = []
+    for i, key in enumerate(keys):
+        emb = cached.get(key)
+        if emb is not None and emb.ndim == 1:
+            found[i] = emb
+        else:
+            missing.append(i)
+
+    if missing:
+        logger.info(f"Encoding {len(missing)} texts ({len(texts) - len(missing)} cached)")
+        computed = batch_get_embeddings(
+            [texts[i] for i in missing], normalize=normalize, batch_size=batch_size
+        )
+        to_cache: dict[str, np.ndarray] = {}
+        for i, emb in zip(missing, computed, strict=True):
+            found[i] = emb
+            if texts[i] and texts[i].strip():
+                to_cache[keys[i]] = emb
+        try:
+            get_embedding_cache().put_many(to_cache)
+        except Exception as e:
+            logger.warning(f"Failed to save embedding cache: {e}")
+
+    # All hits: the model is never loaded
+    embeddings = np.stack(found).astype(np.float32, copy=False)
+    return embeddings
+
+
+# ─── Chunked documents ───────────────────────────────────────────────────────────
+#
+# The model truncates at max_seq_length (512 tokens for E5), so a single embedding
+# of a long resume only sees its beginning. In chunking mode (EMBEDDING_CHUNKING)
+# the text is split into overlapping token windows, every window is embedded (one
+# batched, cached call for all documents) and the document vector is their
+# length-weighted mean. Per-chunk vectors are stored in resume_chunks for
+# max-chunk matching.
+
+
+@dataclass
+class ChunkedEmbedding:
+    """Pooled document vector plus the vectors and character spans of its chunks"""
+
+    vector: np.ndarray
+    chunk_vectors: np.ndarray  # (n_chunks, DIMENSION)
+    spans: list[tuple[int, int]]  # [start, end) character offsets in the text
+
+    def chunk_records(self) -> list[tuple[int, int, np.ndarray]]:
+        """(start, end, vector) per chunk, as expected by db.store_resume(s)"""
+        return [
+            (start, end, vec)
+            for (start, end), vec in zip(self.spans, self.chunk_vectors, strict=True)
+        ]
+
+
+def chunk_windows(n_tokens: int, size: int, overlap: int) -> list[tuple[int, int]]:
+    """[start, end) token windows of `size` covering n_tokens, overlapping by `overlap`"""
+    if n_tokens <= size:
+        return [(0, n_tokens)] if n_tokens else []
+    step = max(1, size - overlap)
+    windows = []
+    for start in range(0, n_tokens, step):
+        end = min(start + size, n_tokens)
+        windows.append((start, end))
+        if end == n_tokens:
+            break
+    return windows
+
+
+def split_into_chunks(text: str, overlap: int | None = None) -> list[tuple[int, int]]:
+    """
+    Character spans of the overlapping token windows of text, each short enough
+    to be encoded without truncation (at most EMBEDDING_MAX_CHUNKS of them).
+    """
+    if not text or not text.strip():
+        return []
+
+    model = get_model()
+    size = model.max_seq_length - 2  # room for the special tokens
+    overlap = EMBEDDING_CHUNK_OVERLAP if overlap is None else overlap
+    offsets = model.tokenizer(
+        text,
+        add_special_tokens=False,
+        return_offsets_mapping=True,
+        truncation=False,
+        verbose=False,
+    )["offset_mapping"]
+
+    windows = chunk_windows(len(offsets), size, overlap)
+    if len(windows) > EMBEDDING_MAX_CHUNKS:
+        logger.warning(
+            f"Text of {len(offsets)} tokens needs {len(windows)} chunks, "
+            f"embedding the first {EMBEDDING_MAX_CHUNKS}"
+        )
+        windows = windows[:EMBEDDING_MAX_CHUNKS]
+    return [(offsets[start][0], offsets[end - 1][1]) for start, end in windows]
+
+
+def get_or_compute_chunked_embeddings(
+    texts: list[str],
+    force_recompute: bool = False,
+    normalize: bool = True,
+) -> list[ChunkedEmbedding]:
+    """
+    Chunked embeddings of texts: the chunks of all texts are embedded in one
+    get_or_compute_embeddings call (cached per chunk, so a text that fits in
+    one window shares its cache entry with the plain embedding).
+    """
+    spans = [split_into_chunks(text) for text in texts]
+    chunk_texts = [
+        text[start:end]
+        for text, text_spans in zip(texts, spans, strict=True)
+        for start, end in text_spans
+    ]
+    vectors = get_or_compute_embeddings(
+        chunk_texts, force_recompute=force_recompute, normalize=normalize
+    )
+
+    results = []
+    offset = 0
+    for text_spans in spans:
+        chunk_vectors = vectors[offset : offset + len(text_spans)]
+        offset += len(text_spans)
+        if not text_spans:
+            pooled = np.zeros(get_dimension(), dtype=np.float32)
+        else:
+            weights = np.array([end - start for start, end in text_spans], dtype=np.float32)
+            pooled = np.average(chunk_vectors, axis=0, weights=weights).astype(np.float32)
+            norm = np.linalg.norm(pooled)
+            if normalize and norm > 0:
+                pooled /= norm
+        results.append(
+            ChunkedEmbedding(vector=pooled, chunk_vectors=chunk_vectors, spans=text_spans)
+        )
+    return results
+
+
+# ─── Query embeddings ────────────────────────────────────────────────────────────
+
+_query_cache = LRUCache(QUERY_EMBEDDING_CACHE_SIZE, QUERY_EMBEDDING_CACHE_TTL)
+
+
+def get_query_embedding(text: str, normalize: bool = True) -> np.ndarray:
+    """
+    Embedding for a search query (vacancy text), memoized in an in-process LRU.
+
+    Recruiters re-run the same vacancy while tweaking top_n / min_score, so repeat
+    matches skip the encode. Keyed like the disk cache (text, model, normalize),
+    but kept in memory only: queries are not worth persisting next to resumes.
+    The returned array is read-only since it is shared between callers.
+    """
+    key = embedding_cache_key(text, normalize)
+    emb = _query_cache.get(key)
+    if emb is None:
+        emb = get_embedding(text, normalize=normalize)
+        emb.setflags(write=False)
+        _query_cache.put(key, emb)
+    return emb
+
+
+async def aget_query_embedding(
+    text: str, normalize: bool = True, executor: Executor | None = None
+) -> np.ndarray:
+    """Async get_query_embedding, for API handlers (executor: see aget_embedding)"""
+    key = embedding_cache_key(text, normalize)
+    emb = _query_cache.get(key)
+    if emb is None:
+        emb = await aget_embedding(text, normalize=normalize, executor=executor)
+        emb.setflags(write=False)
+        _query_cache.put(key, emb)
+    return emb
+
+
+def get_query_cache_stats() -> dict:
+    """Hit/miss counters and size of the query embedding cache"""
+    return _query_cache.stats()
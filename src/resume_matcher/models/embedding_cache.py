@@ -0,0 +1,362 @@
+# src/resume_matcher/models/embedding_cache.py
+"""
+Compact on-disk embedding cache.
+
+Vectors are appended to fixed-width shard files (raw float32 or float16 rows) and
+located through a SQLite key -> (shard, row) index. Shards are read through
+numpy.memmap, so lookups touch only the rows they need, gathered with one read
+per shard for batch lookups. Replaces the one-pickle-per-resume layout: no directory
+scans over hundreds of thousands of files and no unpickling of cache contents.
+
+Layout of the cache directory:
+    index.sqlite          key -> shard file, row, last access time
+    shard_00000.f32       rows of `dim` float32 values (or .f16 for float16)
+    shard_00001.f32       ...
+
+Appends are done with O_APPEND writes, so several processes can add entries at
+the same time. Eviction only drops index entries; the space is reclaimed by
+compact(), which should run while no import is in progress.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.sqlite"
+SHARD_SUFFIXES = {"float32": "f32", "float16": "f16"}
+SUFFIX_DTYPES = {suffix: np.dtype(name) for name, suffix in SHARD_SUFFIXES.items()}
+
+
+class EmbeddingShardCache:
+    """Append-only, memory-mapped embedding cache addressed by string keys."""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        dtype: str = "float32",
+        max_bytes: int | None = None,
+        shard_rows: int = 65536,
+    ):
+        if dtype not in SHARD_SUFFIXES:
+            raise ValueError(f"Unsupported cache dtype: {dtype}. Use one of {list(SHARD_SUFFIXES)}")
+
+        self.cache_dir = Path(cache_dir)
+        self.dtype = np.dtype(dtype)
+        self.max_bytes = max_bytes
+        self.shard_rows = shard_rows
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._maps: dict[str, np.memmap] = {}
+        self._db = sqlite3.connect(self.cache_dir / INDEX_FILE, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                shard TEXT NOT NULL,
+                row INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self._db.commit()
+
+    # ─── Reading ─────────────────────────────────────────────────────────────
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Returns the cached vector (float32 copy) or None."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Returns cached vectors (float32 copies) for the keys that are present."""
+        if not keys:
+            return {}
+
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            dim = self._dim()
+            if dim is None:
+                return found
+
+            rows: list[tuple[str, str, int]] = []
+            for chunk in _chunks(list(dict.fromkeys(keys)), 500):
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(
+                    self._db.execute(
+                        f"SELECT key, shard, row FROM entries WHERE key IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+                )
+
+            by_shard: dict[str, list[tuple[str, int]]] = {}
+            for key, shard, row in rows:
+                by_shard.setdefault(shard, []).append((key, row))
+
+            for shard, entries in by_shard.items():
+                shard_rows = [row for _, row in entries]
+                matrix = self._map(shard, dim, min_rows=max(shard_rows) + 1)
+                if matrix is None:
+                    continue
+                vectors = np.asarray(matrix[shard_rows], dtype=np.float32)
+                for (key, _), vector in zip(entries, vectors, strict=True):
+                    found[key] = vector
+
+            if found:
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE entries SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._db.commit()
+
+        return found
+
+    # ─── Writing ─────────────────────────────────────────────────────────────
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        """Adds (or replaces) one vector."""
+        self.put_many({key: vector})
+
+    def put_many(self, vectors: dict[str, np.ndarray]) -> None:
+        """Appends vectors to the current shard and indexes them."""
+        if not vectors:
+            return
+
+        with self._lock:
+            matrix = np.stack([np.asarray(v, dtype=self.dtype).ravel() for v in vectors.values()])
+            dim = self._dim()
+            if dim is None:
+                # Another process may store the dimension of its first write meanwhile
+                self._db.execute(
+                    "INSERT OR IGNORE INTO meta (name, value) VALUES ('dim', ?)",
+                    (str(matrix.shape[1]),),
+                )
+                self._db.commit()
+                dim = self._dim()
+                if dim is None:
+                    raise RuntimeError("Embedding cache dimension was not recorded")
+            if matrix.shape[1] != dim:
+                raise ValueError(f"Vector dimension {matrix.shape[1]} != cache dimension {dim}")
+
+            shard = self._current_shard(dim)
+            row_bytes = dim * self.dtype.itemsize
+            fd = os.open(self.cache_dir / shard, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                first_row = _append(fd, matrix.tobytes(), row_bytes)
+            finally:
+                os.close(fd)
+
+            now = time.time()
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries (key, shard, row, last_access) VALUES (?, ?, ?, ?)",
+                [(key, shard, first_row + i, now) for i, key in enumerate(vectors)],
+            )
+            self._db.commit()
+
+        if self.max_bytes:
+            self.evict(self.max_bytes)
+
+    # ─── Maintenance ─────────────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, int | float | str | None]:
+        """Entry count, live vs on-disk bytes and shard count."""
+        with self._lock:
+            dim = self._dim()
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            live_bytes = 0
+            for shard, count in self._db.execute(
+                "SELECT shard, COUNT(*) FROM entries GROUP BY shard"
+            ):
+                live_bytes += count * (dim or 0) * _shard_dtype(shard).itemsize
+
+        shards = self._shard_files()
+        disk_bytes = sum(p.stat().st_size for p in shards)
+        return {
+            "entries": entries,
+            "dimension": dim,
+            "dtype": self.dtype.name,
+            "shards": len(shards),
+            "live_bytes": live_bytes,
+            "disk_bytes": disk_bytes,
+            "reclaimable_bytes": max(disk_bytes - live_bytes, 0),
+            "max_bytes": self.max_bytes,
+        }
+
+    def evict(self, max_bytes: int) -> int:
+        """Drops least recently used entries until live data fits max_bytes. Returns evicted count."""
+        with self._lock:
+            dim = self._dim()
+            if dim is None:
+                return 0
+            row_bytes = dim * self.dtype.itemsize
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            excess = entries - max_bytes // row_bytes
+            if excess <= 0:
+                return 0
+            self._db.execute(
+                """
+                DELETE FROM entries WHERE key IN (
+                    SELECT key FROM entries ORDER BY last_access LIMIT ?
+                )
+                """,
+                (excess,),
+            )
+            self._db.commit()
+
+        logger.info(f"Evicted {excess} embeddings from cache (run compaction to free disk space)")
+        return excess
+
+    def compact(self) -> dict[str, int]:
+        """
+        Rewrites live entries into fresh shards (in the configured dtype) and deletes
+        the old shard files, reclaiming space left by evicted or replaced entries.
+        """
+        with self._lock:
+            old_shards = self._shard_files()
+            before = sum(p.stat().st_size for p in old_shards)
+            dim = self._dim()
+            if dim is None:
+                return {"entries": 0, "bytes_before": before, "bytes_after": before}
+
+            by_shard: dict[str, list[tuple[str, int, float]]] = {}
+            for key, shard, row, last_access in self._db.execute(
+                "SELECT key, shard, row, last_access FROM entries"
+            ):
+                by_shard.setdefault(shard, []).append((key, row, last_access))
+
+            suffix = SHARD_SUFFIXES[self.dtype.name]
+            next_number = max((int(p.stem.split("_")[1]) for p in old_shards), default=-1) + 1
+            out_shard, out_rows = f"shard_{next_number:05d}.{suffix}", 0
+            new_entries: list[tuple[str, str, int, float]] = []
+
+            for shard, entries in sorted(by_shard.items()):
+                entries.sort(key=lambda e: e[1])
+                matrix = self._map(shard, dim, min_rows=entries[-1][1] + 1)
+                if matrix is None:
+                    continue
+                for chunk in _chunks(entries, self.shard_rows):
+                    rows = [row for _, row, _ in chunk]
+                    vectors = np.asarray(matrix[rows], dtype=self.dtype)
+                    start = 0
+                    while start < len(chunk):
+                        if out_rows == self.shard_rows:
+                            next_number += 1
+                            out_shard, out_rows = f"shard_{next_number:05d}.{suffix}", 0
+                        take = min(self.shard_rows - out_rows, len(chunk) - start)
+                        with open(self.cache_dir / out_shard, "ab") as f:
+                            f.write(vectors[start : start + take].tobytes())
+                        for i, (key, _, last_access) in enumerate(chunk[start : start + take]):
+                            new_entries.append((key, out_shard, out_rows + i, last_access))
+                        out_rows += take
+                        start += take
+
+            self._db.execute("DELETE FROM entries")
+            self._db.executemany(
+                "INSERT INTO entries (key, shard, row, last_access) VALUES (?, ?, ?, ?)",
+                new_entries,
+            )
+            self._db.commit()
+
+            self._maps.clear()
+            for path in old_shards:
+                path.unlink()
+
+        after = sum(p.stat().st_size for p in self._shard_files())
+        logger.info(f"Compacted embedding cache: {before:,} -> {after:,} bytes")
+        return {"entries": len(new_entries), "bytes_before": before, "bytes_after": after}
+
+    def clear(self) -> None:
+        """Removes every entry and shard file."""
+        with self._lock:
+            self._maps.clear()
+            self._db.execute("DELETE FROM entries")
+            self._db.execute("DELETE FROM meta")
+            self._db.commit()
+            for path in self._shard_files():
+                path.unlink()
+
+    # ─── Internals ───────────────────────────────────────────────────────────
+
+    def _dim(self) -> int | None:
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+        return int(row[0]) if row else None
+
+    def _shard_files(self) -> list[Path]:
+        return sorted(
+            p for suffix in SUFFIX_DTYPES for p in self.cache_dir.glob(f"shard_*.{suffix}")
+        )
+
+    def _current_shard(self, dim: int) -> str:
+        """Name of the shard to append to: the last one of our dtype, unless full."""
+        suffix = SHARD_SUFFIXES[self.dtype.name]
+        shards = sorted(self.cache_dir.glob(f"shard_*.{suffix}"))
+        row_bytes = dim * self.dtype.itemsize
+        if shards and shards[-1].stat().st_size // row_bytes < self.shard_rows:
+            return shards[-1].name
+
+        numbers = [int(p.stem.split("_")[1]) for p in self._shard_files()]
+        return f"shard_{max(numbers, default=-1) + 1:05d}.{suffix}"
+
+    def _map(self, shard: str, dim: int, min_rows: int) -> np.memmap | None:
+        """Read-only memmap of a shard, re-opened when it has grown past the mapped rows."""
+        matrix = self._maps.get(shard)
+        if matrix is not None and matrix.shape[0] >= min_rows:
+            return matrix
+
+        path = self.cache_dir / shard
+        if not path.exists():
+            logger.warning(f"Embedding cache shard is missing: {path}")
+            return None
+
+        dtype = _shard_dtype(shard)
+        rows = path.stat().st_size // (dim * dtype.itemsize)
+        if rows < min_rows:
+            logger.warning(f"Embedding cache shard {shard} is truncated")
+            return None
+
+        matrix = np.memmap(path, dtype=dtype, mode="r", shape=(rows, dim))
+        self._maps[shard] = matrix
+        return matrix
+
+
+def _append(fd: int, data: bytes, row_bytes: int) -> int:
+    """
+    Writes data at the end of an O_APPEND file and returns the row it starts at.
+    Short writes are continued; if another process appended in between, our rows
+    are no longer contiguous and OSError is raised (they are then never indexed).
+    """
+    view = memoryview(data)
+    written = os.write(fd, view)
+    # O_APPEND: our bytes end where our file offset is now, whatever other
+    # processes appended before us
+    start = os.lseek(fd, 0, os.SEEK_CUR) - written
+    while written < len(view):
+        n = os.write(fd, view[written:])
+        if n == 0:
+            raise OSError("Embedding cache shard write made no progress")
+        written += n
+        if os.lseek(fd, 0, os.SEEK_CUR) != start + written:
+            raise OSError("Embedding cache shard append was interleaved with another writer")
+    if start % row_bytes:
+        raise OSError("Embedding cache shard is not row-aligned")
+    return start // row_bytes
+
+
+def _shard_dtype(shard: str) -> np.dtype:
+    return SUFFIX_DTYPES[shard.rsplit(".", 1)[1]]
+
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
@@ -0,0 +1,240 @@
+# src/resume_matcher/models/llm_cache.py
+"""
+Persistent cache of LLM responses (resume parsing, vacancy parsing, candidate scoring).
+
+Re-importing with --force, re-running a vacancy or re-scoring a candidate against
+the same requirements sends the very same prompt to Groq again. Completions are
+stored in a SQLite file keyed by task, prompt-template version, model and a hash
+of the prompt, so such calls cost neither latency nor tokens. Bumping a task's
+template version invalidates its entries.
+
+Entries expire after LLM_CACHE_TTL seconds and the least recently used ones are
+evicted beyond LLM_CACHE_MAX_ENTRIES. Only completions that parsed as JSON are
+stored, so a malformed answer is retried on the next call.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from resume_matcher.config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL,
+)
+
+logger = logging.getLogger(__name__)
+
+# Puts between two size checks (COUNT(*) is a scan)
+EVICTION_CHECK_INTERVAL = 64
+
+
+class LLMResponseCache:
+    """SQLite key -> completion store with TTL and LRU size bound."""
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self.max_entries = max_entries if max_entries and max_entries > 0 else None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._puts = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                task TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+        self._db.commit()
+
+    def get(self, key: str) -> str | None:
+        """Returns the cached completion, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, task: str, response: str) -> None:
+        """Stores a completion, evicting expired and least recently used entries"""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, task, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, task, response, now, now),
+            )
+            self._db.commit()
+            self._puts += 1
+            if self._puts % EVICTION_CHECK_INTERVAL == 1:
+                self._evict_locked(now)
+
+    def evict(self) -> int:
+        """Drops expired entries and the least recently used ones over max_entries"""
+        with self._lock:
+            return self._evict_locked(time.time())
+
+    def _evict_locked(self, now: float) -> int:
+        removed = 0
+        if self.ttl_seconds:
+            removed += self._db.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+        if self.max_entries:
+            excess = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            excess -= self.max_entries
+            if excess > 0:
+                removed += self._db.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                    (excess,),
+                ).rowcount
+        self._db.commit()
+        if removed:
+            self.evictions += removed
+            logger.info(f"LLM cache: evicted {removed} entries")
+        return removed
+
+    def clear(self) -> None:
+        """Drops all entries (counters are kept)"""
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def stats(self) -> dict[str, Any]:
+        """Entries per task, size bounds and hit/miss counters of this process"""
+        with self._lock:
+            by_task = dict(
+                self._db.execute("SELECT task, COUNT(*) FROM responses GROUP BY task").fetchall()
+            )
+        lookups = self.hits + self.misses
+        return {
+            "entries": sum(by_task.values()),
+            "by_task": by_task,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+def llm_cache_key(task: str, version: str, model: str, prompt: str) -> str:
+    """Key of one completion: task, prompt-template version, model and prompt hash"""
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{task}\0{version}\0{model}\0{prompt_hash}".encode()).hexdigest()
+
+
+_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache | None:
+    """The process-wide cache at LLM_CACHE_PATH, or None when LLM_CACHE_ENABLED is off"""
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache(
+                    LLM_CACHE_PATH, ttl_seconds=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES
+                )
+    return _cache
+
+
+def get_llm_cache_stats() -> dict[str, Any]:
+    """Stats of the LLM cache ({"enabled": False} when disabled)"""
+    cache = get_llm_cache()
+    return {"enabled": True, **cache.stats()} if cache else {"enabled": False}
+
+
+def strip_code_fence(content: str) -> str:
+    """Removes a ```json ... ``` (or plain ```) fence around a completion"""
+    content = content.strip()
+    if content.startswith("```"):
+        content = content.split("```")[1]
+        if content.startswith("json"):
+            content = content[4:]
+        content = content.strip()
+    return content
+
+
+def lookup_json_completion(task: str, version: str, model: str, prompt: str) -> tuple[str, Any]:
+    """(cache key, parsed cached answer or None) for a prompt"""
+    cache = get_llm_cache()
+    key = llm_cache_key(task, version, model, prompt)
+    content = cache.get(key) if cache else None
+    if content is None:
+        return key, None
+    logger.info(f"LLM cache hit ({task})")
+    return key, json.loads(content)
+
+
+def store_json_completion(key: str, task: str, completion: str) -> Any:
+    """
+    Parses a raw completion and caches it under key once it parses.
+    json.JSONDecodeError propagates (nothing is stored).
+    """
+    content = strip_code_fence(completion)
+    data = json.loads(content)
+    cache = get_llm_cache()
+    if cache:
+        cache.put(key, task, content)
+    return data
+
+
+def cached_json_completion(
+    task: str,
+    version: str,
+    model: str,
+    prompt: str,
+    complete: Callable[[], str],
+) -> tuple[Any, bool]:
+    """
+    Parsed JSON answer to prompt and whether it came from the cache.
+
+    complete() is only called on a miss and must return the raw completion text;
+    it is stored once it parses. json.JSONDecodeError propagates as before.
+    """
+    key, data = lookup_json_completion(task, version, model, prompt)
+    if data is not None:
+        return data, True
+    return store_json_completion(key, task, complete()), False
@@ -0,0 +1,430 @@
+# src/resume_matcher/models/llm_dispatch.py
+"""
+Shared dispatcher for Groq chat completions.
+
+The importer (resume parsing) and the scorer (vacancy parsing, candidate
+scoring) send their requests through one LLMDispatcher per process. It runs
+AsyncGroq on its own event-loop thread, so sync callers block on a future and
+async callers await it, and it adapts to the capacity Groq actually grants:
+
+- concurrency is AIMD: +1 per window of successful requests, halved on a 429,
+  cut by a quarter when x-ratelimit-remaining-tokens runs low
+- 429s, timeouts, connection errors and 5xx are retried with jittered
+  exponential backoff, honouring retry-after / x-ratelimit-reset-tokens
+- requests reserve their estimated tokens in a sliding one-minute window
+  (LLM_TOKENS_PER_MINUTE), shared by every stage of the process
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Coroutine, Mapping
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+from dotenv import load_dotenv
+from groq import (
+    APIConnectionError,
+    AsyncGroq,
+    InternalServerError,
+    RateLimitError,
+)
+
+from resume_matcher.config import (
+    LLM_INITIAL_CONCURRENCY,
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_RETRIES,
+    LLM_TOKENS_PER_MINUTE,
+)
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+GROQ_MODEL = "llama-3.3-70b-versatile"
+
+# Backoff before retry n: uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**n)) seconds
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+# Seconds one HTTP request to Groq may take before it fails (and is retried)
+REQUEST_TIMEOUT = 60.0
+# Remaining tokens (share of the limit) below which concurrency backs off
+LOW_TOKENS_RATIO = 0.1
+# Minimum seconds between two decreases: 429s of one burst count as one signal
+DECREASE_INTERVAL = 1.0
+TOKEN_WINDOW = 60.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_duration(value: str | None) -> float | None:
+    """Seconds of a Groq reset header ("7.66s", "2m59.56s", "120ms") or a plain number"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(n + u for n, u in parts) != value:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Tokens reserved for a request: ~4 characters per prompt token plus the completion"""
+    return len(prompt) // 4 + max_tokens
+
+
+class TokenWindow:
+    """
+    Tokens sent in the last minute, against a per-minute budget.
+
+    Requests reserve their estimate up front; the entry is corrected to the
+    real usage once the response arrives (or to 0 when nothing was processed).
+    Only the dispatcher's event loop reserves and waits; used() is also read by
+    stats() from other threads, hence the lock.
+    """
+
+    def __init__(self, tokens_per_minute: int, window: float = TOKEN_WINDOW):
+        self.tokens_per_minute = max(0, tokens_per_minute)
+        self.window = window
+        self._entries: deque[list[float]] = deque()  # [timestamp, tokens]
+        self._lock = threading.Lock()
+
+    def used(self, now: float) -> int:
+        """Tokens sent within the window ending at now (safe to call from any thread)"""
+        with self._lock:
+            return self._used(now)
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        """Seconds until tokens fit in the budget (0 = now)"""
+        if not self.tokens_per_minute:
+            return 0.0
+        with self._lock:
+            self._expire(now)
+            excess = self._used(now) + tokens - self.tokens_per_minute
+            if excess <= 0 or not self._entries:
+                # A request larger than the whole budget still goes out on an empty window
+                return 0.0
+            freed = 0.0
+            for timestamp, used in self._entries:
+                freed += used
+                if freed >= excess:
+                    return max(0.0, timestamp + self.window - now)
+            return max(0.0, self._entries[-1][0] + self.window - now)
+
+    def reserve(self, tokens: int, now: float) -> list[float]:
+        """Records tokens as sent now; returns the entry to correct later"""
+        with self._lock:
+            self._expire(now)
+            entry = [now, float(tokens)]
+            self._entries.append(entry)
+            return entry
+
+    def _used(self, now: float) -> int:
+        return int(sum(tokens for sent, tokens in self._entries if sent > now - self.window))
+
+    def _expire(self, now: float) -> None:
+        while self._entries and self._entries[0][0] <= now - self.window:
+            self._entries.popleft()
+
+
+class AIMDLimiter:
+    """
+    Adaptive concurrency limit: additive increase, multiplicative decrease.
+
+    Each success adds 1/limit (so roughly +1 per full window of requests);
+    decrease() multiplies the limit by a factor, at most once per
+    DECREASE_INTERVAL. Not thread-safe: only touched from the dispatcher's loop.
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 16):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.in_flight = 0
+        self._last_decrease = float("-inf")
+        self._condition: asyncio.Condition | None = None
+
+    @property
+    def slots(self) -> int:
+        return max(self.minimum, int(self.limit))
+
+    def increase(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+    def decrease(self, factor: float, now: float) -> bool:
+        """Shrinks the limit; returns False if it was shrunk less than DECREASE_INTERVAL ago"""
+        if now - self._last_decrease < DECREASE_INTERVAL:
+            return False
+        self._last_decrease = now
+        self.limit = max(float(self.minimum), self.limit * factor)
+        return True
+
+    async def acquire(self) -> None:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.slots)
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+
+class LLMDispatcher:
+    """
+    Sends chat completions to Groq within an adaptive concurrency limit and a
+    shared token budget, retrying transient failures.
+
+    Usage:
+        dispatcher = get_llm_dispatcher()
+        text = dispatcher.complete(prompt, max_tokens=800)            # sync
+        text = await dispatcher.acomplete(prompt, max_tokens=800)     # any event loop
+        future = dispatcher.submit(prompt, max_tokens=800)            # fan-out
+    """
+
+    def __init__(
+        self,
+        initial_concurrency: int = LLM_INITIAL_CONCURRENCY,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        tokens_per_minute: int = LLM_TOKENS_PER_MINUTE,
+        max_retries: int = LLM_MAX_RETRIES,
+        client: AsyncGroq | None = None,
+    ):
+        self.limiter = AIMDLimiter(initial_concurrency, maximum=max_concurrency)
+        self.tokens = TokenWindow(tokens_per_minute)
+        self.max_retries = max(0, max_retries)
+        self._client = client
+        self._paused_until = 0.0  # monotonic; set from retry-after / reset headers
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    # ─── Public API ──────────────────────────────────────────────────────────
+
+    def submit(
+        self,
+        prompt: str,
+        max_tokens: int,
+        model: str = GROQ_MODEL,
+        temperature: float = 0.0,
+        top_p: float = 1.0,
+    ) -> Future[str]:
+        """Schedules a completion; the future resolves to its text"""
+        return self.run(self._complete(prompt, max_tokens, model, temperature, top_p))
+
+    def complete(self, prompt: str, max_tokens: int, **kwargs: Any) -> str:
+        """Completion text, blocking the calling thread"""
+        return self.submit(prompt, max_tokens, **kwargs).result()
+
+    async def acomplete(self, prompt: str, max_tokens: int, **kwargs: Any) -> str:
+        """Completion text, awaited from any event loop"""
+        return await asyncio.wrap_future(self.submit(prompt, max_tokens, **kwargs))
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """Runs a coroutine on the dispatcher's loop (e.g. one that awaits several completions)"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def completion_timeout(self) -> float:
+        """
+        Seconds after which a completion can be given up on: every attempt timing
+        out, each followed by the longest backoff or pause
+        """
+        return (self.max_retries + 1) * (REQUEST_TIMEOUT + BACKOFF_MAX)
+
+    def stats(self) -> dict[str, Any]:
+        """Current limit, in-flight requests, tokens of the last minute and counters"""
+        return {
+            "concurrency_limit": round(self.limiter.limit, 2),
+            "max_concurrency": self.limiter.maximum,
+            "in_flight": self.limiter.in_flight,
+            "tokens_last_minute": self.tokens.used(time.monotonic()),
+            "tokens_per_minute": self.tokens.tokens_per_minute or None,
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures,
+        }
+
+    def close(self) -> None:
+        """Stops the event-loop thread (pending requests are cancelled)"""
+        with self._start_lock:
+            if self._loop is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+    # ─── Event loop ──────────────────────────────────────────────────────────
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._start_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(
+                        target=loop.run_forever, name="llm-dispatcher", daemon=True
+                    )
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def _get_client(self) -> AsyncGroq:
+        if self._client is None:
+            api_key = os.getenv("GROQ_API_KEY")
+            if not api_key:
+                raise RuntimeError("GROQ_API_KEY environment variable is not set")
+            # Retries are ours: the SDK's own would hide 429s from the limiter
+            self._client = AsyncGroq(api_key=api_key, max_retries=0, timeout=REQUEST_TIMEOUT)
+        return self._client
+
+    # ─── Requests ────────────────────────────────────────────────────────────
+
+    async def _complete(
+        self, prompt: str, max_tokens: int, model: str, temperature: float, top_p: float
+    ) -> str:
+        try:
+            return await self._complete_with_retries(prompt, max_tokens, model, temperature, top_p)
+        except Exception:
+            # Retries exhausted or not retryable (bad request, auth, missing API key...)
+            self.failures += 1
+            raise
+
+    async def _complete_with_retries(
+        self, prompt: str, max_tokens: int, model: str, temperature: float, top_p: float
+    ) -> str:
+        client = self._get_client()
+        estimate = estimate_tokens(prompt, max_tokens)
+
+        attempt = 0
+        while True:
+            await self._wait_for_budget(estimate)
+            entry = self.tokens.reserve(estimate, time.monotonic())
+            await self.limiter.acquire()
+            try:
+                await self._wait_for_pause()
+                self.requests += 1
+                raw = await client.chat.completions.with_raw_response.create(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    top_p=top_p,
+                )
+            except RateLimitError as e:
+                entry[1] = 0
+                self.rate_limited += 1
+                delay = self._on_rate_limited(e.response.headers, attempt)
+                error: Exception = e
+            except (APIConnectionError, InternalServerError) as e:
+                # APITimeoutError is an APIConnectionError
+                entry[1] = 0
+                delay = backoff_delay(attempt)
+                error = e
+            else:
+                completion = raw.parse()
+                if completion.usage is not None:
+                    entry[1] = completion.usage.total_tokens
+                self._on_success(raw.headers)
+                return completion.choices[0].message.content
+            finally:
+                await self.limiter.release()
+
+            if attempt == self.max_retries:
+                raise error
+            self.retries += 1
+            logger.warning(
+                f"Groq request failed ({type(error).__name__}), retry {attempt + 1}/"
+                f"{self.max_retries} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _wait_for_budget(self, tokens: int) -> None:
+        while (delay := self.tokens.wait_time(tokens, time.monotonic())) > 0:
+            await asyncio.sleep(delay)
+
+    async def _wait_for_pause(self) -> None:
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _on_success(self, headers: Mapping[str, str]) -> None:
+        limit = _header_int(headers, "x-ratelimit-limit-tokens")
+        remaining = _header_int(headers, "x-ratelimit-remaining-tokens")
+        if limit and remaining is not None and remaining < limit * LOW_TOKENS_RATIO:
+            if self.limiter.decrease(0.75, time.monotonic()):
+                logger.info(
+                    f"Groq tokens running low ({remaining}/{limit}), "
+                    f"LLM concurrency -> {self.limiter.limit:.1f}"
+                )
+        else:
+            self.limiter.increase()
+
+    def _on_rate_limited(self, headers: Mapping[str, str], attempt: int) -> float:
+        """Halves the limit, pauses all requests until Groq's reset; returns this retry's delay"""
+        now = time.monotonic()
+        if self.limiter.decrease(0.5, now):
+            logger.info(f"Groq rate limit hit, LLM concurrency -> {self.limiter.limit:.1f}")
+        wait = parse_duration(headers.get("retry-after")) or parse_duration(
+            headers.get("x-ratelimit-reset-tokens")
+        )
+        if wait:
+            self._paused_until = max(self._paused_until, now + wait)
+        return max(wait or 0.0, backoff_delay(attempt))
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff before retry attempt + 1"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> int | None:
+    value = headers.get(name)
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+_dispatcher: LLMDispatcher | None = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_llm_dispatcher() -> LLMDispatcher:
+    """The process-wide dispatcher: one concurrency limit and token budget for all stages"""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = LLMDispatcher()
+    return _dispatcher
+
+
+def get_llm_dispatch_stats() -> dict[str, Any]:
+    """Dispatcher stats ({"started": False} before the first request)"""
+    if _dispatcher is None:
+        return {"started": False}
+    return {"started": True, **_dispatcher.stats()}
@@ -10,30 +10,30 @@ Provides intelligent re-ranking of embedding-based matches by:
 
 import json
 import logging
-import os
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from dataclasses import dataclass
 from typing import Any
 
-from dotenv import load_dotenv
-from groq import Groq
-
-load_dotenv()
+from resume_matcher.config import LLM_SCORING_BATCH_SIZE, LLM_SCORING_BATCH_TOKENS
+from resume_matcher.models.llm_cache import (
+    cached_json_completion,
+    lookup_json_completion,
+    store_json_completion,
+    strip_code_fence,
+)
+from resume_matcher.models.llm_dispatch import GROQ_MODEL, estimate_tokens, get_llm_dispatcher
 
 logger = logging.getLogger(__name__)
 
-GROQ_MODEL = "llama-3.3-70b-versatile"
-_groq_client: Groq | None = None
-
+# Bump when a prompt below changes: cached responses of older versions are ignored
+PARSE_VACANCY_PROMPT_VERSION = "1"
+SCORE_CANDIDATE_PROMPT_VERSION = "1"
+BATCH_SCORE_PROMPT_VERSION = "1"
 
-def get_groq_client() -> Groq:
-    """Lazily initialize the Groq client."""
-    global _groq_client
-    if _groq_client is None:
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
-            raise RuntimeError("GROQ_API_KEY environment variable is not set")
-        _groq_client = Groq(api_key=api_key)
-    return _groq_client
+# Completion tokens allowed per candidate of a scoring request
+SCORE_MAX_TOKENS = 800
+BATCH_SCORE_MAX_TOKENS = 400
 
 
 @dataclass
@@ -50,6 +50,7 @@ class VacancyRequirements:
     location: str | None
     remote_ok: bool
     summary: str
+    cached: bool = False  # answered from the LLM cache
 
 
 @dataclass
@@ -67,13 +68,12 @@ class CandidateScore:
     missing_skills: list[str]
     strengths: list[str]
     concerns: list[str]
+    cached: bool = False  # answered from the LLM cache
 
 
-def parse_vacancy(vacancy_text: str) -> VacancyRequirements:
-    """
-    Extracts structured requirements from vacancy text using LLM.
-    """
-    prompt = f"""You are an expert HR analyst. Extract structured requirements from this job vacancy.
+def _vacancy_prompt(vacancy_text: str) -> str:
+    """Prompt extracting structured requirements from a vacancy."""
+    return f"""You are an expert HR analyst. Extract structured requirements from this job vacancy.
 Return ONLY a valid JSON object, without extra text, without markdown, without ```json.
 
 Required JSON structure:
@@ -99,109 +99,116 @@ Vacancy text:
 {vacancy_text[:12000]}
 """
 
-    try:
-        response = get_groq_client().chat.completions.create(
-            model=GROQ_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.0,
-            max_tokens=1500,
-            top_p=1.0,
-        )
-
-        content = response.choices[0].message.content.strip()
-
-        # Remove possible markdown
-        if content.startswith("```"):
-            content = content.split("```")[1]
-            if content.startswith("json"):
-                content = content[4:]
-            content = content.strip()
-
-        data = json.loads(content)
-        logger.info(f"Parsed vacancy: {data.get('job_title', 'Unknown')}")
-
-        return VacancyRequirements(
-            job_title=data.get("job_title", "Unknown"),
-            department=data.get("department"),
-            seniority_level=data.get("seniority_level"),
-            must_have_skills=data.get("must_have_skills", []),
-            nice_to_have_skills=data.get("nice_to_have_skills", []),
-            min_years_experience=data.get("min_years_experience"),
-            responsibilities=data.get("responsibilities", []),
-            location=data.get("location"),
-            remote_ok=data.get("remote_ok", False),
-            summary=data.get("summary", ""),
-        )
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse vacancy JSON: {e}")
-        # Return minimal requirements
-        return VacancyRequirements(
-            job_title="Unknown",
-            department=None,
-            seniority_level=None,
-            must_have_skills=[],
-            nice_to_have_skills=[],
-            min_years_experience=None,
-            responsibilities=[],
-            location=None,
-            remote_ok=False,
-            summary="",
-        )
-    except Exception as e:
-        logger.error(f"Error parsing vacancy: {e}")
-        raise
+def _vacancy_requirements(data: dict[str, Any], cached: bool) -> VacancyRequirements:
+    """VacancyRequirements from a parsed vacancy answer."""
+    logger.info(
+        f"Parsed vacancy: {data.get('job_title', 'Unknown')}{' (cached)' if cached else ''}"
+    )
+    return VacancyRequirements(
+        job_title=data.get("job_title", "Unknown"),
+        department=data.get("department"),
+        seniority_level=data.get("seniority_level"),
+        must_have_skills=data.get("must_have_skills", []),
+        nice_to_have_skills=data.get("nice_to_have_skills", []),
+        min_years_experience=data.get("min_years_experience"),
+        responsibilities=data.get("responsibilities", []),
+        location=data.get("location"),
+        remote_ok=data.get("remote_ok", False),
+        summary=data.get("summary", ""),
+        cached=cached,
+    )
+
+
+def start_parse_vacancy(vacancy_text: str) -> Future[VacancyRequirements]:
+    """
+    parse_vacancy without blocking: the LLM call is submitted to the shared
+    dispatcher and the returned future resolves to the requirements (at once on
+    a cache hit), so callers can do other work - e.g. the embedding search -
+    meanwhile.
+    """
+    prompt = _vacancy_prompt(vacancy_text)
+    result: Future[VacancyRequirements] = Future()
+    key, data = lookup_json_completion(
+        "parse_vacancy", PARSE_VACANCY_PROMPT_VERSION, GROQ_MODEL, prompt
+    )
+    if data is not None:
+        result.set_result(_vacancy_requirements(data, cached=True))
+        return result
+
+    def resolve(completion: Future[str]) -> None:
+        try:
+            data = store_json_completion(key, "parse_vacancy", completion.result())
+            result.set_result(_vacancy_requirements(data, cached=False))
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse vacancy JSON: {e}")
+            # Return minimal requirements
+            result.set_result(
+                VacancyRequirements(
+                    job_title="Unknown",
+                    department=None,
+                    seniority_level=None,
+                    must_have_skills=[],
+                    nice_to_have_skills=[],
+                    min_years_experience=None,
+                    responsibilities=[],
+                    location=None,
+                    remote_ok=False,
+                    summary="",
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error parsing vacancy: {e}")
+            result.set_exception(e)
+
+    completion = get_llm_dispatcher().submit(prompt, max_tokens=1500, model=GROQ_MODEL)
+    completion.add_done_callback(resolve)
+    return result
 
 
-def score_candidate(
-    requirements: VacancyRequirements,
-    candidate_json: dict[str, Any],
-    candidate_name: str,
-    embedding_similarity: float,
-    lang: str = "en",
-) -> CandidateScore:
+def parse_vacancy(vacancy_text: str) -> VacancyRequirements:
     """
-    Scores a single candidate against vacancy requirements using LLM.
+    Extracts structured requirements from vacancy text using LLM.
     """
-    candidate_skills = candidate_json.get("skills", [])
-    candidate_position = candidate_json.get("current_position", "Unknown")
-    candidate_experience = candidate_json.get("years_experience")
-    candidate_summary = candidate_json.get("summary", "")
+    return start_parse_vacancy(vacancy_text).result()
+
 
-    # Language instruction for output
-    lang_instruction = ""
+def _lang_instruction(lang: str) -> str:
+    """Language instruction for the text fields of scoring answers."""
     if lang == "ru":
-        lang_instruction = """
+        return """
 LANGUAGE: Respond in Russian for all text fields (strengths, concerns, explanation).
 Keep technical terms in English: Python, Docker, AWS, PostgreSQL, React, etc.
 """
+    return ""
 
-    prompt = f"""You are an expert technical recruiter. Score this candidate against the job requirements.
-Return ONLY a valid JSON object, without extra text, without markdown.
-{lang_instruction}
-Job Requirements:
+
+def _requirements_block(requirements: VacancyRequirements) -> str:
+    return f"""Job Requirements:
 - Title: {requirements.job_title}
 - Seniority: {requirements.seniority_level or "Not specified"}
 - Must-have skills: {", ".join(requirements.must_have_skills) or "None specified"}
 - Nice-to-have skills: {", ".join(requirements.nice_to_have_skills) or "None specified"}
 - Min experience: {requirements.min_years_experience or "Not specified"} years
-- Summary: {requirements.summary}
+- Summary: {requirements.summary}"""
 
-Candidate Profile:
-- Name: {candidate_name}
-- Current position: {candidate_position}
-- Years of experience: {candidate_experience or "Unknown"}
+
+def _profile_block(candidate_json: dict[str, Any], candidate_name: str) -> str:
+    candidate_skills = candidate_json.get("skills", [])
+    return f"""- Name: {candidate_name}
+- Current position: {candidate_json.get("current_position", "Unknown")}
+- Years of experience: {candidate_json.get("years_experience") or "Unknown"}
 - Skills: {", ".join(candidate_skills[:30]) if candidate_skills else "Not listed"}
-- Summary: {candidate_summary or "Not provided"}
+- Summary: {candidate_json.get("summary", "") or "Not provided"}"""
+
 
-Scoring criteria:
+_SCORING_CRITERIA = """Scoring criteria:
 1. Role fit: Is the candidate's background relevant to this specific role?
 2. Must-have skills: How many required skills does the candidate have?
 3. Experience level: Does their experience match the seniority required?
-4. Nice-to-have: Any bonus skills that add value?
+4. Nice-to-have: Any bonus skills that add value?"""
 
-Return this exact JSON structure:
-{{
+_SCORE_FIELDS = """\
   "score": 0-100 integer (0=completely irrelevant, 100=perfect match),
   "match_level": "excellent"/"good"/"partial"/"poor",
   "matching_skills": ["skills", "candidate", "has", "that", "match", "requirements"],
@@ -209,68 +216,198 @@ Return this exact JSON structure:
   "strengths": ["2-3 specific strengths for this role"],
   "concerns": ["1-2 potential concerns or gaps"],
   "explanation": "2-3 sentence explanation of why this score was given"
-}}
+"""
 
-IMPORTANT:
+_SCORING_RULES = """IMPORTANT:
 - A Software Engineer is NOT a good match for DevOps unless they have specific DevOps skills
 - A Product Designer is NOT a match for engineering roles
 - Score based on ROLE FIT first, then skills
-- Be strict: partial matches should score 40-60, good matches 70-85, excellent 85+
+- Be strict: partial matches should score 40-60, good matches 70-85, excellent 85+"""
+
+
+def _score_prompt(
+    requirements: VacancyRequirements,
+    candidate_json: dict[str, Any],
+    candidate_name: str,
+    lang: str,
+) -> str:
+    """Prompt scoring one candidate against vacancy requirements."""
+    return f"""You are an expert technical recruiter. Score this candidate against the job requirements.
+Return ONLY a valid JSON object, without extra text, without markdown.
+{_lang_instruction(lang)}
+{_requirements_block(requirements)}
+
+Candidate Profile:
+{_profile_block(candidate_json, candidate_name)}
+
+{_SCORING_CRITERIA}
+
+Return this exact JSON structure:
+{{
+{_SCORE_FIELDS}}}
+
+{_SCORING_RULES}
+"""
+
+
+def _batch_score_prompt(
+    requirements: VacancyRequirements,
+    profiles: list[str],
+    lang: str,
+) -> str:
+    """Prompt scoring several candidate profiles (see _profile_block) in one request."""
+    candidates = "\n\n".join(
+        f"### Candidate {ref}\n{profile}" for ref, profile in enumerate(profiles, start=1)
+    )
+    return f"""You are an expert technical recruiter. Score each of the {len(profiles)} candidates below against the job requirements, independently of each other.
+Return ONLY a valid JSON array, without extra text, without markdown.
+{_lang_instruction(lang)}
+{_requirements_block(requirements)}
+
+Candidates:
+
+{candidates}
+
+{_SCORING_CRITERIA}
+
+Return a JSON array with exactly one object per candidate, in the order given:
+[
+{{
+  "candidate": candidate number (1-{len(profiles)}),
+{_SCORE_FIELDS}}}
+]
+
+{_SCORING_RULES}
 """
 
+
+def _is_valid_score(entry: Any) -> bool:
+    """Whether a scoring answer has an integer 0-100 score and a match level."""
+    if not isinstance(entry, dict) or not isinstance(entry.get("match_level"), str):
+        return False
     try:
-        response = get_groq_client().chat.completions.create(
-            model=GROQ_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.0,
-            max_tokens=800,
-            top_p=1.0,
-        )
+        return 0 <= int(entry.get("score")) <= 100
+    except (TypeError, ValueError):
+        return False
+
 
-        content = response.choices[0].message.content.strip()
-
-        # Remove possible markdown
-        if content.startswith("```"):
-            content = content.split("```")[1]
-            if content.startswith("json"):
-                content = content[4:]
-            content = content.strip()
-
-        data = json.loads(content)
-
-        llm_score = int(data.get("score", 0))
-        # Combined score: 70% LLM, 30% embedding similarity
-        combined = (llm_score * 0.7) + (embedding_similarity * 100 * 0.3)
-
-        return CandidateScore(
-            candidate_id=0,  # Will be set by caller
-            file_name="",  # Will be set by caller
-            llm_score=llm_score,
-            embedding_score=embedding_similarity,
-            combined_score=round(combined, 2),
-            match_level=data.get("match_level", "unknown"),
-            explanation=data.get("explanation", "No explanation provided"),
-            matching_skills=data.get("matching_skills", []),
-            missing_skills=data.get("missing_skills", []),
-            strengths=data.get("strengths", []),
-            concerns=data.get("concerns", []),
+def _parse_batch_scores(completion: str, count: int) -> dict[int, dict[str, Any]]:
+    """
+    Valid entries of a batched scoring answer, by candidate number (1-count).
+    Entries that are missing, duplicated or fail validation are left out.
+    """
+    data = json.loads(strip_code_fence(completion))
+    if isinstance(data, dict):
+        # {"candidates": [...]} and the like
+        data = next((value for value in data.values() if isinstance(value, list)), [])
+    if not isinstance(data, list):
+        return {}
+
+    entries: dict[int, dict[str, Any]] = {}
+    duplicated: set[int] = set()
+    for position, entry in enumerate(data, start=1):
+        if not _is_valid_score(entry):
+            continue
+        try:
+            ref = int(entry.get("candidate", position))
+        except (TypeError, ValueError):
+            continue
+        if not 1 <= ref <= count:
+            continue
+        if ref in entries:
+            duplicated.add(ref)
+        entries[ref] = {key: value for key, value in entry.items() if key != "candidate"}
+    for ref in duplicated:
+        del entries[ref]
+    return entries
+
+
+def pack_scoring_batches(
+    profile_tokens: list[int], max_size: int, token_budget: int
+) -> list[list[int]]:
+    """
+    Groups candidate indices, in order, into batches of at most max_size whose
+    profiles fit in token_budget (a profile larger than the budget gets its own batch).
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+    used = 0
+    for index, tokens in enumerate(profile_tokens):
+        if current and (len(current) >= max_size or used + tokens > token_budget):
+            batches.append(current)
+            current, used = [], 0
+        current.append(index)
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _candidate_score(
+    data: dict[str, Any], embedding_similarity: float, cached: bool
+) -> CandidateScore:
+    """CandidateScore from a parsed scoring answer."""
+    llm_score = int(data.get("score", 0))
+    # Combined score: 70% LLM, 30% embedding similarity
+    combined = (llm_score * 0.7) + (embedding_similarity * 100 * 0.3)
+
+    return CandidateScore(
+        candidate_id=0,  # Will be set by caller
+        file_name="",  # Will be set by caller
+        llm_score=llm_score,
+        embedding_score=embedding_similarity,
+        combined_score=round(combined, 2),
+        match_level=data.get("match_level", "unknown"),
+        explanation=data.get("explanation", "No explanation provided"),
+        matching_skills=data.get("matching_skills", []),
+        missing_skills=data.get("missing_skills", []),
+        strengths=data.get("strengths", []),
+        concerns=data.get("concerns", []),
+        cached=cached,
+    )
+
+
+def _failed_score(embedding_similarity: float) -> CandidateScore:
+    """Placeholder for a candidate the LLM could not score (ranked by embedding only)."""
+    return CandidateScore(
+        candidate_id=0,
+        file_name="",
+        llm_score=0,
+        embedding_score=embedding_similarity,
+        combined_score=embedding_similarity * 30,
+        match_level="error",
+        explanation="Failed to score candidate",
+        matching_skills=[],
+        missing_skills=[],
+        strengths=[],
+        concerns=["Scoring failed"],
+    )
+
+
+def score_candidate(
+    requirements: VacancyRequirements,
+    candidate_json: dict[str, Any],
+    candidate_name: str,
+    embedding_similarity: float,
+    lang: str = "en",
+) -> CandidateScore:
+    """
+    Scores a single candidate against vacancy requirements using LLM.
+    """
+    prompt = _score_prompt(requirements, candidate_json, candidate_name, lang)
+
+    def complete() -> str:
+        return get_llm_dispatcher().complete(prompt, max_tokens=SCORE_MAX_TOKENS, model=GROQ_MODEL)
+
+    try:
+        data, cached = cached_json_completion(
+            "score_candidate", SCORE_CANDIDATE_PROMPT_VERSION, GROQ_MODEL, prompt, complete
         )
+        return _candidate_score(data, embedding_similarity, cached)
 
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse scoring JSON: {e}")
-        return CandidateScore(
-            candidate_id=0,
-            file_name="",
-            llm_score=0,
-            embedding_score=embedding_similarity,
-            combined_score=embedding_similarity * 30,
-            match_level="error",
-            explanation="Failed to score candidate",
-            matching_skills=[],
-            missing_skills=[],
-            strengths=[],
-            concerns=["Scoring failed"],
-        )
+        return _failed_score(embedding_similarity)
     except Exception as e:
         logger.error(f"Error scoring candidate: {e}")
         raise
@@ -281,10 +418,21 @@ def rerank_with_llm(
     candidates: list[dict[str, Any]],
     top_n: int = 10,
     lang: str = "en",
-    max_workers: int = 5,
+    batch_size: int | None = None,
+    requirements: VacancyRequirements | None = None,
+    on_score: Callable[[CandidateScore], None] | None = None,
 ) -> tuple[VacancyRequirements, list[CandidateScore]]:
     """
-    Re-ranks candidates using LLM scoring with parallel processing.
+    Re-ranks candidates using LLM scoring.
+
+    Uncached candidates are packed into batched prompts (up to batch_size
+    profiles and LLM_SCORING_BATCH_TOKENS prompt tokens each), so the
+    requirements block is sent once per batch instead of once per candidate.
+    Entries of a batched answer that are missing or fail validation are
+    re-scored with single-candidate prompts. All requests go through the shared
+    LLM dispatcher, which runs as many as Groq's rate limits currently allow and
+    retries transient failures. A candidate that still cannot be scored is kept
+    with match_level "error" and ranked by its embedding similarity only.
 
     Args:
         vacancy_text: The vacancy/job description text
@@ -292,61 +440,123 @@ def rerank_with_llm(
             - id, file_name, file_path, similarity_score, json_data
         top_n: Number of results to return after re-ranking
         lang: Language for LLM responses ('en' or 'ru')
-        max_workers: Maximum parallel API calls (default 5 to avoid rate limits)
+        batch_size: Candidates per scoring prompt (default LLM_SCORING_BATCH_SIZE, 1 = no batching)
+        requirements: Already parsed vacancy (see start_parse_vacancy); parsed here if None
+        on_score: Called with each CandidateScore as soon as it is available (cache
+            hits first, then in completion order), e.g. to stream results
 
     Returns:
         Tuple of (VacancyRequirements, list of CandidateScore sorted by combined_score)
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    batch_size = LLM_SCORING_BATCH_SIZE if batch_size is None else batch_size
 
-    logger.info("Parsing vacancy requirements...")
-    requirements = parse_vacancy(vacancy_text)
+    if requirements is None:
+        logger.info("Parsing vacancy requirements...")
+        requirements = parse_vacancy(vacancy_text)
 
     logger.info(f"Vacancy: {requirements.job_title}")
     logger.info(f"Must-have skills: {requirements.must_have_skills}")
 
-    def score_single_candidate(candidate: dict[str, Any], index: int) -> CandidateScore:
-        """Score a single candidate (for parallel execution)."""
-        candidate_name = candidate.get("json_data", {}).get("full_name", "Unknown")
-        logger.info(f"  [{index + 1}/{len(candidates)}] Scoring: {candidate_name}")
-
-        score = score_candidate(
-            requirements=requirements,
-            candidate_json=candidate.get("json_data", {}),
-            candidate_name=candidate_name,
-            embedding_similarity=candidate.get("similarity_score", 0.0),
-            lang=lang,
-        )
-
-        # Set IDs from candidate data
-        score.candidate_id = candidate.get("id", 0)
-        score.file_name = candidate.get("file_name", "")
-
-        return score
+    # Answers are cached per candidate; batched ones under their own version
+    version = SCORE_CANDIDATE_PROMPT_VERSION
+    if batch_size > 1:
+        version = f"{SCORE_CANDIDATE_PROMPT_VERSION}-batch{BATCH_SCORE_PROMPT_VERSION}"
 
+    dispatcher = get_llm_dispatcher()
     scores: list[CandidateScore] = []
 
-    # Use parallel processing for faster scoring
-    logger.info(f"Scoring {len(candidates)} candidates with LLM (parallel, {max_workers} workers)...")
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all scoring tasks
-        future_to_candidate = {
-            executor.submit(score_single_candidate, candidate, i): i
-            for i, candidate in enumerate(candidates)
-        }
-
-        # Collect results as they complete
-        for future in as_completed(future_to_candidate):
+    def finish(score: CandidateScore, candidate: dict[str, Any]) -> None:
+        score.candidate_id = candidate.get("id", 0)
+        score.file_name = candidate.get("file_name", "")
+        scores.append(score)
+        if on_score is not None:
+            on_score(score)
+
+    # (candidate, profile block, single-candidate prompt, cache key) of every miss
+    jobs: list[tuple[dict[str, Any], str, str, str]] = []
+    for candidate in candidates:
+        candidate_json = candidate.get("json_data", {})
+        name = candidate_json.get("full_name", "Unknown")
+        prompt = _score_prompt(requirements, candidate_json, name, lang)
+        key, data = lookup_json_completion("score_candidate", version, GROQ_MODEL, prompt)
+        if data is not None:
+            finish(_candidate_score(data, candidate.get("similarity_score", 0.0), True), candidate)
+            continue
+        jobs.append((candidate, _profile_block(candidate_json, name), prompt, key))
+
+    pending: dict[Future[str], list[int]] = {}
+
+    def submit_single(index: int) -> None:
+        prompt = jobs[index][2]
+        pending[dispatcher.submit(prompt, max_tokens=SCORE_MAX_TOKENS, model=GROQ_MODEL)] = [index]
+
+    if batch_size > 1:
+        overhead = estimate_tokens(_batch_score_prompt(requirements, [], lang), 0)
+        batches = pack_scoring_batches(
+            [estimate_tokens(profile, 0) for _, profile, _, _ in jobs],
+            max_size=batch_size,
+            token_budget=LLM_SCORING_BATCH_TOKENS - overhead,
+        )
+        for batch in batches:
+            if len(batch) == 1:
+                submit_single(batch[0])
+                continue
+            prompt = _batch_score_prompt(requirements, [jobs[i][1] for i in batch], lang)
+            max_tokens = BATCH_SCORE_MAX_TOKENS * len(batch)
+            pending[dispatcher.submit(prompt, max_tokens=max_tokens, model=GROQ_MODEL)] = batch
+    else:
+        for index in range(len(jobs)):
+            submit_single(index)
+
+    logger.info(
+        f"Scoring {len(candidates)} candidates with LLM in {len(pending)} requests "
+        f"({len(candidates) - len(jobs)} from the LLM cache)..."
+    )
+
+    requests = len(pending)
+    fallbacks = 0
+    failed = 0
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            batch = pending.pop(future)
+
+            if len(batch) > 1:
+                try:
+                    entries = _parse_batch_scores(future.result(), len(batch))
+                except Exception as e:
+                    logger.warning(f"Batched scoring of {len(batch)} candidates failed: {e}")
+                    entries = {}
+                for ref, index in enumerate(batch, start=1):
+                    candidate, _, _, key = jobs[index]
+                    entry = entries.get(ref)
+                    if entry is None:
+                        submit_single(index)
+                        fallbacks += 1
+                        continue
+                    store_json_completion(key, "score_candidate", json.dumps(entry))
+                    similarity = candidate.get("similarity_score", 0.0)
+                    finish(_candidate_score(entry, similarity, cached=False), candidate)
+                continue
+
+            candidate, _, _, key = jobs[batch[0]]
+            similarity = candidate.get("similarity_score", 0.0)
             try:
-                score = future.result()
-                scores.append(score)
+                data = store_json_completion(key, "score_candidate", future.result())
+                score = _candidate_score(data, similarity, cached=False)
             except Exception as e:
-                idx = future_to_candidate[future]
-                logger.error(f"Failed to score candidate {idx}: {e}")
-                # Continue with other candidates
-
-    logger.info(f"Completed scoring {len(scores)}/{len(candidates)} candidates")
+                name = candidate.get("json_data", {}).get("full_name", "Unknown")
+                logger.error(f"Failed to score candidate {name}: {e}")
+                score = _failed_score(similarity)
+                failed += 1
+            finish(score, candidate)
+
+    cache_hits = sum(score.cached for score in scores)
+    logger.info(
+        f"Completed scoring {len(scores) - failed}/{len(candidates)} candidates in "
+        f"{requests + fallbacks} LLM requests ({cache_hits} from the LLM cache, "
+        f"{fallbacks} re-scored one by one, {failed} failed)"
+    )
 
     # Sort by combined score (descending)
     scores.sort(key=lambda x: x.combined_score, reverse=True)
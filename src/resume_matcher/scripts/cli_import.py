@@ -9,11 +9,20 @@ Launch:
 
 Flags:
     --dir         Folder with resumes (default data/resumes)
-    --workers     Number of processes (default 8)
+    --workers     Number of text extraction / OCR processes (default: CPU count)
+    --llm-workers Threads of the LLM parsing stage (default LLM_MAX_CONCURRENCY); the
+                  Groq concurrency itself adapts to rate limits below that
     --force       Overwrite all files (ignore hash)
     --dry-run     Simulation only, without writing to the database
     --limit       Limit the number of files for testing
     --only-sync   Only sync deleted files (no imports whatsoever)
+    --batch-size  Resumes per database write (default 200)
+    --embed-batch-size  Resumes encoded together by the embedding stage (default 64)
+
+The import runs as a staged pipeline (see services.importer.ImportPipeline):
+hashing, text extraction/OCR, embedding, LLM parsing and DB writes are separate
+stages connected by bounded queues. Per-stage throughput and queue depth are
+printed at the end of the run.
 """
 
 import argparse
@@ -23,7 +32,11 @@ from pathlib import Path
 
 from tqdm import tqdm
 
-from resume_matcher.services.importer import import_resume, sync_deleted_resumes
+from resume_matcher.config import LLM_MAX_CONCURRENCY
+from resume_matcher.models.embedding import get_padding_stats
+from resume_matcher.models.llm_cache import get_llm_cache_stats
+from resume_matcher.models.llm_dispatch import get_llm_dispatch_stats
+from resume_matcher.services.importer import ImportPipeline, sync_deleted_resumes
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -33,16 +46,9 @@ logging.basicConfig(
 )
 
 
-def process_wrapper(args):
-    file_path, force_update, dry_run = args
-    if dry_run:
-        logger.info(f"[dry-run] Skipping: {file_path.name}")
-        return file_path, True, "dry-run"
-
-    result = import_resume(file_path, force_update=force_update)
-    success = "error" not in result
-    error = result.get("error")
-    return file_path, success, error
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_EMBED_BATCH_SIZE = 64
+DEFAULT_LLM_WORKERS = LLM_MAX_CONCURRENCY
 
 
 def import_folder(
@@ -52,6 +58,9 @@ def import_folder(
     dry_run: bool = False,
     limit: int = None,
     only_sync: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    embed_batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+    llm_workers: int = DEFAULT_LLM_WORKERS,
 ):
     if not resumes_dir.is_dir():
         logger.error(f"Folder not found: {resumes_dir}")
@@ -62,26 +71,31 @@ def import_folder(
         sync_deleted_resumes(resumes_dir)
         return
 
-    files = list(resumes_dir.rglob("*.*"))
-    if limit:
-        files = files[:limit]
-
-    total = len(files)
-    logger.info(f"Files found: {total}")
     if dry_run:
         logger.info("Mode: dry-run - nothing gets saved")
+        files = [f for f in resumes_dir.rglob("*.*") if f.is_file()]
+        if limit:
+            files = files[:limit]
+        for f in files:
+            logger.info(f"[dry-run] Skipping: {f.name}")
+        print(f"\nImport results:\n  Files found: {len(files)} (dry-run)")
+        return
 
-    args = [(f, force_update, dry_run) for f in files]
-
-    with mp.Pool(processes=workers) as pool:
-        results = list(
-            tqdm(
-                pool.imap(process_wrapper, args), total=total, desc="Resume processing", unit="file"
-            )
+    with tqdm(desc="Resume processing", unit="file") as progress:
+        pipeline = ImportPipeline(
+            force_update=force_update,
+            extract_workers=workers,
+            llm_workers=llm_workers,
+            embed_batch_size=embed_batch_size,
+            db_batch_size=batch_size,
+            on_result=lambda _: progress.update(1),
         )
+        report = pipeline.run(resumes_dir, limit=limit)
 
-    success = sum(1 for _, ok, _ in results if ok)
-    errors = [(p.name, err) for p, ok, err in results if not ok and err]
+    total = report.files_found
+    results = report.results
+    success = sum(1 for r in results if "error" not in r)
+    errors = [(r["file_name"], r["error"]) for r in results if "error" in r]
 
     print("\nImport results:")
     print(f"  Sucessful: {success}/{total}")
@@ -92,9 +106,33 @@ def import_folder(
         if len(errors) > 5:
             print(f"  ... and {len(errors) - 5} more")
 
-    if not dry_run:
-        print("\nDeletion synchronization...")
-        sync_deleted_resumes(resumes_dir)
+    print("\nPipeline stages:")
+    print(report.format_stats())
+
+    padding = get_padding_stats()
+    if padding["texts"]:
+        print(
+            f"Embedding padding efficiency: {padding['padding_efficiency']:.0%} "
+            f"({padding['real_tokens']:,} real / {padding['padded_tokens']:,} padded tokens "
+            f"in {padding['batches']} batches)"
+        )
+
+    llm_cache = get_llm_cache_stats()
+    if llm_cache["enabled"] and llm_cache["hits"] + llm_cache["misses"]:
+        print(
+            f"LLM cache: {llm_cache['hits']} hits, {llm_cache['misses']} misses "
+            f"({llm_cache['hit_rate']:.0%})"
+        )
+    dispatch = get_llm_dispatch_stats()
+    if dispatch["started"]:
+        print(
+            f"Groq: {dispatch['requests']} requests, {dispatch['retries']} retries, "
+            f"{dispatch['rate_limited']} rate-limited, concurrency settled at "
+            f"{dispatch['concurrency_limit']:.1f}"
+        )
+
+    print("\nDeletion synchronization...")
+    sync_deleted_resumes(resumes_dir)
 
 
 def main() -> None:
@@ -105,6 +143,12 @@ def main() -> None:
 
     # Workers option
     parser.add_argument("--workers", type=int, default=mp.cpu_count(), help="Number of processes")
+    parser.add_argument(
+        "--llm-workers",
+        type=int,
+        default=DEFAULT_LLM_WORKERS,
+        help="Threads of the LLM parsing stage; Groq concurrency adapts below it",
+    )
 
     # Force update option
     parser.add_argument(
@@ -131,6 +175,18 @@ def main() -> None:
         action="store_true",
         help="Only sync deleted files (no imports whatsoever)",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Resumes per database write",
+    )
+    parser.add_argument(
+        "--embed-batch-size",
+        type=int,
+        default=DEFAULT_EMBED_BATCH_SIZE,
+        help="Resumes encoded together by the embedding stage",
+    )
 
     # Quiet option
     parser.add_argument(
@@ -151,6 +207,9 @@ def main() -> None:
         dry_run=args.dry_run,
         limit=args.limit,
         only_sync=args.only_sync,
+        batch_size=args.batch_size,
+        embed_batch_size=args.embed_batch_size,
+        llm_workers=args.llm_workers,
     )
 
 
@@ -9,14 +9,21 @@ Usage:
     # Intelligent LLM-powered matching (recommended)
     uv run match-vacancy --vacancy data/vacancies/Vacancy1.docx --top 10 --llm
 
+    # Every vacancy in a folder in one pass, top-K written to OUTPUT_DIR (CSV + JSON)
+    uv run match-vacancy --vacancies-dir data/vacancies --top 20
+
 Flags:
     --vacancy      Path to vacancy file (PDF, DOCX, TXT)
     --text         Vacancy text directly (alternative to --vacancy)
+    --vacancies-dir  Folder of vacancy files, matched in batch (alternative to --vacancy)
     --top          Number of top matches to return (default: 10)
     --min-score    Minimum similarity score 0-100 (default: 0)
     --score-range  Score range filter, e.g. "80-100" (default: show all)
     --llm          Use LLM for intelligent re-ranking (slower but more accurate)
     --candidates   Number of embedding candidates for LLM to re-rank (default: 30)
+    --ef-search    HNSW search breadth (recall vs latency)
+    --probes       IVFFlat lists to scan (recall vs latency)
+    --scoring      document | max_chunk (best matching chunk of chunked resumes)
     --json         Output results as JSON instead of pretty print
 """
 
@@ -27,6 +34,7 @@ import sys
 
 from resume_matcher.services.matcher import (
     MatchResult,
+    StageTimings,
     match_vacancy_file,
     match_vacancy_file_with_llm,
     match_vacancy_text,
@@ -101,9 +109,9 @@ def result_to_dict(result: MatchResult) -> dict:
     }
 
 
-def llm_result_to_dict(requirements, scores) -> dict:
-    """Convert LLM results to a JSON-serializable dict."""
-    return {
+def llm_result_to_dict(requirements, scores, timings=None) -> dict:
+    """Convert LLM results (and optional StageTimings) to a JSON-serializable dict."""
+    result = {
         "mode": "llm",
         "vacancy": {
             "job_title": requirements.job_title,
@@ -112,6 +120,7 @@ def llm_result_to_dict(requirements, scores) -> dict:
             "nice_to_have_skills": requirements.nice_to_have_skills,
             "min_years_experience": requirements.min_years_experience,
             "summary": requirements.summary,
+            "cached": requirements.cached,
         },
         "matches_found": len(scores),
         "matches": [
@@ -128,10 +137,46 @@ def llm_result_to_dict(requirements, scores) -> dict:
                 "strengths": s.strengths,
                 "concerns": s.concerns,
                 "explanation": s.explanation,
+                "cached": s.cached,
             }
             for i, s in enumerate(scores)
         ],
     }
+    if timings is not None:
+        result["timings"] = timings.as_dict()
+    return result
+
+
+def run_batch_match(args: argparse.Namespace) -> int:
+    """
+    --vacancies-dir: matches every vacancy in the folder in one pass over the
+    corpus (embedding-only, document scoring) and writes CSV + JSON to OUTPUT_DIR.
+    """
+    from resume_matcher.services.batch_matcher import match_vacancy_dir, write_batch_results
+
+    if args.llm:
+        logger.error("--llm is not supported with --vacancies-dir")
+        return 2
+
+    results = match_vacancy_dir(
+        args.vacancies_dir, top_n=args.top, min_similarity=args.min_score / 100.0
+    )
+    score_range = parse_score_range(args.score_range)
+    if score_range:
+        min_s, max_s = score_range
+        for result in results.values():
+            result.matches = [m for m in result.matches if min_s <= m.score_percent <= max_s]
+
+    if not results:
+        return 1
+
+    csv_path, json_path = write_batch_results(results)
+    for vacancy, result in results.items():
+        top = result.top_match
+        best = f"{top.score_percent:.1f}% {top.file_name}" if top else "no matches"
+        print(f"{vacancy}: {len(result.matches)} matches, best {best}")
+    print(f"\nResults: {csv_path}\n         {json_path}")
+    return 0
 
 
 def main() -> None:
@@ -141,6 +186,11 @@ def main() -> None:
     input_group = parser.add_mutually_exclusive_group(required=True)
     input_group.add_argument("--vacancy", type=str, help="Path to vacancy file (PDF, DOCX, TXT)")
     input_group.add_argument("--text", type=str, help="Vacancy text directly")
+    input_group.add_argument(
+        "--vacancies-dir",
+        type=str,
+        help="Folder of vacancy files: match all in one pass, results to OUTPUT_DIR",
+    )
 
     # Matching options
     parser.add_argument(
@@ -175,6 +225,15 @@ def main() -> None:
         help="Number of embedding candidates for LLM re-ranking (default: 30)",
     )
 
+    # ANN search options
+    parser.add_argument("--ef-search", type=int, help="HNSW search breadth (recall vs latency)")
+    parser.add_argument("--probes", type=int, help="IVFFlat lists to scan (recall vs latency)")
+    parser.add_argument(
+        "--scoring",
+        choices=["document", "max_chunk"],
+        help="Score by resume vector or best matching chunk (default: MATCH_SCORING)",
+    )
+
     # Output options
     parser.add_argument("--json", action="store_true", help="Output results as JSON")
     parser.add_argument("--quiet", action="store_true", help="Suppress logging output")
@@ -184,6 +243,9 @@ def main() -> None:
     if args.quiet:
         logging.getLogger().setLevel(logging.WARNING)
 
+    if args.vacancies_dir:
+        sys.exit(run_batch_match(args))
+
     # Convert min-score from percentage to 0-1 range
     min_similarity = args.min_score / 100.0
 
@@ -198,6 +260,7 @@ def main() -> None:
     if args.llm:
         # LLM-powered matching
         logger.info("Using LLM-powered matching (2-stage: embedding + LLM re-ranking)")
+        timings = StageTimings()
 
         if is_file:
             requirements, scores = match_vacancy_file_with_llm(
@@ -205,6 +268,10 @@ def main() -> None:
                 top_n=args.top,
                 embedding_candidates=args.candidates,
                 min_similarity=min_similarity,
+                ef_search=args.ef_search,
+                probes=args.probes,
+                scoring=args.scoring,
+                timings=timings,
             )
         else:
             requirements, scores = match_vacancy_with_llm(
@@ -212,6 +279,10 @@ def main() -> None:
                 top_n=args.top,
                 embedding_candidates=args.candidates,
                 min_similarity=min_similarity,
+                ef_search=args.ef_search,
+                probes=args.probes,
+                scoring=args.scoring,
+                timings=timings,
             )
 
         # Apply score range filter (LLM uses combined_score)
@@ -223,7 +294,9 @@ def main() -> None:
         # Output
         if args.json:
             print(
-                json.dumps(llm_result_to_dict(requirements, scores), indent=2, ensure_ascii=False)
+                json.dumps(
+                    llm_result_to_dict(requirements, scores, timings), indent=2, ensure_ascii=False
+                )
             )
         else:
             from resume_matcher.models.llm_scorer import print_scored_results
@@ -242,12 +315,18 @@ def main() -> None:
                 args.vacancy,
                 top_n=args.top,
                 min_similarity=min_similarity,
+                ef_search=args.ef_search,
+                probes=args.probes,
+                scoring=args.scoring,
             )
         else:
             result = match_vacancy_text(
                 args.text,
                 top_n=args.top,
                 min_similarity=min_similarity,
+                ef_search=args.ef_search,
+                probes=args.probes,
+                scoring=args.scoring,
             )
 
         # Apply score range filter (embedding uses score_percent)
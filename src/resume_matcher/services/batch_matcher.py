@@ -0,0 +1,233 @@
+# src/resume_matcher/services/batch_matcher.py
+"""
+Batch vacancy matching: many vacancies against the whole corpus in one pass.
+
+Re-ranking the resume pool against hundreds of open vacancies with
+match_vacancy_file in a loop re-embeds and re-queries every vacancy. Here all
+vacancies are embedded together (batch_get_embeddings) and scored with one
+matrix product per block of resume embeddings streamed from the database,
+keeping a running top-K per vacancy. Scoring is exact and by document vector:
+MATCH_SCORING=max_chunk (chunk-level scoring) does not apply here. The scan
+streams on a dedicated connection, so it holds no pool slot while blocks are
+scored.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import time
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from resume_matcher.config import OUTPUT_DIR
+from resume_matcher.db import get_connection, iter_resume_embedding_blocks
+from resume_matcher.models.embedding import batch_get_embeddings
+from resume_matcher.services.matcher import (
+    MatchResult,
+    _get_total_resume_count,
+    _load_matches,
+)
+from resume_matcher.utils.convert_file_to_text import convert_file_to_text
+from resume_matcher.utils.text_cleaner import clean_ocr_text
+
+logger = logging.getLogger(__name__)
+
+# Resume rows scored per matrix product (block_size x dimension float32 each)
+BLOCK_SIZE = 4096
+
+
+def merge_top_k(
+    best_scores: np.ndarray,
+    best_ids: np.ndarray,
+    block_scores: np.ndarray,
+    block_ids: np.ndarray,
+    k: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Merges one block of scores into the running top-k of every vacancy.
+
+    best_scores / best_ids: (n_vacancies, <= k), sorted by descending score.
+    block_scores: (n_vacancies, n_rows); block_ids: (n_rows,).
+    Returns the new (n_vacancies, <= k) arrays, sorted by descending score.
+    """
+    scores = np.concatenate([best_scores, block_scores], axis=1)
+    ids = np.concatenate([best_ids, np.broadcast_to(block_ids, block_scores.shape)], axis=1)
+
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(scores, top, axis=1)
+        ids = np.take_along_axis(ids, top, axis=1)
+
+    order = np.argsort(-scores, axis=1, kind="stable")
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(ids, order, axis=1)
+
+
+def match_vacancies(
+    vacancies: dict[str, str],
+    top_n: int = 10,
+    min_similarity: float = 0.0,
+    block_size: int = BLOCK_SIZE,
+) -> dict[str, MatchResult]:
+    """
+    Top-N resumes for each vacancy, in one pass over the corpus.
+
+    Resumes are scored by their document vector only; chunk-level (max_chunk)
+    scoring is ignored.
+
+    Args:
+        vacancies: Vacancy name -> vacancy text.
+        top_n: Maximum number of results per vacancy.
+        min_similarity: Minimum similarity threshold (0.0 to 1.0).
+        block_size: Resume embeddings scored per matrix product.
+
+    Returns:
+        Vacancy name -> MatchResult, in input order. Empty vacancies get no matches.
+    """
+    names = list(vacancies)
+    cleaned = [clean_ocr_text(vacancies[name]) for name in names]
+    results = {
+        name: MatchResult(vacancy_text=text, total_resumes_in_db=0, matches=[])
+        for name, text in zip(names, cleaned, strict=True)
+    }
+
+    active = [i for i, text in enumerate(cleaned) if text.strip()]
+    if not active or top_n <= 0:
+        return results
+
+    started = time.perf_counter()
+    logger.info(f"Embedding {len(active)} vacancies")
+    queries = batch_get_embeddings([cleaned[i] for i in active])
+    norms = np.linalg.norm(queries, axis=1, keepdims=True)
+    queries = queries / np.where(norms == 0, 1, norms)
+
+    best_scores = np.empty((len(active), 0), dtype=np.float32)
+    best_ids = np.empty((len(active), 0), dtype=np.int64)
+    scanned = 0
+    for ids, embeddings in iter_resume_embedding_blocks(block_size):
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.where(norms == 0, 1, norms)
+        best_scores, best_ids = merge_top_k(
+            best_scores, best_ids, queries @ embeddings.T, ids, top_n
+        )
+        scanned += len(ids)
+
+    winners_by_vacancy: list[list[dict[str, Any]]] = [
+        [
+            {"id": int(resume_id), "distance": 1.0 - float(score)}
+            for score, resume_id in zip(row_scores, row_ids, strict=True)
+            if score >= min_similarity
+        ]
+        for row_scores, row_ids in zip(best_scores, best_ids, strict=True)
+    ]
+
+    # One details query for the union of all winners
+    unique = {w["id"]: w for winners in winners_by_vacancy for w in winners}
+    if unique:
+        with get_connection() as conn, conn.cursor() as cur:
+            loaded = {m.id: m for m in _load_matches(cur, list(unique.values()))}
+    else:
+        loaded = {}
+
+    total_count = _get_total_resume_count()
+    for i, winners in zip(active, winners_by_vacancy, strict=True):
+        result = results[names[i]]
+        result.total_resumes_in_db = total_count
+        result.matches = [
+            replace(loaded[w["id"]], similarity_score=1.0 - w["distance"])
+            for w in winners
+            if w["id"] in loaded
+        ]
+
+    logger.info(
+        f"Matched {len(active)} vacancies against {scanned} resumes "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    return results
+
+
+def match_vacancy_dir(
+    vacancies_dir: str | Path,
+    top_n: int = 10,
+    min_similarity: float = 0.0,
+    block_size: int = BLOCK_SIZE,
+) -> dict[str, MatchResult]:
+    """
+    match_vacancies for every vacancy file (PDF, DOCX, TXT, ...) in a folder.
+    Results are keyed by file name; unreadable files are logged and skipped.
+    """
+    vacancies_dir = Path(vacancies_dir)
+    if not vacancies_dir.is_dir():
+        logger.error(f"Vacancies folder not found: {vacancies_dir}")
+        return {}
+
+    vacancies = {}
+    for path in sorted(f for f in vacancies_dir.rglob("*.*") if f.is_file()):
+        try:
+            text = convert_file_to_text(path)
+        except Exception as e:
+            logger.error(f"Could not read vacancy {path.name}: {e}")
+            continue
+        if not text.strip():
+            logger.warning(f"Could not extract text from vacancy file: {path.name}")
+            continue
+        vacancies[str(path.relative_to(vacancies_dir))] = text
+
+    logger.info(f"Loaded {len(vacancies)} vacancies from {vacancies_dir}")
+    return match_vacancies(
+        vacancies, top_n=top_n, min_similarity=min_similarity, block_size=block_size
+    )
+
+
+def write_batch_results(
+    results: dict[str, MatchResult],
+    output_dir: str | Path = OUTPUT_DIR,
+) -> tuple[Path, Path]:
+    """
+    Writes the per-vacancy top-K as batch_matches_<timestamp>.csv (one row per
+    vacancy and match) and .json next to it. Returns (csv_path, json_path).
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"batch_matches_{datetime.now():%Y%m%d_%H%M%S}"
+    csv_path = output_dir / f"{stem}.csv"
+    json_path = output_dir / f"{stem}.json"
+
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            ["vacancy", "rank", "resume_id", "file_name", "file_path", "similarity_percent"]
+        )
+        for vacancy, result in results.items():
+            for rank, m in enumerate(result.matches, start=1):
+                writer.writerow([vacancy, rank, m.id, m.file_name, m.file_path, m.score_percent])
+
+    payload = {
+        vacancy: {
+            "total_resumes_in_db": result.total_resumes_in_db,
+            "matches": [
+                {
+                    "rank": rank,
+                    "id": m.id,
+                    "file_name": m.file_name,
+                    "file_path": m.file_path,
+                    "similarity_percent": m.score_percent,
+                    "name": m.json_data.get("full_name"),
+                    "position": m.json_data.get("current_position"),
+                }
+                for rank, m in enumerate(result.matches, start=1)
+            ],
+        }
+        for vacancy, result in results.items()
+    }
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+
+    logger.info(f"Batch results written to {csv_path} and {json_path}")
+    return csv_path, json_path
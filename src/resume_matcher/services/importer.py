@@ -6,19 +6,36 @@ Resume importer service - processing of one resume file:
 - embedding generation
 - basic metadata (file name, text length, etc.)
 - future plans: parsing structured fields (name, email, skills, etc.)
+
+ImportPipeline runs the same steps for whole folders as a staged, streaming pipeline.
 """
 
 import json
 import logging
+import multiprocessing
 import os
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 from dotenv import load_dotenv
-from groq import Groq
 
-from ..db import content_hash_exists, get_connection, store_resume
-from ..models.embedding import get_or_compute_embedding
+from ..config import EMBEDDING_CHUNKING, LLM_MAX_CONCURRENCY
+from ..db import (
+    content_hash_exists,
+    get_connection,
+    get_file_hash,
+    invalidate_resume_counts,
+    store_resume,
+    store_resumes_batch,
+)
+from ..models.llm_cache import cached_json_completion
+from ..models.llm_dispatch import GROQ_MODEL, get_llm_dispatcher
 from ..utils.convert_file_to_text import convert_file_to_text
 from ..utils.text_cleaner import clean_ocr_text
 
@@ -26,25 +43,14 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-GROQ_MODEL = "llama-3.3-70b-versatile"
-_groq_client: Groq | None = None
-
-
-def get_groq_client() -> Groq:
-    """Lazily initialize the Groq client."""
-    global _groq_client
-    if _groq_client is None:
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
-            raise RuntimeError("GROQ_API_KEY environment variable is not set")
-        _groq_client = Groq(api_key=api_key)
-    return _groq_client
+# Bump when the prompt below changes: cached responses of older versions are ignored
+RESUME_PARSE_PROMPT_VERSION = "1"
 
 
 def extract_structured_json_via_llm(text: str) -> dict[str, Any]:
     """
     Extracts structured data from resume text via Groq (Llama 3.1).
-    Returns a dict with fields.
+    Returns a dict with fields. Responses are cached (see models/llm_cache.py).
     """
     prompt = f"""You are an expert in parsing resumes.
 Extract structured data in JSON format from the resume text.
@@ -69,23 +75,16 @@ Resume text (can be in Russian and English):
 {text[:15000]}
 """
 
+    def complete() -> str:
+        # Shared dispatcher: concurrency and token budget adapt to Groq's rate limits
+        return get_llm_dispatcher().complete(prompt, max_tokens=1000, model=GROQ_MODEL)
+
     try:
-        response = get_groq_client().chat.completions.create(
-            model=GROQ_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.0,  # maximum determinism
-            max_tokens=1000,
-            top_p=1.0,
+        parsed, cached = cached_json_completion(
+            "parse_resume", RESUME_PARSE_PROMPT_VERSION, GROQ_MODEL, prompt, complete
         )
-
-        content = response.choices[0].message.content.strip()
-
-        # Remove possible markdown
-        if content.startswith("```json"):
-            content = content.split("```json")[1].split("```")[0].strip()
-
-        parsed = json.loads(content)
-        logger.info("LLM-parsing successful")
+        if not cached:
+            logger.info("LLM-parsing successful")
         return parsed
 
     except json.JSONDecodeError as e:
@@ -96,29 +95,36 @@ Resume text (can be in Russian and English):
         return {}
 
 
-def import_resume(file_path: Path | str, force_update: bool = False, skip_duplicates: bool = True) -> dict[str, Any]:
+def prepare_resume(
+    file_path: Path | str,
+    force_update: bool = False,
+    skip_duplicates: bool = True,
+) -> dict[str, Any]:
     """
-    Imports a single resume into the database.
-    
-    Args:
-        file_path: Path to the resume file.
-        force_update: If True, re-import even if file already exists.
-        skip_duplicates: If True, skip files with identical content (by hash).
+    Runs every import step for a single resume except storing it.
+
+    Returns the same result dict as import_resume; when the resume is ready to be
+    stored it also carries a "record" with the store_resume / store_resumes_batch
+    fields, so callers can save records one by one or in batches.
     """
     path = Path(file_path)
     if not path.is_file():
         return {"error": f"File not found: {path}"}
 
-    result = {
+    result: dict[str, Any] = {
         "file_name": path.name,
         "status": "success",
     }
 
+    file_hash = get_file_hash(path)
+
     # Check for duplicate content before expensive operations
     if skip_duplicates and not force_update:
-        existing = content_hash_exists(path)
+        existing = content_hash_exists(path, file_hash=file_hash)
         if existing:
-            logger.info(f"Skipping duplicate content: {path.name} (same as {existing['file_name']})")
+            logger.info(
+                f"Skipping duplicate content: {path.name} (same as {existing['file_name']})"
+            )
             return {
                 "file_name": path.name,
                 "status": "skipped_duplicate",
@@ -134,8 +140,15 @@ def import_resume(file_path: Path | str, force_update: bool = False, skip_duplic
     # Cleaning
     cleaned_text = clean_ocr_text(raw_text)
 
-    # Embedding
-    embedding = get_or_compute_embedding(cleaned_text, file_path=path)
+    # Embedding (imported lazily: extraction processes must never load the model)
+    from ..models.embedding import get_or_compute_chunked_embeddings, get_or_compute_embedding
+
+    chunks = None
+    if EMBEDDING_CHUNKING:
+        chunked = get_or_compute_chunked_embeddings([cleaned_text])[0]
+        embedding, chunks = chunked.vector, chunked.chunk_records()
+    else:
+        embedding = get_or_compute_embedding(cleaned_text, file_path=path)
 
     # Parsing via LLM (Most expensive step)
     try:
@@ -145,16 +158,37 @@ def import_resume(file_path: Path | str, force_update: bool = False, skip_duplic
         json_data = {}
         result["status"] = "llm_failed"
 
+    result["record"] = {
+        "file_path": path,
+        "file_hash": file_hash,
+        "raw_text": raw_text,
+        "cleaned_text": cleaned_text,
+        "json_data": json_data,
+        "embedding": embedding,
+        "chunks": chunks,
+    }
+    return result
+
+
+def import_resume(
+    file_path: Path | str, force_update: bool = False, skip_duplicates: bool = True
+) -> dict[str, Any]:
+    """
+    Imports a single resume into the database.
+
+    Args:
+        file_path: Path to the resume file.
+        force_update: If True, re-import even if file already exists.
+        skip_duplicates: If True, skip files with identical content (by hash).
+    """
+    result = prepare_resume(file_path, force_update=force_update, skip_duplicates=skip_duplicates)
+    record = result.pop("record", None)
+    if record is None:
+        return result
+
     # Storing in DB
     try:
-        store_resume(
-            file_path=path,
-            raw_text=raw_text,
-            cleaned_text=cleaned_text,
-            json_data=json_data,
-            embedding=embedding,
-            force_update=force_update,
-        )
+        store_resume(**record, force_update=force_update)
         result["stored"] = True
     except Exception as e:
         logger.error(f"Error saving to database: {e}")
@@ -189,4 +223,391 @@ def sync_deleted_resumes(resumes_dir: Path):
             logger.info(f"Record deleted from BD: {Path(path).name}")
 
         conn.commit()
+        invalidate_resume_counts()
         logger.info(f"Records deleted from BD: {deleted_count}")
+
+
+# ============================================================================
+# STAGED IMPORT PIPELINE
+# ============================================================================
+#
+# discovery -> hashing -> extraction/OCR -> embedding -> LLM parsing -> DB writes
+#
+# Every stage runs in its own thread(s) and hands work to the next one through a
+# bounded queue, so a slow stage applies back-pressure instead of idling the others:
+# LLM latency never stalls OCR, and OCR spikes never starve the embedding batches.
+# Text extraction runs in a process pool (CPU-bound); the embedding model is loaded
+# once, by the embedding stage thread, and encodes in batches.
+
+_DONE = object()  # end-of-stream marker passed between stages
+
+
+@dataclass
+class StageStats:
+    """Throughput and input-queue statistics of a single pipeline stage."""
+
+    name: str
+    workers: int
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+    _depth_total: int = 0
+    _depth_samples: int = 0
+
+    def sample_queue(self, depth: int) -> None:
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+
+    @property
+    def avg_queue_depth(self) -> float:
+        return self._depth_total / self._depth_samples if self._depth_samples else 0.0
+
+    def throughput(self, elapsed: float) -> float:
+        """Items per second over the whole run."""
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+
+@dataclass
+class PipelineReport:
+    """Outcome of an ImportPipeline run."""
+
+    results: list[dict[str, Any]]
+    stages: list[StageStats]
+    elapsed_seconds: float
+    errors: list[str] = field(default_factory=list)  # failures that ended a stage early
+
+    @property
+    def files_found(self) -> int:
+        return self.stages[0].processed if self.stages else 0
+
+    def format_stats(self) -> str:
+        """Per-stage table: processed items, failures, throughput, busy time, input queue depth."""
+        lines = [
+            f"{'Stage':<12} {'Workers':>7} {'Done':>7} {'Failed':>6} {'Items/s':>8} "
+            f"{'Busy s':>8} {'Queue avg':>9} {'Queue max':>9}"
+        ]
+        for st in self.stages:
+            lines.append(
+                f"{st.name:<12} {st.workers:>7} {st.processed:>7} {st.failed:>6} "
+                f"{st.throughput(self.elapsed_seconds):>8.2f} {st.busy_seconds:>8.1f} "
+                f"{st.avg_queue_depth:>9.1f} {st.max_queue_depth:>9}"
+            )
+        lines.append(f"Total time: {self.elapsed_seconds:.1f}s")
+        lines.extend(f"Error: {error}" for error in self.errors)
+        return "\n".join(lines)
+
+
+def _extract_text(path: Path) -> tuple[str, str]:
+    """Process-pool task: text extraction (with OCR if needed) and cleaning."""
+    raw_text = convert_file_to_text(path)
+    return raw_text, clean_ocr_text(raw_text) if raw_text.strip() else ""
+
+
+class ImportPipeline:
+    """
+    Streaming import engine with independently sized stages connected by bounded queues.
+
+    Usage:
+        pipeline = ImportPipeline(extract_workers=8)
+        report = pipeline.run(Path("data/resumes"))
+        print(report.format_stats())
+    """
+
+    def __init__(
+        self,
+        force_update: bool = False,
+        skip_duplicates: bool = True,
+        hash_workers: int = 2,
+        extract_workers: int | None = None,
+        llm_workers: int = LLM_MAX_CONCURRENCY,
+        embed_batch_size: int = 64,
+        db_batch_size: int = 200,
+        queue_size: int = 64,
+        batch_wait_seconds: float = 0.5,
+        on_result: Callable[[dict[str, Any]], None] | None = None,
+    ):
+        self.force_update = force_update
+        self.skip_duplicates = skip_duplicates
+        self.hash_workers = hash_workers
+        self.extract_workers = extract_workers or os.cpu_count() or 1
+        self.llm_workers = llm_workers
+        self.embed_batch_size = embed_batch_size
+        self.db_batch_size = db_batch_size
+        self.queue_size = queue_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self.on_result = on_result
+
+        self._results: list[dict[str, Any]] = []
+        self._results_lock = threading.Lock()
+        self._errors: list[str] = []
+
+    # ─── Public API ──────────────────────────────────────────────────────────
+
+    def run(self, resumes_dir: Path, limit: int | None = None) -> PipelineReport:
+        """Imports every file under resumes_dir and returns results and stage statistics."""
+        self._results = []
+        self._errors = []
+        started = time.perf_counter()
+
+        discovery = StageStats("discovery", 1)
+        hashing = StageStats("hashing", self.hash_workers)
+        extraction = StageStats("extraction", self.extract_workers)
+        embedding = StageStats("embedding", 1)
+        llm = StageStats("llm", self.llm_workers)
+        storing = StageStats("db_write", 1)
+
+        hash_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        extract_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        embed_q: queue.Queue = queue.Queue(maxsize=max(self.queue_size, self.embed_batch_size))
+        llm_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        store_q: queue.Queue = queue.Queue(maxsize=max(self.queue_size, self.db_batch_size))
+
+        # spawn: extraction processes must not inherit the embedding model (or torch
+        # threads) from this process, and never import it themselves
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.extract_workers, mp_context=mp_context) as pool:
+            threads = [
+                self._spawn(self._discover, discovery, resumes_dir, limit, hash_q),
+                *self._spawn_workers(hashing, hash_q, extract_q, self._hash),
+                *self._spawn_workers(
+                    extraction, extract_q, embed_q, lambda job: self._extract(job, pool)
+                ),
+                self._spawn(
+                    self._batch_loop, embedding, embed_q, llm_q, self.embed_batch_size, self._embed
+                ),
+                *self._spawn_workers(llm, llm_q, store_q, self._parse_with_llm),
+                self._spawn(
+                    self._batch_loop, storing, store_q, None, self.db_batch_size, self._store
+                ),
+            ]
+            for thread in threads:
+                thread.join()
+
+        return PipelineReport(
+            results=self._results,
+            stages=[discovery, hashing, extraction, embedding, llm, storing],
+            elapsed_seconds=time.perf_counter() - started,
+            errors=self._errors,
+        )
+
+    # ─── Stage plumbing ──────────────────────────────────────────────────────
+
+    @staticmethod
+    def _spawn(target: Callable[..., None], *args: Any) -> threading.Thread:
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        return thread
+
+    def _spawn_workers(
+        self,
+        stats: StageStats,
+        in_q: queue.Queue,
+        out_q: queue.Queue,
+        fn: Callable[[dict[str, Any]], dict[str, Any] | None],
+    ) -> list[threading.Thread]:
+        """Starts stats.workers threads applying fn to every job; the last one to exit closes out_q."""
+        remaining = [stats.workers]
+        lock = threading.Lock()
+
+        def worker() -> None:
+            try:
+                while True:
+                    job = in_q.get()
+                    if job is _DONE:
+                        in_q.put(_DONE)  # let sibling workers see it too
+                        break
+                    with lock:
+                        stats.sample_queue(in_q.qsize())
+
+                    t0 = time.perf_counter()
+                    failed = False
+                    try:
+                        job = fn(job)
+                    except Exception as e:
+                        logger.error(f"[{stats.name}] {job['path'].name}: {e}")
+                        self._fail(job, stats.name, e)
+                        job = None
+                        failed = True
+
+                    with lock:
+                        stats.busy_seconds += time.perf_counter() - t0
+                        stats.processed += 1
+                        stats.failed += int(failed)
+                    if job is not None:
+                        out_q.put(job)
+            finally:
+                # Downstream stages wait for _DONE even if this worker died
+                with lock:
+                    remaining[0] -= 1
+                    if remaining[0] == 0:
+                        out_q.put(_DONE)
+
+        return [self._spawn(worker) for _ in range(stats.workers)]
+
+    def _batch_loop(
+        self,
+        stats: StageStats,
+        in_q: queue.Queue,
+        out_q: queue.Queue | None,
+        batch_size: int,
+        fn: Callable[[list[dict[str, Any]]], None],
+    ) -> None:
+        """Collects up to batch_size jobs (waiting at most batch_wait_seconds) and processes them together."""
+        try:
+            done = False
+            while not done:
+                job = in_q.get()
+                if job is _DONE:
+                    break
+                stats.sample_queue(in_q.qsize())
+
+                batch = [job]
+                while len(batch) < batch_size:
+                    try:
+                        job = in_q.get(timeout=self.batch_wait_seconds)
+                    except queue.Empty:
+                        break
+                    if job is _DONE:
+                        done = True
+                        break
+                    batch.append(job)
+
+                t0 = time.perf_counter()
+                try:
+                    fn(batch)
+                except Exception as e:
+                    # Jobs fn already finished (e.g. stored) keep their result
+                    unfinished = [job for job in batch if not job.get("finished")]
+                    logger.error(
+                        f"[{stats.name}] batch of {len(batch)} failed "
+                        f"({len(unfinished)} unfinished): {e}"
+                    )
+                    for failed in unfinished:
+                        self._fail(failed, stats.name, e)
+                    stats.failed += len(unfinished)
+                    stats.processed += len(batch) - len(unfinished)
+                    batch = []
+                stats.busy_seconds += time.perf_counter() - t0
+                stats.processed += len(batch)
+
+                if out_q is not None:
+                    for ready in batch:
+                        out_q.put(ready)
+        finally:
+            if out_q is not None:
+                out_q.put(_DONE)
+
+    def _finish(self, job: dict[str, Any]) -> None:
+        """Records the final result of a job (success, skip or error)."""
+        job["finished"] = True
+        result = {"file_name": job["path"].name, "file_path": str(job["path"]), **job["result"]}
+        with self._results_lock:
+            self._results.append(result)
+        if self.on_result:
+            self.on_result(result)
+
+    def _fail(self, job: dict[str, Any], stage: str, error: Exception) -> None:
+        """Records a stage failure for a job that has no final result yet."""
+        if job.get("finished"):
+            return
+        job["result"] = {"error": f"{stage} failed: {error}"}
+        try:
+            self._finish(job)
+        except Exception as e:
+            # e.g. on_result raised: the result is recorded, the stage must go on
+            logger.error(f"[{stage}] recording the result of {job['path'].name} failed: {e}")
+
+    # ─── Stages ──────────────────────────────────────────────────────────────
+
+    def _discover(
+        self, stats: StageStats, resumes_dir: Path, limit: int | None, out_q: queue.Queue
+    ) -> None:
+        t0 = time.perf_counter()
+        try:
+            for path in resumes_dir.rglob("*.*"):
+                if limit and stats.processed >= limit:
+                    break
+                if not path.is_file():
+                    continue
+                stats.processed += 1
+                out_q.put({"path": path, "result": {"status": "success"}})
+        except Exception as e:
+            # Files found so far are still imported
+            logger.error(f"[{stats.name}] {resumes_dir}: {e}")
+            stats.failed += 1
+            self._errors.append(f"{stats.name} failed: {e}")
+        finally:
+            stats.busy_seconds = time.perf_counter() - t0
+            out_q.put(_DONE)
+
+    def _hash(self, job: dict[str, Any]) -> dict[str, Any] | None:
+        job["file_hash"] = get_file_hash(job["path"])
+
+        if self.skip_duplicates and not self.force_update:
+            existing = content_hash_exists(job["path"], file_hash=job["file_hash"])
+            if existing:
+                logger.info(
+                    f"Skipping duplicate content: {job['path'].name} (same as {existing['file_name']})"
+                )
+                job["result"] = {
+                    "status": "skipped_duplicate",
+                    "duplicate_of": existing["file_name"],
+                    "existing_id": existing["id"],
+                }
+                self._finish(job)
+                return None
+        return job
+
+    def _extract(self, job: dict[str, Any], pool: ProcessPoolExecutor) -> dict[str, Any] | None:
+        job["raw_text"], job["cleaned_text"] = pool.submit(_extract_text, job["path"]).result()
+        if not job["raw_text"].strip():
+            job["result"] = {"error": "Text was not extracted"}
+            self._finish(job)
+            return None
+        return job
+
+    def _embed(self, batch: list[dict[str, Any]]) -> None:
+        from ..models.embedding import (
+            get_or_compute_chunked_embeddings,
+            get_or_compute_embeddings,
+        )
+
+        texts = [job["cleaned_text"] for job in batch]
+        if EMBEDDING_CHUNKING:
+            for job, chunked in zip(batch, get_or_compute_chunked_embeddings(texts), strict=True):
+                job["embedding"] = chunked.vector
+                job["chunks"] = chunked.chunk_records()
+            return
+
+        for job, emb in zip(batch, get_or_compute_embeddings(texts), strict=True):
+            job["embedding"] = emb
+
+    def _parse_with_llm(self, job: dict[str, Any]) -> dict[str, Any]:
+        try:
+            job["json_data"] = extract_structured_json_via_llm(job["cleaned_text"])
+        except Exception as e:
+            logger.error(f"LLM-parsing failed: {e}")
+            job["json_data"] = {}
+            job["result"]["status"] = "llm_failed"
+        return job
+
+    def _store(self, batch: list[dict[str, Any]]) -> None:
+        store_resumes_batch(
+            [
+                {
+                    "file_path": job["path"],
+                    "file_hash": job["file_hash"],
+                    "raw_text": job["raw_text"],
+                    "cleaned_text": job["cleaned_text"],
+                    "json_data": job["json_data"],
+                    "embedding": job["embedding"],
+                    "chunks": job.get("chunks"),
+                }
+                for job in batch
+            ]
+        )
+        for job in batch:
+            job["result"]["stored"] = True
+            self._finish(job)
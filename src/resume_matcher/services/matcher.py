@@ -8,23 +8,133 @@ the most similar resumes using pgvector cosine similarity search.
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from dataclasses import dataclass
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from concurrent.futures import Executor
+
+    import psycopg
+
     from resume_matcher.models.llm_scorer import CandidateScore, VacancyRequirements
 
-from resume_matcher.db import get_connection
-from resume_matcher.models.embedding import get_embedding
+from resume_matcher import db_async as adb
+from resume_matcher.config import (
+    HNSW_EF_SEARCH,
+    IVFFLAT_PROBES,
+    MATCH_SCORING,
+    SEARCH_BACKEND,
+    VECTOR_SEARCH_TIER,
+)
+from resume_matcher.db import (
+    VECTOR_SEARCH_TIERS,
+    get_connection,
+    get_resume_counts,
+    vector_expression,
+)
+from resume_matcher.models.embedding import aget_query_embedding, get_query_embedding
 from resume_matcher.utils.convert_file_to_text import convert_file_to_text
 from resume_matcher.utils.text_cleaner import clean_ocr_text
 
 logger = logging.getLogger(__name__)
 
+# ANN over-fetch: duplicates (same file_hash) are removed after the index scan,
+# so we ask for more rows than needed to still end up with top_n unique resumes.
+ANN_OVERFETCH_FACTOR = 3
+ANN_OVERFETCH_MIN = 20
+# max_chunk scoring scans chunks, several of which may belong to one resume
+CHUNK_OVERFETCH_FACTOR = 4
+# halfvec / coarse tiers: candidates fetched from the index per row kept after rescoring
+COARSE_OVERFETCH_FACTOR = 4
+# pgvector rejects hnsw.ef_search above 1000
+HNSW_EF_SEARCH_MAX = 1000
+
+SCORING_MODES = ("document", "max_chunk")
+
+# Nearest rows (resumes or chunks) with the resume's file_hash / updated_at for dedup
+_ANN_QUERIES = {
+    "document": """
+        SELECT id, file_hash, updated_at, embedding <=> %(q)s::vector AS distance
+        FROM resumes
+        WHERE embedding IS NOT NULL
+        ORDER BY embedding <=> %(q)s::vector
+        LIMIT %(limit)s
+    """,
+    "max_chunk": """
+        SELECT r.id, r.file_hash, r.updated_at, nearest.distance
+        FROM (
+            SELECT resume_id, embedding <=> %(q)s::vector AS distance
+            FROM resume_chunks
+            ORDER BY embedding <=> %(q)s::vector
+            LIMIT %(limit)s
+        ) AS nearest
+        JOIN resumes r ON r.id = nearest.resume_id
+        ORDER BY nearest.distance
+    """,
+}
+
+# Candidates from a reduced-precision tier index ({indexed} / {query} are
+# db.vector_expression), re-ranked by exact distance on the full vectors
+_RESCORE_QUERY = """
+    SELECT id, file_hash, updated_at, embedding <=> %(q)s::vector AS distance
+    FROM (
+        SELECT id, file_hash, updated_at, embedding
+        FROM resumes
+        WHERE embedding IS NOT NULL
+        ORDER BY {indexed} <=> {query}
+        LIMIT %(candidates)s
+    ) AS candidates
+    ORDER BY distance
+    LIMIT %(limit)s
+"""
+
+# Exact scan: latest version per file_hash, ranked by (best chunk) distance
+_EXACT_QUERIES = {
+    "document": """
+        SELECT id, file_hash, distance
+        FROM (
+            SELECT DISTINCT ON (file_hash)
+                id,
+                file_hash,
+                embedding <=> %(q)s::vector AS distance
+            FROM resumes
+            WHERE embedding IS NOT NULL
+            ORDER BY file_hash, updated_at DESC
+        ) AS latest
+        WHERE distance <= %(max_distance)s
+        ORDER BY distance
+        LIMIT %(top_n)s
+    """,
+    "max_chunk": """
+        SELECT id, file_hash, distance
+        FROM (
+            SELECT DISTINCT ON (r.file_hash)
+                r.id,
+                r.file_hash,
+                best.distance
+            FROM (
+                SELECT resume_id, MIN(embedding <=> %(q)s::vector) AS distance
+                FROM resume_chunks
+                GROUP BY resume_id
+            ) AS best
+            JOIN resumes r ON r.id = best.resume_id
+            ORDER BY r.file_hash, r.updated_at DESC
+        ) AS latest
+        WHERE distance <= %(max_distance)s
+        ORDER BY distance
+        LIMIT %(top_n)s
+    """,
+}
+
 
 @dataclass
 class MatchedResume:
@@ -56,10 +166,55 @@ class MatchResult:
         return self.matches[0] if self.matches else None
 
 
+@dataclass
+class StageTimings:
+    """
+    Wall-clock seconds per stage of an LLM match (see match_vacancy_with_llm).
+
+    The vacancy parse runs concurrently with embedding + search, so total is
+    shorter than the sum of the stages; overlap_saved is the difference.
+    """
+
+    embedding: float = 0.0
+    search: float = 0.0
+    parse_vacancy: float = 0.0
+    scoring: float = 0.0
+    total: float = 0.0
+    started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def overlap_saved(self) -> float:
+        """Seconds saved by parsing the vacancy while embedding and searching"""
+        serial = self.embedding + self.search + self.parse_vacancy + self.scoring
+        return max(0.0, serial - self.total)
+
+    def as_dict(self) -> dict[str, float]:
+        """Stage durations and the overlap saving, in milliseconds"""
+        return {
+            "embedding_ms": round(self.embedding * 1000, 1),
+            "search_ms": round(self.search * 1000, 1),
+            "parse_vacancy_ms": round(self.parse_vacancy * 1000, 1),
+            "scoring_ms": round(self.scoring * 1000, 1),
+            "total_ms": round(self.total * 1000, 1),
+            "overlap_saved_ms": round(self.overlap_saved * 1000, 1),
+        }
+
+    def format(self) -> str:
+        return (
+            f"embedding {self.embedding:.2f}s, search {self.search:.2f}s, "
+            f"parse_vacancy {self.parse_vacancy:.2f}s (concurrent), scoring {self.scoring:.2f}s, "
+            f"total {self.total:.2f}s, saved {self.overlap_saved:.2f}s by overlap"
+        )
+
+
 def match_vacancy_text(
     vacancy_text: str,
     top_n: int = 10,
     min_similarity: float = 0.0,
+    ef_search: int | None = None,
+    probes: int | None = None,
+    scoring: str | None = None,
+    vacancy_embedding: np.ndarray | None = None,
 ) -> MatchResult:
     """
     Finds top-N resumes most similar to the given vacancy text.
@@ -68,6 +223,10 @@ def match_vacancy_text(
         vacancy_text: The vacancy/job description text.
         top_n: Maximum number of results to return.
         min_similarity: Minimum similarity threshold (0.0 to 1.0).
+        ef_search: HNSW search breadth (higher = better recall, slower).
+        probes: IVFFlat lists to scan (higher = better recall, slower).
+        scoring: "document" or "max_chunk" (see _find_similar_resumes).
+        vacancy_embedding: Precomputed embedding of the vacancy (see embed_vacancy_async).
 
     Returns:
         MatchResult with ranked candidates.
@@ -78,14 +237,18 @@ def match_vacancy_text(
 
     # Clean and generate embedding for vacancy
     cleaned_vacancy = clean_ocr_text(vacancy_text)
-    logger.info(f"Generating embedding for vacancy ({len(cleaned_vacancy)} chars)")
-    vacancy_embedding = get_embedding(cleaned_vacancy)
+    if vacancy_embedding is None:
+        logger.info(f"Generating embedding for vacancy ({len(cleaned_vacancy)} chars)")
+        vacancy_embedding = get_query_embedding(cleaned_vacancy)
 
     # Query database for similar resumes using pgvector
     matches = _find_similar_resumes(
         vacancy_embedding,
         top_n=top_n,
         min_similarity=min_similarity,
+        ef_search=ef_search,
+        probes=probes,
+        scoring=scoring,
     )
 
     # Get total count
@@ -100,10 +263,70 @@ def match_vacancy_text(
     )
 
 
+async def amatch_vacancy_text(
+    vacancy_text: str,
+    top_n: int = 10,
+    min_similarity: float = 0.0,
+    ef_search: int | None = None,
+    probes: int | None = None,
+    scoring: str | None = None,
+    vacancy_embedding: np.ndarray | None = None,
+    executor: Executor | None = None,
+) -> MatchResult:
+    """
+    Async match_vacancy_text for the API: the search runs on the async pool
+    (db_async) and the embedding, if not given, on the batcher or executor.
+    """
+    if not vacancy_text or not vacancy_text.strip():
+        logger.warning("Empty vacancy text provided")
+        return MatchResult(vacancy_text="", total_resumes_in_db=0, matches=[])
+
+    cleaned_vacancy = clean_ocr_text(vacancy_text)
+    if vacancy_embedding is None:
+        vacancy_embedding = await aget_query_embedding(cleaned_vacancy, executor=executor)
+
+    matches = await _afind_similar_resumes(
+        vacancy_embedding,
+        top_n=top_n,
+        min_similarity=min_similarity,
+        ef_search=ef_search,
+        probes=probes,
+        scoring=scoring,
+    )
+    total_count = (await adb.get_resume_counts())["with_embeddings"]
+
+    logger.info(f"Found {len(matches)} matches out of {total_count} resumes")
+
+    return MatchResult(
+        vacancy_text=cleaned_vacancy,
+        total_resumes_in_db=total_count,
+        matches=matches,
+    )
+
+
+async def embed_vacancy_async(
+    vacancy_text: str, executor: Executor | None = None
+) -> np.ndarray | None:
+    """
+    Embeds a vacancy without blocking the event loop.
+
+    Concurrent API requests are encoded together by the embedding batcher (or on
+    executor when batching is off); pass the result as vacancy_embedding to
+    match_vacancy_text / match_vacancy_with_llm.
+    Returns None for empty text (the match functions handle that case).
+    """
+    if not vacancy_text or not vacancy_text.strip():
+        return None
+    return await aget_query_embedding(clean_ocr_text(vacancy_text), executor=executor)
+
+
 def match_vacancy_file(
     vacancy_path: str | Path,
     top_n: int = 10,
     min_similarity: float = 0.0,
+    ef_search: int | None = None,
+    probes: int | None = None,
+    scoring: str | None = None,
 ) -> MatchResult:
     """
     Finds top-N resumes most similar to a vacancy from a file.
@@ -112,6 +335,9 @@ def match_vacancy_file(
         vacancy_path: Path to vacancy file (PDF, DOCX, TXT, etc.)
         top_n: Maximum number of results to return.
         min_similarity: Minimum similarity threshold (0.0 to 1.0).
+        ef_search: HNSW search breadth (see match_vacancy_text).
+        probes: IVFFlat lists to scan (see match_vacancy_text).
+        scoring: "document" or "max_chunk" (see match_vacancy_text).
 
     Returns:
         MatchResult with ranked candidates.
@@ -132,6 +358,9 @@ def match_vacancy_file(
         vacancy_text,
         top_n=top_n,
         min_similarity=min_similarity,
+        ef_search=ef_search,
+        probes=probes,
+        scoring=scoring,
     )
 
 
@@ -139,56 +368,142 @@ def _find_similar_resumes(
     vacancy_embedding: np.ndarray,
     top_n: int,
     min_similarity: float,
+    ef_search: int | None = None,
+    probes: int | None = None,
+    scoring: str | None = None,
+    tier: str | None = None,
 ) -> list[MatchedResume]:
     """
     Queries pgvector for resumes similar to the vacancy embedding.
 
     Uses cosine distance: 1 - cosine_similarity
     So we need to convert back: similarity = 1 - distance
-    
-    Deduplicates by file_hash to avoid showing multiple versions of the same resume.
+
+    Two-step search that keeps the vector index usable:
+    1. ANN scan (ORDER BY embedding <=> q LIMIT k) over-fetching top_n * ANN_OVERFETCH_FACTOR
+       rows, deduplicated by file_hash in Python (see _search_winners).
+    2. json_data is fetched only for the final winners.
+
+    Falls back to an exact scan when the ANN pass returns too few unique resumes.
+
+    ef_search / probes tune the HNSW / IVFFlat index for this query only
+    (SET LOCAL inside the query's transaction); defaults come from config.
+
+    scoring: "document" compares with the resume's (pooled) vector; "max_chunk"
+    scores each resume by its most similar chunk in resume_chunks (resumes
+    imported with EMBEDDING_CHUNKING). Defaults to MATCH_SCORING.
+
+    tier: index tier for document scoring (full, halfvec or coarse, see
+    db.VECTOR_SEARCH_TIERS). Defaults to VECTOR_SEARCH_TIER.
+
+    With SEARCH_BACKEND=numpy, document scoring is answered by the in-process
+    VectorIndex instead (exact, no pgvector round trip); only the details of
+    the winners are read from the database.
     """
-    # pgvector's <=> operator returns cosine distance (0 = identical, 2 = opposite)
-    # similarity = 1 - distance (for normalized vectors)
-    # We filter where distance <= (1 - min_similarity)
-    max_distance = 1.0 - min_similarity
+    use_vector_index = SEARCH_BACKEND == "numpy" and (scoring or MATCH_SCORING) == "document"
+    if use_vector_index:
+        from resume_matcher.services.vector_index import get_vector_index
+
+        winners = [
+            {"id": resume_id, "distance": 1.0 - similarity}
+            for resume_id, similarity in get_vector_index().search(
+                vacancy_embedding, top_n=top_n, min_similarity=min_similarity
+            )
+        ]
+        if not winners:
+            return []
+
+    with get_connection() as conn, conn.transaction(), conn.cursor() as cur:
+        if not use_vector_index:
+            winners = _search_winners(
+                cur,
+                vacancy_embedding,
+                top_n=top_n,
+                min_similarity=min_similarity,
+                ef_search=ef_search,
+                probes=probes,
+                scoring=scoring,
+                tier=tier,
+            )
 
-    with get_connection() as conn, conn.cursor() as cur:
-        # Query using pgvector cosine distance operator <=>
-        # Uses DISTINCT ON (file_hash) to deduplicate identical content
-        # Keeps the most recently updated version of each unique resume
-        cur.execute(
-            """
-            SELECT DISTINCT ON (file_hash)
-                id,
-                file_name,
-                file_path,
-                file_hash,
-                json_data,
-                1 - (embedding <=> %s::vector) AS similarity
-            FROM resumes
-            WHERE embedding IS NOT NULL
-              AND (embedding <=> %s::vector) <= %s
-            ORDER BY file_hash, updated_at DESC
-            """,
-            (
-                vacancy_embedding.tolist(),
-                vacancy_embedding.tolist(),
-                max_distance,
-            ),
+            if not winners:
+                return []
+
+        return _load_matches(cur, winners)
+
+
+async def _afind_similar_resumes(
+    vacancy_embedding: np.ndarray,
+    top_n: int,
+    min_similarity: float,
+    ef_search: int | None = None,
+    probes: int | None = None,
+    scoring: str | None = None,
+    tier: str | None = None,
+) -> list[MatchedResume]:
+    """Async _find_similar_resumes (same plan, queries and dedup)"""
+    if SEARCH_BACKEND == "numpy" and (scoring or MATCH_SCORING) == "document":
+        # In-process and CPU-bound: keep it off the event loop
+        return await asyncio.to_thread(
+            _find_similar_resumes,
+            vacancy_embedding,
+            top_n,
+            min_similarity,
+            ef_search,
+            probes,
+            scoring,
+            tier,
         )
-        
-        # Fetch all deduplicated rows, then sort by similarity and limit
-        all_rows = cur.fetchall()
-        rows = sorted(all_rows, key=lambda r: r["similarity"], reverse=True)[:top_n]
+
+    plan = _plan_search(vacancy_embedding, top_n, min_similarity, ef_search, probes, scoring, tier)
+    async with adb.get_async_connection() as conn, conn.transaction(), conn.cursor() as cur:
+        await cur.execute(_SEARCH_SETTINGS_QUERY, plan.settings)
+        await cur.execute(plan.query, plan.params)
+        ann_rows = await cur.fetchall()
+        winners = _dedupe_by_hash(ann_rows, top_n=top_n, max_distance=plan.max_distance)
+
+        if _needs_exact_fallback(ann_rows, winners, top_n, plan.ann_limit, plan.max_distance):
+            logger.info(
+                f"ANN pass returned {len(winners)} unique resumes (< {top_n}), "
+                "falling back to exact scan"
+            )
+            await cur.execute(plan.exact_query, plan.exact_params)
+            winners = await cur.fetchall()
+
+        if not winners:
+            return []
+
+        await cur.execute(_DETAILS_QUERY, ([w["id"] for w in winners],))
+        return _to_matches(winners, await cur.fetchall())
+
+
+def _load_matches(cur: psycopg.Cursor, winners: list[dict[str, Any]]) -> list[MatchedResume]:
+    """
+    MatchedResume for each winner ({"id", "distance"}), in winner order.
+
+    The heavy columns are fetched only for the resumes that made the cut;
+    winners deleted in the meantime are skipped.
+    """
+    cur.execute(_DETAILS_QUERY, ([w["id"] for w in winners],))
+    return _to_matches(winners, cur.fetchall())
+
+
+_DETAILS_QUERY = "SELECT id, file_name, file_path, json_data FROM resumes WHERE id = ANY(%s)"
+
+
+def _to_matches(winners: list[dict[str, Any]], rows: list[dict[str, Any]]) -> list[MatchedResume]:
+    details = {row["id"]: row for row in rows}
 
     matches = []
-    for row in rows:
+    for winner in winners:
+        row = details.get(winner["id"])
+        if row is None:
+            # Deleted between the two queries
+            continue
+
         # Parse json_data if it's a string
         json_data = row["json_data"]
         if isinstance(json_data, str):
-            import json
-
             try:
                 json_data = json.loads(json_data)
             except json.JSONDecodeError:
@@ -199,7 +514,7 @@ def _find_similar_resumes(
                 id=row["id"],
                 file_name=row["file_name"],
                 file_path=row["file_path"],
-                similarity_score=float(row["similarity"]),
+                similarity_score=1.0 - float(winner["distance"]),
                 json_data=json_data or {},
             )
         )
@@ -207,12 +522,214 @@ def _find_similar_resumes(
     return matches
 
 
-def _get_total_resume_count() -> int:
-    """Returns total number of resumes in the database."""
+def _search_winners(
+    cur: psycopg.Cursor,
+    vacancy_embedding: np.ndarray,
+    top_n: int,
+    min_similarity: float,
+    ef_search: int | None = None,
+    probes: int | None = None,
+    scoring: str | None = None,
+    tier: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Ranked (id, file_hash, distance) rows of the top_n resumes, deduplicated by
+    file_hash. Must run inside a transaction (the index settings are SET LOCAL).
+    """
+    plan = _plan_search(vacancy_embedding, top_n, min_similarity, ef_search, probes, scoring, tier)
+    cur.execute(_SEARCH_SETTINGS_QUERY, plan.settings)
+    cur.execute(plan.query, plan.params)
+    ann_rows = cur.fetchall()
+    winners = _dedupe_by_hash(ann_rows, top_n=top_n, max_distance=plan.max_distance)
+
+    if _needs_exact_fallback(ann_rows, winners, top_n, plan.ann_limit, plan.max_distance):
+        logger.info(
+            f"ANN pass returned {len(winners)} unique resumes (< {top_n}), "
+            "falling back to exact scan"
+        )
+        cur.execute(plan.exact_query, plan.exact_params)
+        winners = cur.fetchall()
+
+    return winners
+
+
+_SEARCH_SETTINGS_QUERY = (
+    "SELECT set_config('hnsw.ef_search', %s, true), set_config('ivfflat.probes', %s, true)"
+)
+
+
+@dataclass
+class _SearchPlan:
+    """Queries of one similarity search, shared by the sync and async paths"""
+
+    settings: tuple[str, str]  # hnsw.ef_search, ivfflat.probes (SET LOCAL)
+    query: str
+    params: dict[str, Any]
+    ann_limit: int
+    max_distance: float
+    exact_query: str
+    exact_params: dict[str, Any]
+
+
+def _plan_search(
+    vacancy_embedding: np.ndarray,
+    top_n: int,
+    min_similarity: float,
+    ef_search: int | None = None,
+    probes: int | None = None,
+    scoring: str | None = None,
+    tier: str | None = None,
+) -> _SearchPlan:
+    scoring = scoring or MATCH_SCORING
+    if scoring not in SCORING_MODES:
+        raise ValueError(f"Unknown scoring {scoring!r}, expected one of {SCORING_MODES}")
+    tier = tier or VECTOR_SEARCH_TIER
+    if tier not in VECTOR_SEARCH_TIERS:
+        raise ValueError(f"Unknown search tier {tier!r}, expected one of {VECTOR_SEARCH_TIERS}")
+
+    # pgvector's <=> operator returns cosine distance (0 = identical, 2 = opposite)
+    # similarity = 1 - distance (for normalized vectors)
+    # We filter where distance <= (1 - min_similarity)
+    max_distance = 1.0 - min_similarity
+    query_vector = vacancy_embedding.tolist()
+    ann_limit = max(top_n * ANN_OVERFETCH_FACTOR, top_n + ANN_OVERFETCH_MIN)
+    index_limit = ann_limit
+    if scoring == "max_chunk":
+        ann_limit = index_limit = ann_limit * CHUNK_OVERFETCH_FACTOR
+        query = _ANN_QUERIES["max_chunk"]
+    elif tier == "full":
+        query = _ANN_QUERIES["document"]
+    else:
+        # Reduced-precision candidates, rescored on the full vectors
+        index_limit = ann_limit * COARSE_OVERFETCH_FACTOR
+        query = _RESCORE_QUERY.format(
+            indexed=vector_expression(tier),
+            query=vector_expression(tier, "%(q)s::vector"),
+        )
+
+    # HNSW returns at most ef_search rows, so never let it cut the over-fetch short
+    ef_search = min(max(ef_search or HNSW_EF_SEARCH, index_limit), HNSW_EF_SEARCH_MAX)
+    probes = probes or IVFFLAT_PROBES
+
+    return _SearchPlan(
+        settings=(str(ef_search), str(probes)),
+        query=query,
+        params={"q": query_vector, "limit": ann_limit, "candidates": index_limit},
+        ann_limit=ann_limit,
+        max_distance=max_distance,
+        exact_query=_EXACT_QUERIES[scoring],
+        exact_params={"q": query_vector, "max_distance": max_distance, "top_n": top_n},
+    )
+
+
+def _dedupe_by_hash(
+    rows: list[dict[str, Any]],
+    top_n: int,
+    max_distance: float,
+) -> list[dict[str, Any]]:
+    """
+    Deduplicates ANN rows (ordered by distance) by file_hash.
+
+    Identical content has identical embeddings, so copies share a distance;
+    among them the most recently updated version wins, as in the exact scan.
+    With chunk rows, the first (nearest) row of a resume carries its best chunk.
+    """
+    best: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        if row["distance"] > max_distance:
+            continue
+        current = best.get(row["file_hash"])
+        if current is None or row["updated_at"] > current["updated_at"]:
+            best[row["file_hash"]] = row
+
+    return sorted(best.values(), key=lambda r: r["distance"])[:top_n]
+
+
+def _needs_exact_fallback(
+    ann_rows: list[dict[str, Any]],
+    winners: list[dict[str, Any]],
+    top_n: int,
+    ann_limit: int,
+    max_distance: float,
+) -> bool:
+    """
+    Decides whether the ANN pass may have missed qualifying resumes.
+
+    Not needed when we already have top_n unique winners, or when the ANN scan
+    returned a full page whose tail is already beyond the similarity threshold.
+    A short page is not conclusive: approximate indexes can return fewer rows
+    than LIMIT (ivfflat with few probes, hnsw with ef_search below LIMIT).
+    """
+    if len(winners) >= top_n:
+        return False
+    return not (len(ann_rows) == ann_limit and ann_rows[-1]["distance"] > max_distance)
+
+
+def benchmark_search_recall(
+    tier: str | None = None,
+    k: int = 10,
+    queries: int = 50,
+    ef_search: int | None = None,
+    probes: int | None = None,
+) -> dict[str, Any]:
+    """
+    recall@k of a search tier (document scoring) against the exact scan.
+
+    Stored resume embeddings serve as queries. Reports the mean / min recall
+    and the average and p95 latency of the tier search and of the exact scan.
+    """
+    from resume_matcher.db import sample_resume_embeddings
+
+    tier = tier or VECTOR_SEARCH_TIER
+    recalls: list[float] = []
+    tier_ms: list[float] = []
+    exact_ms: list[float] = []
+
     with get_connection() as conn, conn.cursor() as cur:
-        cur.execute("SELECT COUNT(*) as count FROM resumes WHERE embedding IS NOT NULL")
-        result = cur.fetchone()
-        return int(result["count"]) if result else 0
+        for vector in sample_resume_embeddings(queries):
+            with conn.transaction():
+                started = time.perf_counter()
+                cur.execute(
+                    _EXACT_QUERIES["document"],
+                    {"q": vector.tolist(), "max_distance": 2.0, "top_n": k},
+                )
+                expected = {row["id"] for row in cur.fetchall()}
+                exact_ms.append((time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                winners = _search_winners(
+                    cur,
+                    vector,
+                    top_n=k,
+                    min_similarity=-1.0,
+                    ef_search=ef_search,
+                    probes=probes,
+                    scoring="document",
+                    tier=tier,
+                )
+                tier_ms.append((time.perf_counter() - started) * 1000)
+
+            if expected:
+                recalls.append(len(expected & {w["id"] for w in winners}) / len(expected))
+
+    if not recalls:
+        return {"tier": tier, "k": k, "queries": 0}
+
+    return {
+        "tier": tier,
+        "k": k,
+        "queries": len(recalls),
+        "recall_at_k": round(float(np.mean(recalls)), 4),
+        "min_recall": round(float(np.min(recalls)), 4),
+        "tier_ms_avg": round(float(np.mean(tier_ms)), 2),
+        "tier_ms_p95": round(float(np.percentile(tier_ms, 95)), 2),
+        "exact_ms_avg": round(float(np.mean(exact_ms)), 2),
+    }
+
+
+def _get_total_resume_count() -> int:
+    """Returns the number of searchable (embedded) resumes, from the cached counts."""
+    return get_resume_counts()["with_embeddings"]
 
 
 def print_match_results(result: MatchResult) -> None:
@@ -248,12 +765,47 @@ def print_match_results(result: MatchResult) -> None:
 # ============================================================================
 
 
+def start_vacancy_parse(
+    vacancy_text: str, timings: StageTimings | None = None
+) -> Future[VacancyRequirements]:
+    """
+    Launches the LLM vacancy parse of stage 2 without waiting for it, so it runs
+    while stage 1 embeds and searches. Its duration is recorded in timings
+    before the returned future resolves.
+    """
+    from resume_matcher.models.llm_scorer import start_parse_vacancy
+
+    started = time.perf_counter()
+    parsed = start_parse_vacancy(clean_ocr_text(vacancy_text))
+    if timings is None:
+        return parsed
+
+    timed: Future[VacancyRequirements] = Future()
+
+    def record(done: Future[VacancyRequirements]) -> None:
+        timings.parse_vacancy = time.perf_counter() - started
+        if done.exception() is not None:
+            timed.set_exception(done.exception())
+        else:
+            timed.set_result(done.result())
+
+    parsed.add_done_callback(record)
+    return timed
+
+
 def match_vacancy_with_llm(
     vacancy_text: str,
     top_n: int = 10,
     embedding_candidates: int = 30,
     min_similarity: float = 0.0,
     lang: str = "en",
+    ef_search: int | None = None,
+    probes: int | None = None,
+    scoring: str | None = None,
+    vacancy_embedding: np.ndarray | None = None,
+    requirements_future: Future[VacancyRequirements] | None = None,
+    timings: StageTimings | None = None,
+    progress: Callable[[str, Any], None] | None = None,
 ) -> tuple[VacancyRequirements, list[CandidateScore]]:
     """
     Two-stage matching: embedding search + LLM re-ranking.
@@ -261,15 +813,28 @@ def match_vacancy_with_llm(
     Stage 1: Fast embedding search to get candidate pool
     Stage 2: LLM scores each candidate for role fit, skills, etc.
 
+    The vacancy parse that stage 2 needs is launched before stage 1 and runs
+    concurrently with it, so candidate scoring starts as soon as both are done.
+
     Args:
         vacancy_text: The vacancy/job description text.
         top_n: Final number of results after LLM re-ranking.
         embedding_candidates: Number of candidates from embedding search (should be > top_n).
         min_similarity: Minimum embedding similarity threshold.
+        ef_search: HNSW search breadth (see match_vacancy_text).
+        probes: IVFFlat lists to scan (see match_vacancy_text).
+        scoring: "document" or "max_chunk" (see match_vacancy_text).
+        vacancy_embedding: Precomputed embedding of the vacancy (see embed_vacancy_async).
+        requirements_future: Vacancy parse already launched by the caller (start_vacancy_parse).
+        timings: Filled with the stage timings (they are also logged).
+        progress: Called as results become available, in this order: ("shortlist",
+            list[MatchedResume]) after the search, ("vacancy", VacancyRequirements)
+            once parsed, then ("score", CandidateScore) per candidate as it is scored.
 
     Returns:
         Tuple of (VacancyRequirements, list of CandidateScore)
     """
+    from resume_matcher.models.llm_dispatch import get_llm_dispatcher
     from resume_matcher.models.llm_scorer import (
         VacancyRequirements,
         rerank_with_llm,
@@ -290,18 +855,34 @@ def match_vacancy_with_llm(
             summary="",
         ), []
 
-    # Stage 1: Get candidates from embedding search
+    if timings is None:
+        timings = StageTimings()
+    if requirements_future is None:
+        requirements_future = start_vacancy_parse(vacancy_text, timings)
+
+    # Stage 1: Get candidates from embedding search (the vacancy parse runs meanwhile)
     logger.info(f"Stage 1: Finding top {embedding_candidates} candidates via embedding search...")
     cleaned_vacancy = clean_ocr_text(vacancy_text)
-    vacancy_embedding = get_embedding(cleaned_vacancy)
+    if vacancy_embedding is None:
+        started = time.perf_counter()
+        vacancy_embedding = get_query_embedding(cleaned_vacancy)
+        timings.embedding = time.perf_counter() - started
 
+    started = time.perf_counter()
     matches = _find_similar_resumes(
         vacancy_embedding,
         top_n=embedding_candidates,
         min_similarity=min_similarity,
+        ef_search=ef_search,
+        probes=probes,
+        scoring=scoring,
     )
+    timings.search = time.perf_counter() - started
+    if progress is not None:
+        progress("shortlist", matches)
 
     if not matches:
+        # The vacancy parse is left to finish: its answer is stored in the LLM cache
         logger.warning("No candidates found in embedding search")
         return VacancyRequirements(
             job_title="Unknown",
@@ -328,14 +909,29 @@ def match_vacancy_with_llm(
         for m in matches
     ]
 
+    # Bounded by the dispatcher's retry budget, so a lost parse can't hold an llm worker
+    timeout = get_llm_dispatcher().completion_timeout()
+    try:
+        requirements = requirements_future.result(timeout=timeout)
+    except TimeoutError:
+        raise TimeoutError(f"Vacancy parsing did not finish within {timeout:.0f}s") from None
+    if progress is not None:
+        progress("vacancy", requirements)
+
     # Stage 2: Re-rank with LLM
     logger.info(f"Stage 2: Re-ranking {len(candidates)} candidates with LLM (lang={lang})...")
+    started = time.perf_counter()
     requirements, scores = rerank_with_llm(
         vacancy_text=cleaned_vacancy,
         candidates=candidates,
         top_n=top_n,
         lang=lang,
+        requirements=requirements,
+        on_score=None if progress is None else lambda score: progress("score", score),
     )
+    timings.scoring = time.perf_counter() - started
+    timings.total = time.perf_counter() - timings.started
+    logger.info(f"LLM match stages: {timings.format()}")
 
     return requirements, scores
 
@@ -345,6 +941,10 @@ def match_vacancy_file_with_llm(
     top_n: int = 10,
     embedding_candidates: int = 30,
     min_similarity: float = 0.0,
+    ef_search: int | None = None,
+    probes: int | None = None,
+    scoring: str | None = None,
+    timings: StageTimings | None = None,
 ) -> tuple[VacancyRequirements, list[CandidateScore]]:
     """
     Two-stage matching from a vacancy file.
@@ -354,6 +954,10 @@ def match_vacancy_file_with_llm(
         top_n: Final number of results after LLM re-ranking.
         embedding_candidates: Number of candidates from embedding search.
         min_similarity: Minimum embedding similarity threshold.
+        ef_search: HNSW search breadth (see match_vacancy_text).
+        probes: IVFFlat lists to scan (see match_vacancy_text).
+        scoring: "document" or "max_chunk" (see match_vacancy_text).
+        timings: Filled with the stage timings (see match_vacancy_with_llm).
 
     Returns:
         Tuple of (VacancyRequirements, list of CandidateScore)
@@ -399,4 +1003,8 @@ def match_vacancy_file_with_llm(
         top_n=top_n,
         embedding_candidates=embedding_candidates,
         min_similarity=min_similarity,
+        ef_search=ef_search,
+        probes=probes,
+        scoring=scoring,
+        timings=timings,
     )
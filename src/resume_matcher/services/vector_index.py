@@ -0,0 +1,289 @@
+# src/resume_matcher/services/vector_index.py
+"""
+In-process exact vector index (SEARCH_BACKEND=numpy).
+
+For small and mid-sized corpora a brute-force dot product over an in-memory
+matrix is cheaper than a pgvector round trip. VectorIndex keeps every resume
+embedding in one contiguous float32 matrix, answers top-K queries with
+np.argpartition and refreshes incrementally from rows changed since its
+updated_at watermark.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from resume_matcher.config import VECTOR_INDEX_PATH, VECTOR_INDEX_REFRESH_SECONDS
+from resume_matcher.db import VECTOR_DIMENSIONS, get_connection
+
+logger = logging.getLogger(__name__)
+
+# Rows are stamped with the start time of their transaction (NOW()), so a write that
+# commits after a refresh can carry an updated_at older than the watermark; re-reading
+# a short window behind it catches those rows (upserts are idempotent).
+WATERMARK_OVERLAP = timedelta(seconds=60)
+
+
+class VectorIndex:
+    """
+    Exact cosine index over resumes.embedding.
+
+    Embeddings are L2-normalized rows of one contiguous float32 matrix (grown by
+    doubling), next to the id, file_hash and updated_at of each resume. Copies of
+    the same content are collapsed to the most recently updated one, as in the
+    SQL search. Searches never block on a refresh.
+
+    Usage:
+        index = VectorIndex()
+        index.refresh()
+        index.search(query_vector, top_n=10)  # -> [(resume_id, similarity), ...]
+    """
+
+    def __init__(self, dimension: int = VECTOR_DIMENSIONS):
+        self._lock = threading.Lock()
+        self._matrix = np.empty((0, dimension), dtype=np.float32)
+        self._size = 0
+        self._ids = np.empty(0, dtype=np.int64)
+        self._hash_codes = np.empty(0, dtype=np.int64)
+        self._updated = np.empty(0, dtype=np.int64)  # updated_at, µs since epoch
+        self._canonical = np.empty(0, dtype=bool)  # latest row of its file_hash
+        self._rows: dict[int, int] = {}  # resume id -> row
+        self._codes: dict[str, int] = {}  # file_hash -> code
+        # What searches read: (matrix, size, ids, canonical), published after each refresh
+        self._view = (self._matrix, 0, self._ids, self._canonical)
+        self.watermark: datetime | None = None
+        self.last_refresh = 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    # ─── Search ──────────────────────────────────────────────────────────────
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_n: int,
+        min_similarity: float = 0.0,
+    ) -> list[tuple[int, float]]:
+        """(resume_id, cosine similarity) of the top_n most similar resumes"""
+        matrix, size, ids, canonical = self._view
+        if size == 0 or top_n <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+
+        scores = matrix[:size] @ (query / norm)
+        scores[~canonical[:size]] = -np.inf
+
+        k = min(top_n, size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (int(ids[i]), float(scores[i]))
+            for i in top
+            if np.isfinite(scores[i]) and scores[i] >= min_similarity
+        ]
+
+    # ─── Refresh ─────────────────────────────────────────────────────────────
+
+    def maybe_refresh(self, max_age: float = VECTOR_INDEX_REFRESH_SECONDS) -> None:
+        """
+        Refreshes if the last refresh is older than max_age seconds. The first
+        load blocks; later ones are skipped while another thread is refreshing.
+        """
+        if time.monotonic() - self.last_refresh < max_age:
+            return
+        if self.watermark is None:
+            self.refresh()
+        elif self._lock.acquire(blocking=False):
+            try:
+                self._refresh_locked()
+            finally:
+                self._lock.release()
+
+    def refresh(self) -> int:
+        """Loads rows changed since the watermark and drops deleted ones; returns rows loaded"""
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> int:
+        started = time.perf_counter()
+        with get_connection() as conn, conn.cursor() as cur:
+            if self.watermark is None:
+                cur.execute(
+                    """
+                    SELECT id, file_hash, updated_at, embedding
+                    FROM resumes
+                    WHERE embedding IS NOT NULL
+                    """
+                )
+            else:
+                cur.execute(
+                    """
+                    SELECT id, file_hash, updated_at, embedding
+                    FROM resumes
+                    WHERE embedding IS NOT NULL AND updated_at >= %s
+                    """,
+                    (self.watermark - WATERMARK_OVERLAP,),
+                )
+            rows = cur.fetchall()
+
+            cur.execute("SELECT COUNT(*) AS count FROM resumes WHERE embedding IS NOT NULL")
+            total = cur.fetchone()["count"]
+
+            self._upsert(rows)
+            removed = 0
+            if total != self._size:
+                cur.execute("SELECT id FROM resumes WHERE embedding IS NOT NULL")
+                removed = self._retain({row["id"] for row in cur.fetchall()})
+
+        self._update_canonical()
+        self.last_refresh = time.monotonic()
+        if rows or removed:
+            logger.info(
+                f"Vector index refreshed: {len(rows)} rows loaded, {removed} removed, "
+                f"{self._size} total ({time.perf_counter() - started:.2f}s)"
+            )
+        return len(rows)
+
+    def _upsert(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+
+        new = [row for row in rows if row["id"] not in self._rows]
+        needed = self._size + len(new)
+        if needed > len(self._matrix) or not self._matrix.flags.writeable:
+            self._grow(max(needed, 2 * len(self._matrix)))
+        elif len(new) < len(rows):
+            # Copy on write: updated rows may be read by a search of the published view.
+            # Appends alone are safe in place, they lie past the published size.
+            self._grow(len(self._matrix))
+
+        for row in rows:
+            index = self._rows.get(row["id"])
+            if index is None:
+                index = self._size
+                self._rows[row["id"]] = index
+                self._size += 1
+
+            vector = np.asarray(row["embedding"], dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            self._matrix[index] = vector / norm if norm else vector
+            self._ids[index] = row["id"]
+            self._hash_codes[index] = self._codes.setdefault(row["file_hash"], len(self._codes))
+            self._updated[index] = _to_micros(row["updated_at"])
+
+            if self.watermark is None or row["updated_at"] > self.watermark:
+                self.watermark = row["updated_at"]
+
+    def _grow(self, capacity: int) -> None:
+        # New arrays (not in-place resize, also used to copy at the same capacity):
+        # searches keep reading the published view
+        def grown(array: np.ndarray) -> np.ndarray:
+            out = np.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+            out[: self._size] = array[: self._size]
+            return out
+
+        self._matrix = grown(self._matrix)
+        self._ids = grown(self._ids)
+        self._hash_codes = grown(self._hash_codes)
+        self._updated = grown(self._updated)
+
+    def _retain(self, live_ids: set[int]) -> int:
+        """Drops rows whose resume no longer exists; returns how many"""
+        keep = np.fromiter(
+            (int(i) in live_ids for i in self._ids[: self._size]), dtype=bool, count=self._size
+        )
+        removed = int(self._size - keep.sum())
+        if removed:
+            self._matrix = np.ascontiguousarray(self._matrix[: self._size][keep])
+            self._ids = self._ids[: self._size][keep]
+            self._hash_codes = self._hash_codes[: self._size][keep]
+            self._updated = self._updated[: self._size][keep]
+            self._size = len(self._ids)
+            self._rows = {int(i): row for row, i in enumerate(self._ids)}
+        return removed
+
+    def _update_canonical(self) -> None:
+        """Marks the most recently updated row of every file_hash"""
+        size = self._size
+        canonical = np.zeros(len(self._ids), dtype=bool)
+        if size:
+            order = np.lexsort((self._updated[:size], self._hash_codes[:size]))
+            codes = self._hash_codes[:size][order]
+            last_of_group = np.append(codes[1:] != codes[:-1], True)
+            canonical[order[last_of_group]] = True
+        self._canonical = canonical
+        self._view = (self._matrix, size, self._ids, canonical)
+
+    # ─── Persistence ─────────────────────────────────────────────────────────
+
+    def save(self, path: Path) -> None:
+        """Writes the index to path (matrix.npy can be memory-mapped by load)"""
+        path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            size = self._size
+            np.save(path / "matrix.npy", self._matrix[:size])
+            hashes = sorted(self._codes, key=self._codes.get)
+            np.savez(
+                path / "meta.npz",
+                ids=self._ids[:size],
+                hash_codes=self._hash_codes[:size],
+                updated=self._updated[:size],
+                hashes=np.array(hashes, dtype=str),
+                watermark=np.array(self.watermark.isoformat() if self.watermark else ""),
+            )
+        logger.info(f"Vector index saved: {size} rows in {path}")
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> VectorIndex:
+        """Loads an index written by save(); with mmap the matrix is read lazily from disk"""
+        matrix = np.load(path / "matrix.npy", mmap_mode="r" if mmap else None)
+        meta = np.load(path / "meta.npz")
+
+        index = cls(dimension=matrix.shape[1])
+        index._matrix = matrix
+        index._size = len(matrix)
+        index._ids = meta["ids"]
+        index._hash_codes = meta["hash_codes"]
+        index._updated = meta["updated"]
+        index._rows = {int(i): row for row, i in enumerate(index._ids)}
+        index._codes = {str(h): code for code, h in enumerate(meta["hashes"])}
+        watermark = str(meta["watermark"])
+        index.watermark = datetime.fromisoformat(watermark) if watermark else None
+        index._update_canonical()
+        return index
+
+
+def _to_micros(value: datetime) -> int:
+    return int(value.timestamp() * 1_000_000)
+
+
+_index: VectorIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_vector_index() -> VectorIndex:
+    """
+    Returns the process-wide VectorIndex, refreshed if older than
+    VECTOR_INDEX_REFRESH_SECONDS. Starts from VECTOR_INDEX_PATH when set and present.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                if VECTOR_INDEX_PATH and (VECTOR_INDEX_PATH / "matrix.npy").exists():
+                    _index = VectorIndex.load(VECTOR_INDEX_PATH)
+                else:
+                    _index = VectorIndex()
+    _index.maybe_refresh()
+    return _index
@@ -21,7 +21,7 @@ import logging
 import re
 from typing import Any
 
-from ..config import KNOWN_OCCUPATIONS, KNOWN_SKILLS, OCCUPATION_NORMALIZED
+from ..config import KNOWN_OCCUPATIONS, KNOWN_SKILLS, OCCUPATION_NORMALIZED, load_taxonomy
 
 logger = logging.getLogger(__name__)
 
@@ -178,6 +178,7 @@ def extract_location(text: str) -> str | None:
 
 def extract_position(text: str) -> str | None:
     """Searches for position, using ESCO taxonomy"""
+    load_taxonomy()
     lines = [line.strip() for line in text.splitlines()[:20] if line.strip()]
 
     for line in lines:
@@ -203,6 +204,7 @@ def extract_position(text: str) -> str | None:
 
 def extract_skills(text: str) -> list[str]:
     """Searches for skills, using ESCO skills"""
+    load_taxonomy()
     skills_found = set()
 
     # Looking for the Skills / Technical Skills section, etc.
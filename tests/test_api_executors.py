@@ -0,0 +1,37 @@
+# tests/test_api_executors.py
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from resume_matcher.api.executors import executor_stats, run_blocking, shutdown_executors
+
+
+def test_saturated_kind_does_not_block_other_kinds_or_the_loop():
+    release = threading.Event()
+
+    async def scenario():
+        slow = asyncio.create_task(run_blocking("llm", release.wait, 5))
+        await asyncio.sleep(0.05)
+        assert executor_stats()["llm"]["in_flight"] == 1
+
+        started = time.perf_counter()
+        assert await run_blocking("embedding", sum, [1, 2, 3]) == 6
+        assert time.perf_counter() - started < 1
+
+        release.set()
+        assert await slow is True
+        assert executor_stats()["llm"]["in_flight"] == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        shutdown_executors()
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(run_blocking("gpu", sum, [1]))
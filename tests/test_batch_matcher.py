@@ -0,0 +1,33 @@
+# tests/test_batch_matcher.py
+
+import numpy as np
+
+from resume_matcher.services.batch_matcher import merge_top_k
+
+
+def _empty(n_vacancies):
+    return np.empty((n_vacancies, 0), dtype=np.float32), np.empty((n_vacancies, 0), dtype=np.int64)
+
+
+def test_merge_top_k_matches_full_sort_across_blocks():
+    rng = np.random.default_rng(0)
+    scores = rng.random((3, 50)).astype(np.float32)
+    ids = np.arange(100, 150)
+
+    best_scores, best_ids = _empty(3)
+    for start in range(0, 50, 16):
+        best_scores, best_ids = merge_top_k(
+            best_scores, best_ids, scores[:, start : start + 16], ids[start : start + 16], 5
+        )
+
+    expected = np.argsort(-scores, axis=1)[:, :5]
+    assert best_ids.tolist() == ids[expected].tolist()
+    assert np.allclose(best_scores, np.take_along_axis(scores, expected, axis=1))
+
+
+def test_merge_top_k_with_fewer_rows_than_k():
+    best_scores, best_ids = merge_top_k(
+        *_empty(2), np.array([[0.1, 0.9], [0.8, 0.2]]), np.array([7, 8]), 10
+    )
+    assert best_ids.tolist() == [[8, 7], [7, 8]]
+    assert best_scores.shape == (2, 2)
@@ -0,0 +1,61 @@
+# tests/test_chunking.py
+
+import re
+
+import numpy as np
+import pytest
+
+from resume_matcher.models import embedding
+from resume_matcher.models.embedding_cache import EmbeddingShardCache
+
+
+class _WordModel:
+    """One token per word; a chunk embeds as [word count, 1]"""
+
+    max_seq_length = 6  # 4 content tokens per window
+
+    def tokenizer(self, texts, return_offsets_mapping=False, **kwargs):
+        if isinstance(texts, str):
+            offsets = [m.span() for m in re.finditer(r"\S+", texts)]
+            return {"offset_mapping": offsets, "input_ids": [0] * len(offsets)}
+        return {"input_ids": [[0] * (len(t.split()) + 2) for t in texts]}
+
+    def get_sentence_embedding_dimension(self):
+        return 2
+
+    def encode(self, texts, normalize_embeddings=True, **kwargs):
+        return np.array([[len(t.split()), 1.0] for t in texts])
+
+
+@pytest.fixture
+def word_model(monkeypatch, tmp_path):
+    monkeypatch.setattr(embedding, "_model", _WordModel())
+    monkeypatch.setattr(embedding, "_cache", EmbeddingShardCache(tmp_path))
+    monkeypatch.setattr(embedding, "EMBEDDING_CHUNK_OVERLAP", 0)
+
+
+def test_chunk_windows_overlap_and_cover():
+    assert embedding.chunk_windows(0, 4, 1) == []
+    assert embedding.chunk_windows(3, 4, 1) == [(0, 3)]
+    assert embedding.chunk_windows(10, 4, 1) == [(0, 4), (3, 7), (6, 10)]
+
+
+def test_split_into_chunks_returns_character_spans(word_model):
+    text = "one two three four five six"
+    spans = embedding.split_into_chunks(text, overlap=1)
+    assert [text[a:b] for a, b in spans] == ["one two three four", "four five six"]
+
+
+def test_chunked_embeddings_pool_and_keep_chunks(word_model):
+    short, long = "just two", "a b c d e f g"
+    results = embedding.get_or_compute_chunked_embeddings([short, long], normalize=False)
+
+    assert len(results[0].spans) == 1
+    np.testing.assert_allclose(results[0].vector, [2.0, 1.0])
+
+    chunked = results[1]
+    assert [long[a:b] for a, b in chunked.spans] == ["a b c d", "e f g"]
+    assert chunked.chunk_vectors.shape == (2, 2)
+    # Length-weighted mean of [4, 1] (7 chars) and [3, 1] (5 chars)
+    np.testing.assert_allclose(chunked.vector, [(4 * 7 + 3 * 5) / 12, 1.0], rtol=1e-6)
+    assert [(a, b) for a, b, _ in chunked.chunk_records()] == chunked.spans
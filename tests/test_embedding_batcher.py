@@ -0,0 +1,91 @@
+# tests/test_embedding_batcher.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from resume_matcher.models import embedding
+
+
+class _FakeModel:
+    """Encodes a text as [len(text), normalize flag] and records batch sizes"""
+
+    def __init__(self):
+        self.batch_sizes: list[int] = []
+
+    def encode(self, texts, normalize_embeddings=True, batch_size=32, show_progress_bar=False):
+        self.batch_sizes.append(len(texts))
+        return np.array([[len(t), float(normalize_embeddings)] for t in texts], dtype=np.float64)
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    model = _FakeModel()
+    monkeypatch.setattr(embedding, "_model", model)
+    return model
+
+
+def test_concurrent_requests_share_a_forward_pass(fake_model):
+    batcher = embedding.EmbeddingBatcher(max_batch_size=64, max_wait_ms=200)
+    texts = ["a" * i for i in range(1, 17)]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda t: batcher.submit(t).result(timeout=5), texts))
+    batcher.close()
+
+    for text, emb in zip(texts, results, strict=True):
+        assert emb.dtype == np.float32
+        assert emb[0] == len(text)
+    assert sum(fake_model.batch_sizes) == 16
+    assert len(fake_model.batch_sizes) < 16
+
+
+def test_normalize_flag_is_kept_per_request(fake_model):
+    batcher = embedding.EmbeddingBatcher(max_batch_size=8, max_wait_ms=50)
+    normalized = batcher.submit("abc", normalize=True)
+    raw = batcher.submit("abcd", normalize=False)
+    assert normalized.result(timeout=5).tolist() == [3.0, 1.0]
+    assert raw.result(timeout=5).tolist() == [4.0, 0.0]
+    batcher.close()
+
+
+def test_async_callers_await_the_future(fake_model):
+    batcher = embedding.EmbeddingBatcher(max_batch_size=8, max_wait_ms=50)
+
+    async def run():
+        futures = [asyncio.wrap_future(batcher.submit(t)) for t in ("x", "yy", "zzz")]
+        return await asyncio.gather(*futures)
+
+    results = asyncio.run(run())
+    batcher.close()
+    assert [r[0] for r in results] == [1.0, 2.0, 3.0]
+    assert fake_model.batch_sizes == [3]
+
+
+def test_plan_token_batches_groups_similar_lengths():
+    lengths = [500, 20, 480, 30, 25, 510, 40]
+    batches = embedding.plan_token_batches(lengths, token_budget=1024, max_batch_size=8)
+
+    assert sorted(i for b in batches for i in b) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) * max(lengths[i] for i in batch) <= 1024
+    assert batches[0] == [5, 0]  # longest first
+    assert [lengths[i] for i in batches[-1]] == [30, 25, 20]  # one length bucket
+
+    fixed = [[0, 1, 2, 3], [4, 5, 6]]
+    assert embedding.padding_efficiency(lengths, batches) > embedding.padding_efficiency(
+        lengths, fixed
+    )
+
+
+def test_plan_token_batches_limits_and_oversized_texts():
+    assert embedding.plan_token_batches([10] * 5, token_budget=10_000, max_batch_size=2) == [
+        [0, 1],
+        [2, 3],
+        [4],
+    ]
+    assert embedding.plan_token_batches([600, 600], token_budget=512, max_batch_size=8) == [
+        [0],
+        [1],
+    ]
@@ -0,0 +1,82 @@
+# tests/test_embedding_cache.py
+
+import numpy as np
+import pytest
+
+from resume_matcher.models.embedding_cache import EmbeddingShardCache
+
+
+def _vectors(n: int, dim: int = 8) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(0)
+    return {f"key{i}": rng.random(dim, dtype=np.float32) for i in range(n)}
+
+
+def test_put_and_get_roundtrip(tmp_path):
+    cache = EmbeddingShardCache(tmp_path)
+    vectors = _vectors(5)
+    cache.put_many(vectors)
+
+    found = cache.get_many(list(vectors) + ["missing"])
+    assert set(found) == set(vectors)
+    for key, vec in vectors.items():
+        np.testing.assert_array_equal(found[key], vec)
+    assert cache.get("missing") is None
+
+
+def test_entries_survive_reopen_and_rollover(tmp_path):
+    cache = EmbeddingShardCache(tmp_path, shard_rows=3)
+    vectors = _vectors(7)
+    for key, vec in vectors.items():
+        cache.put(key, vec)
+
+    reopened = EmbeddingShardCache(tmp_path, shard_rows=3)
+    assert reopened.stats()["shards"] == 3
+    np.testing.assert_array_equal(reopened.get("key6"), vectors["key6"])
+
+    loaded = reopened.get_many(list(vectors))
+    assert set(loaded) == set(vectors)
+    for key, vec in vectors.items():
+        np.testing.assert_array_equal(loaded[key], vec)
+
+
+def test_float16_storage(tmp_path):
+    cache = EmbeddingShardCache(tmp_path, dtype="float16")
+    vec = _vectors(1)["key0"]
+    cache.put("key0", vec)
+
+    assert cache.get("key0").dtype == np.float32
+    np.testing.assert_allclose(cache.get("key0"), vec, atol=1e-3)
+    assert cache.stats()["disk_bytes"] == vec.size * 2
+
+
+def test_evict_and_compact(tmp_path):
+    cache = EmbeddingShardCache(tmp_path)
+    vectors = _vectors(10)
+    cache.put_many(vectors)
+    cache.get("key9")  # most recently used survives eviction
+
+    evicted = cache.evict(max_bytes=4 * 8 * 4)
+    assert evicted == 6
+    assert cache.stats()["reclaimable_bytes"] == 6 * 8 * 4
+
+    summary = cache.compact()
+    assert summary["entries"] == 4
+    assert summary["bytes_after"] == 4 * 8 * 4
+    np.testing.assert_array_equal(cache.get("key9"), vectors["key9"])
+    assert cache.stats()["reclaimable_bytes"] == 0
+
+
+def test_concurrent_first_writes_agree_on_dimension(tmp_path, monkeypatch):
+    first = EmbeddingShardCache(tmp_path)
+    second = EmbeddingShardCache(tmp_path)
+    first.put("a", np.ones(8, dtype=np.float32))
+
+    # second read the dimension before first stored it
+    dims = iter([None])
+    monkeypatch.setattr(second, "_dim", lambda: next(dims, 8))
+    second.put("b", np.zeros(8, dtype=np.float32))
+    assert first.stats()["entries"] == 2
+
+    dims = iter([None])
+    with pytest.raises(ValueError):
+        second.put("c", np.zeros(4, dtype=np.float32))
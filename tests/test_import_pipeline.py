@@ -0,0 +1,92 @@
+# tests/test_import_pipeline.py
+
+import threading
+
+import numpy as np
+import pytest
+
+from resume_matcher.services.importer import ImportPipeline
+
+
+class _FakePipeline(ImportPipeline):
+    """Pipeline with in-memory stages; files named in `fail` raise in the given stage"""
+
+    def __init__(self, fail=None, **kwargs):
+        super().__init__(extract_workers=1, llm_workers=2, batch_wait_seconds=0.01, **kwargs)
+        self.fail = fail or {}
+        self.stored: list[str] = []
+
+    def _check(self, stage, name):
+        if self.fail.get(name) == stage:
+            raise RuntimeError(f"{stage} broke")
+
+    def _hash(self, job):
+        job["file_hash"] = job["path"].name
+        return job
+
+    def _extract(self, job, pool):
+        self._check("extraction", job["path"].name)
+        job["raw_text"] = job["cleaned_text"] = job["path"].read_text()
+        return job
+
+    def _embed(self, batch):
+        for job in batch:
+            job["embedding"] = np.zeros(4, dtype=np.float32)
+
+    def _parse_with_llm(self, job):
+        job["json_data"] = {}
+        return job
+
+    def _store(self, batch):
+        for job in batch:
+            self._check("db_write", job["path"].name)
+            self.stored.append(job["path"].name)
+            job["result"]["stored"] = True
+            self._finish(job)
+
+
+@pytest.fixture
+def resumes_dir(tmp_path):
+    for name in ("a", "b", "c", "d"):
+        (tmp_path / f"{name}.txt").write_text(f"resume {name}")
+    return tmp_path
+
+
+def _run(pipeline, resumes_dir):
+    """Runs the pipeline in a thread so a hang fails the test instead of blocking it"""
+    reports = []
+    thread = threading.Thread(target=lambda: reports.append(pipeline.run(resumes_dir)))
+    thread.start()
+    thread.join(timeout=30)
+    assert not thread.is_alive(), "ImportPipeline.run() did not return"
+    return reports[0]
+
+
+def test_stage_failure_is_reported_once_and_the_rest_is_imported(resumes_dir):
+    pipeline = _FakePipeline(fail={"b.txt": "extraction"})
+    report = _run(pipeline, resumes_dir)
+
+    results = {r["file_name"]: r for r in report.results}
+    assert len(report.results) == 4
+    assert results["b.txt"]["error"] == "extraction failed: extraction broke"
+    assert sorted(pipeline.stored) == ["a.txt", "c.txt", "d.txt"]
+    assert {st.name: st.failed for st in report.stages}["extraction"] == 1
+
+
+def test_late_batch_failure_only_fails_unfinished_jobs(resumes_dir):
+    pipeline = _FakePipeline(fail={"c.txt": "db_write"}, db_batch_size=10)
+    report = _run(pipeline, resumes_dir)
+
+    # Jobs stored before c.txt keep their success; c.txt and the rest of its batch fail
+    errors = {r["file_name"] for r in report.results if "error" in r}
+    assert len(report.results) == 4
+    assert "c.txt" in errors
+    assert errors == {"a.txt", "b.txt", "c.txt", "d.txt"} - set(pipeline.stored)
+
+
+def test_raising_result_callback_does_not_hang_the_pipeline(resumes_dir):
+    def on_result(result):
+        raise RuntimeError("progress bar broke")
+
+    report = _run(_FakePipeline(on_result=on_result), resumes_dir)
+    assert len(report.results) == 4
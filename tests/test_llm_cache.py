@@ -0,0 +1,59 @@
+# tests/test_llm_cache.py
+
+import json
+
+import pytest
+
+from resume_matcher.models import llm_cache
+from resume_matcher.models.llm_cache import (
+    LLMResponseCache,
+    cached_json_completion,
+    llm_cache_key,
+)
+
+
+def test_key_depends_on_version_model_and_prompt():
+    base = llm_cache_key("score_candidate", "1", "model-a", "prompt")
+    assert base == llm_cache_key("score_candidate", "1", "model-a", "prompt")
+    assert base != llm_cache_key("score_candidate", "2", "model-a", "prompt")
+    assert base != llm_cache_key("score_candidate", "1", "model-b", "prompt")
+    assert base != llm_cache_key("parse_vacancy", "1", "model-a", "prompt")
+    assert base != llm_cache_key("score_candidate", "1", "model-a", "prompt!")
+
+
+def test_ttl_and_lru_eviction(tmp_path, monkeypatch):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite", ttl_seconds=60, max_entries=2)
+    clock = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: clock[0])
+
+    cache.put("a", "t", "A")
+    clock[0] += 1
+    cache.put("b", "t", "B")
+    clock[0] += 1
+    assert cache.get("a") == "A"  # a is now more recent than b
+    cache.put("c", "t", "C")
+    assert cache.evict() == 1
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+
+    clock[0] += 120
+    assert cache.get("c") is None  # expired
+    assert cache.stats()["hits"] == 2
+
+
+def test_cached_json_completion_stores_only_parsed_answers(tmp_path, monkeypatch):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite")
+    monkeypatch.setattr(llm_cache, "get_llm_cache", lambda: cache)
+    calls = []
+
+    def complete():
+        calls.append(1)
+        return '```json\n{"score": 80}\n```'
+
+    assert cached_json_completion("task", "1", "m", "p", complete) == ({"score": 80}, False)
+    assert cached_json_completion("task", "1", "m", "p", complete) == ({"score": 80}, True)
+    assert len(calls) == 1
+
+    with pytest.raises(json.JSONDecodeError):
+        cached_json_completion("task", "1", "m", "bad", lambda: "not json")
+    assert cache.get(llm_cache_key("task", "1", "m", "bad")) is None
@@ -0,0 +1,157 @@
+# tests/test_llm_dispatch.py
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from groq import BadRequestError, RateLimitError
+
+from resume_matcher.models import llm_dispatch
+from resume_matcher.models.llm_dispatch import (
+    AIMDLimiter,
+    LLMDispatcher,
+    TokenWindow,
+    parse_duration,
+)
+
+
+def _rate_limit_error(headers: dict[str, str]) -> RateLimitError:
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+class _FakeClient:
+    """AsyncGroq stand-in: fails with the queued errors first, then echoes the prompt"""
+
+    def __init__(self, errors=(), headers=None, delay=0.0):
+        self.errors = list(errors)
+        self.headers = headers or {}
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(with_raw_response=SimpleNamespace(create=self.create))
+        )
+
+    async def create(self, model, messages, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.errors:
+                raise self.errors.pop(0)
+            completion = SimpleNamespace(
+                usage=SimpleNamespace(total_tokens=42),
+                choices=[SimpleNamespace(message=SimpleNamespace(content=messages[0]["content"]))],
+            )
+            return SimpleNamespace(headers=self.headers, parse=lambda: completion)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(llm_dispatch, "BACKOFF_BASE", 0.0)
+
+
+def test_parse_duration():
+    assert parse_duration("7.66s") == pytest.approx(7.66)
+    assert parse_duration("2m59.56s") == pytest.approx(179.56)
+    assert parse_duration("120ms") == pytest.approx(0.12)
+    assert parse_duration("3") == 3.0
+    assert parse_duration("soon") is None
+    assert parse_duration(None) is None
+
+
+def test_token_window_waits_for_oldest_entries_to_expire():
+    window = TokenWindow(tokens_per_minute=1000)
+    assert window.wait_time(600, now=0.0) == 0.0
+    window.reserve(600, now=0.0)
+    window.reserve(300, now=10.0)
+    assert window.wait_time(100, now=20.0) == 0.0
+    # 500 tokens must expire: the first entry leaves the window at t=60
+    assert window.wait_time(600, now=20.0) == pytest.approx(40.0)
+    assert window.used(now=61.0) == 300
+
+
+def test_token_window_lets_oversized_request_through_when_empty():
+    assert TokenWindow(tokens_per_minute=100).wait_time(5000, now=0.0) == 0.0
+    assert TokenWindow(tokens_per_minute=0).wait_time(5000, now=0.0) == 0.0
+
+
+def test_aimd_limiter_grows_additively_and_halves_once_per_burst():
+    limiter = AIMDLimiter(initial=4, maximum=8)
+    for _ in range(4):
+        limiter.increase()
+    assert limiter.limit == pytest.approx(5.0, abs=0.1)
+
+    assert limiter.decrease(0.5, now=100.0)
+    assert not limiter.decrease(0.5, now=100.5)
+    assert limiter.limit == pytest.approx(2.5, abs=0.1)
+    assert limiter.slots == 2
+
+    for _ in range(200):
+        limiter.increase()
+    assert limiter.limit == 8
+
+
+def test_rate_limited_request_is_retried_and_shrinks_concurrency():
+    client = _FakeClient(errors=[_rate_limit_error({"retry-after": "0"})])
+    dispatcher = LLMDispatcher(initial_concurrency=8, max_concurrency=16, client=client)
+    try:
+        assert dispatcher.complete("hello", max_tokens=10) == "hello"
+    finally:
+        dispatcher.close()
+
+    stats = dispatcher.stats()
+    assert stats["rate_limited"] == 1
+    assert stats["retries"] == 1
+    assert stats["concurrency_limit"] < 8
+    assert stats["tokens_last_minute"] == 42
+
+
+def test_failure_is_raised_after_max_retries():
+    errors = [_rate_limit_error({}) for _ in range(3)]
+    dispatcher = LLMDispatcher(max_retries=2, client=_FakeClient(errors=errors))
+    try:
+        with pytest.raises(RateLimitError):
+            dispatcher.complete("hello", max_tokens=10)
+    finally:
+        dispatcher.close()
+    assert dispatcher.stats()["failures"] == 1
+
+
+def test_non_retryable_error_counts_as_failure():
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    error = BadRequestError("bad request", response=httpx.Response(400, request=request), body=None)
+    dispatcher = LLMDispatcher(client=_FakeClient(errors=[error]))
+    try:
+        with pytest.raises(BadRequestError):
+            dispatcher.complete("hello", max_tokens=10)
+    finally:
+        dispatcher.close()
+    assert dispatcher.stats()["failures"] == 1
+    assert dispatcher.stats()["retries"] == 0
+
+
+def test_in_flight_requests_stay_within_the_limit():
+    client = _FakeClient(delay=0.01)
+    dispatcher = LLMDispatcher(initial_concurrency=2, max_concurrency=2, client=client)
+    try:
+        futures = [dispatcher.submit(f"p{i}", max_tokens=10) for i in range(12)]
+        assert [f.result(timeout=5) for f in futures] == [f"p{i}" for i in range(12)]
+    finally:
+        dispatcher.close()
+    assert client.max_in_flight == 2
+
+
+def test_low_remaining_tokens_stop_growth():
+    headers = {"x-ratelimit-limit-tokens": "6000", "x-ratelimit-remaining-tokens": "100"}
+    dispatcher = LLMDispatcher(initial_concurrency=4, client=_FakeClient(headers=headers))
+    try:
+        dispatcher.complete("hello", max_tokens=10)
+    finally:
+        dispatcher.close()
+    assert dispatcher.stats()["concurrency_limit"] == 3.0
@@ -0,0 +1,130 @@
+# tests/test_llm_match.py
+
+import json
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from resume_matcher.models import llm_cache, llm_scorer
+from resume_matcher.services import matcher
+from resume_matcher.services.matcher import MatchedResume, StageTimings
+
+STAGE_SECONDS = 0.1
+
+
+class _SlowVacancyDispatcher:
+    """Answers the vacancy parse after STAGE_SECONDS * 1.5, scoring prompts at once"""
+
+    def __init__(self):
+        self.parse_submitted_at = None
+
+    def submit(self, prompt, max_tokens, **kwargs):
+        future = Future()
+        if "Extract structured requirements" in prompt:
+            self.parse_submitted_at = time.perf_counter()
+            answer = json.dumps({"job_title": "Data Engineer"})
+            threading.Timer(STAGE_SECONDS * 1.5, future.set_result, [answer]).start()
+        else:
+            future.set_result(json.dumps({"score": 80, "match_level": "good"}))
+        return future
+
+
+@pytest.fixture
+def slow_stages(monkeypatch):
+    monkeypatch.setattr(llm_cache, "get_llm_cache", lambda: None)
+    dispatcher = _SlowVacancyDispatcher()
+    monkeypatch.setattr(llm_scorer, "get_llm_dispatcher", lambda: dispatcher)
+
+    def embed(text):
+        time.sleep(STAGE_SECONDS)
+        return [1.0, 0.0]
+
+    def search(embedding, top_n, **kwargs):
+        time.sleep(STAGE_SECONDS)
+        return [MatchedResume(7, "cv.pdf", "/cv.pdf", 0.8, {"full_name": "Ann"})]
+
+    monkeypatch.setattr(matcher, "get_query_embedding", embed)
+    monkeypatch.setattr(matcher, "_find_similar_resumes", search)
+    return dispatcher
+
+
+def test_vacancy_parse_overlaps_embedding_and_search(slow_stages):
+    timings = StageTimings()
+    started = time.perf_counter()
+    requirements, scores = matcher.match_vacancy_with_llm("Data engineer vacancy", timings=timings)
+
+    # The parse was launched before stage 1 started
+    assert slow_stages.parse_submitted_at - started < STAGE_SECONDS / 2
+    assert requirements.job_title == "Data Engineer"
+    assert [s.candidate_id for s in scores] == [7]
+
+    assert timings.embedding >= STAGE_SECONDS
+    assert timings.search >= STAGE_SECONDS
+    assert timings.parse_vacancy >= STAGE_SECONDS * 1.5
+    assert timings.total < timings.embedding + timings.search + timings.parse_vacancy
+    assert timings.overlap_saved >= STAGE_SECONDS
+    assert timings.as_dict()["overlap_saved_ms"] >= STAGE_SECONDS * 1000
+
+
+def test_match_stream_emits_progress_then_final_ranking(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from resume_matcher.api.app import create_app
+
+    monkeypatch.setattr(llm_cache, "get_llm_cache", lambda: None)
+    monkeypatch.setattr(llm_scorer, "get_llm_dispatcher", _SlowVacancyDispatcher)
+
+    async def embed(text, executor=None):
+        return [1.0, 0.0]
+
+    monkeypatch.setattr(matcher, "embed_vacancy_async", embed)
+    monkeypatch.setattr(
+        matcher,
+        "_find_similar_resumes",
+        lambda embedding, top_n, **kwargs: [
+            MatchedResume(7, "a.pdf", "/a.pdf", 0.8, {"full_name": "Ann"}),
+            MatchedResume(8, "b.pdf", "/b.pdf", 0.6, {"full_name": "Bob"}),
+        ],
+    )
+
+    client = TestClient(create_app())
+    response = client.post(
+        "/match/stream",
+        json={"vacancy_text": "Data engineer vacancy", "use_llm": True, "min_score": 0},
+    )
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = []
+    for frame in response.text.strip().split("\n\n"):
+        event, data = frame.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+
+    assert [kind for kind, _ in events] == ["shortlist", "vacancy", "score", "score", "ranking"]
+    assert [m["id"] for m in events[0][1]["matches"]] == [7, 8]
+    assert events[1][1]["job_title"] == "Data Engineer"
+    assert events[3][1]["scored"] == 2 and events[3][1]["total"] == 2
+    ranking = events[-1][1]
+    assert ranking["matches_found"] == 2
+    assert [m["rank"] for m in ranking["matches"]] == [1, 2]
+    assert ranking["timings"]["total_ms"] > 0
+
+
+def test_match_stream_rejects_empty_vacancy():
+    from fastapi.testclient import TestClient
+
+    from resume_matcher.api.app import create_app
+
+    response = TestClient(create_app()).post("/match/stream", json={"vacancy_text": "  "})
+    assert response.status_code == 400
+
+
+def test_unresolved_vacancy_parse_times_out(slow_stages, monkeypatch):
+    from resume_matcher.models import llm_dispatch
+
+    monkeypatch.setattr(
+        llm_dispatch.LLMDispatcher, "completion_timeout", lambda self: STAGE_SECONDS
+    )
+    with pytest.raises(TimeoutError):
+        matcher.match_vacancy_with_llm("Data engineer vacancy", requirements_future=Future())
@@ -0,0 +1,125 @@
+# tests/test_llm_scorer.py
+
+import json
+from concurrent.futures import Future
+
+import pytest
+
+from resume_matcher.models import llm_cache, llm_scorer
+from resume_matcher.models.llm_scorer import _parse_batch_scores, pack_scoring_batches
+
+
+def _entry(ref, score=70, **extra):
+    return {"candidate": ref, "score": score, "match_level": "good", **extra}
+
+
+class _FakeDispatcher:
+    """Answers vacancy parsing, batched and single scoring prompts; records the prompts"""
+
+    def __init__(self, batch_answer):
+        self.batch_answer = batch_answer
+        self.prompts: list[str] = []
+
+    def submit(self, prompt, max_tokens, **kwargs):
+        future = Future()
+        if "Extract structured requirements" in prompt:
+            future.set_result(
+                json.dumps({"job_title": "Backend Developer", "must_have_skills": ["Python"]})
+            )
+            return future
+
+        self.prompts.append(prompt)
+        if "### Candidate" in prompt:
+            future.set_result(self.batch_answer(prompt))
+        else:
+            future.set_result(json.dumps({"score": 50, "match_level": "partial"}))
+        return future
+
+
+@pytest.fixture
+def candidates():
+    return [
+        {
+            "id": i,
+            "file_name": f"cv{i}.pdf",
+            "similarity_score": 0.5,
+            "json_data": {"full_name": f"Candidate {i}", "skills": ["Python"]},
+        }
+        for i in range(1, 6)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def no_llm_cache(monkeypatch):
+    monkeypatch.setattr(llm_cache, "get_llm_cache", lambda: None)
+
+
+def test_pack_scoring_batches_respects_size_and_token_budget():
+    assert pack_scoring_batches([10] * 5, max_size=2, token_budget=100) == [[0, 1], [2, 3], [4]]
+    assert pack_scoring_batches([60, 60, 30, 500], max_size=8, token_budget=100) == [
+        [0],
+        [1, 2],
+        [3],
+    ]
+
+
+def test_parse_batch_scores_drops_invalid_and_duplicated_entries():
+    answer = json.dumps(
+        [
+            _entry(1),
+            _entry(2, score=150),
+            {"candidate": 3, "score": 40},
+            _entry(4),
+            _entry(4, score=10),
+            _entry(9),
+        ]
+    )
+    entries = _parse_batch_scores(answer, count=5)
+    assert list(entries) == [1]
+    assert "candidate" not in entries[1]
+
+    fenced = "```json\n" + json.dumps({"candidates": [_entry(2), _entry(1)]}) + "\n```"
+    assert sorted(_parse_batch_scores(fenced, count=2)) == [1, 2]
+
+
+def test_batched_rerank_falls_back_to_single_prompts(monkeypatch, candidates):
+    # The batch answer omits candidate 2 and gives candidate 3 an invalid score
+    def batch_answer(prompt):
+        return json.dumps([_entry(1, score=90), _entry(3, score="n/a"), _entry(4), _entry(5)])
+
+    dispatcher = _FakeDispatcher(batch_answer)
+    monkeypatch.setattr(llm_scorer, "get_llm_dispatcher", lambda: dispatcher)
+
+    requirements, scores = llm_scorer.rerank_with_llm("vacancy", candidates, batch_size=5)
+
+    assert requirements.job_title == "Backend Developer"
+    assert len(scores) == 5
+    assert scores[0].candidate_id == 1 and scores[0].llm_score == 90
+    assert {s.candidate_id: s.llm_score for s in scores}[2] == 50
+    # one batched prompt, then single prompts for candidates 2 and 3
+    assert len(dispatcher.prompts) == 3
+    assert dispatcher.prompts[0].count("### Candidate") == 5
+    assert dispatcher.prompts[0].count("Job Requirements:") == 1
+
+
+def test_batch_size_one_sends_single_prompts(monkeypatch, candidates):
+    dispatcher = _FakeDispatcher(lambda prompt: "[]")
+    monkeypatch.setattr(llm_scorer, "get_llm_dispatcher", lambda: dispatcher)
+
+    _, scores = llm_scorer.rerank_with_llm("vacancy", candidates, batch_size=1)
+
+    assert len(dispatcher.prompts) == 5
+    assert all("### Candidate" not in prompt for prompt in dispatcher.prompts)
+    assert all(score.llm_score == 50 for score in scores)
+
+
+def test_start_parse_vacancy_resolves_without_blocking(monkeypatch):
+    completion = Future()
+    dispatcher = _FakeDispatcher(lambda prompt: "[]")
+    monkeypatch.setattr(dispatcher, "submit", lambda prompt, max_tokens, **kw: completion)
+    monkeypatch.setattr(llm_scorer, "get_llm_dispatcher", lambda: dispatcher)
+
+    future = llm_scorer.start_parse_vacancy("vacancy")
+    assert not future.done()
+    completion.set_result("not json")
+    assert future.result(timeout=1).job_title == "Unknown"
@@ -0,0 +1,39 @@
+# tests/test_lru_cache.py
+
+from resume_matcher.utils.lru_cache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("resume_matcher.utils.lru_cache.time.monotonic", lambda: now[0])
+    cache = LRUCache(max_entries=10, ttl_seconds=60)
+    cache.put("a", 1)
+
+    now[0] += 59
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_disabled_cache_stores_nothing():
+    cache = LRUCache(max_entries=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,42 @@
+# tests/test_resume_counts.py
+
+from contextlib import contextmanager
+
+from resume_matcher import db
+from resume_matcher.utils.lru_cache import LRUCache
+
+
+class _Cursor:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def execute(self, query, params=None):
+        self.calls.append(query)
+
+    def fetchone(self):
+        return {"total": 5, "with_embeddings": 4, "with_parsed_data": 3}
+
+
+def test_counts_are_cached_until_invalidated(monkeypatch):
+    calls = []
+
+    class _Connection:
+        @contextmanager
+        def cursor(self):
+            yield _Cursor(calls)
+
+    @contextmanager
+    def fake_connection():
+        yield _Connection()
+
+    monkeypatch.setattr(db, "get_connection", fake_connection)
+    monkeypatch.setattr(db, "_counts_cache", LRUCache(max_entries=1, ttl_seconds=60))
+
+    assert db.get_resume_counts() == {"total": 5, "with_embeddings": 4, "with_parsed_data": 3}
+    db.get_resume_counts()["total"] = 0  # callers get a copy
+    assert db.get_resume_counts()["total"] == 5
+    assert len(calls) == 1
+
+    db.invalidate_resume_counts()
+    db.get_resume_counts()
+    assert len(calls) == 2
@@ -0,0 +1,40 @@
+# tests/test_search_plan.py
+
+import numpy as np
+import pytest
+
+from resume_matcher.services.matcher import (
+    ANN_OVERFETCH_MIN,
+    CHUNK_OVERFETCH_FACTOR,
+    COARSE_OVERFETCH_FACTOR,
+    HNSW_EF_SEARCH_MAX,
+    _plan_search,
+)
+
+QUERY = np.ones(4, dtype=np.float32)
+
+
+def test_document_plan_raises_ef_search_to_the_over_fetch():
+    plan = _plan_search(QUERY, top_n=10, min_similarity=0.5, ef_search=5, tier="full")
+    assert plan.ann_limit == 10 + ANN_OVERFETCH_MIN
+    assert plan.settings[0] == str(plan.ann_limit)
+    assert plan.max_distance == 0.5
+    assert plan.exact_params["top_n"] == 10
+
+
+def test_tier_and_chunk_plans_over_fetch_more():
+    coarse = _plan_search(QUERY, top_n=10, min_similarity=0.0, tier="coarse")
+    assert coarse.params["candidates"] == coarse.ann_limit * COARSE_OVERFETCH_FACTOR
+    assert "halfvec" in coarse.query
+
+    chunks = _plan_search(QUERY, top_n=10, min_similarity=0.0, scoring="max_chunk")
+    assert chunks.ann_limit == (10 + ANN_OVERFETCH_MIN) * CHUNK_OVERFETCH_FACTOR
+    assert "resume_chunks" in chunks.query
+
+    huge = _plan_search(QUERY, top_n=900, min_similarity=0.0, tier="full")
+    assert int(huge.settings[0]) == HNSW_EF_SEARCH_MAX
+
+
+def test_unknown_scoring_is_rejected():
+    with pytest.raises(ValueError):
+        _plan_search(QUERY, top_n=10, min_similarity=0.0, scoring="nope")
@@ -0,0 +1,92 @@
+# tests/test_vector_index.py
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from resume_matcher.services.vector_index import VectorIndex
+
+T0 = datetime(2026, 1, 1)
+
+
+def _row(resume_id, file_hash, vector, minutes=0):
+    return {
+        "id": resume_id,
+        "file_hash": file_hash,
+        "updated_at": T0 + timedelta(minutes=minutes),
+        "embedding": np.asarray(vector, dtype=np.float32),
+    }
+
+
+def _index(rows, dimension=3):
+    index = VectorIndex(dimension=dimension)
+    index._upsert(rows)
+    index._update_canonical()
+    return index
+
+
+def test_search_ranks_by_cosine_and_filters():
+    index = _index(
+        [
+            _row(1, "a", [1, 0, 0]),
+            _row(2, "b", [1, 1, 0]),
+            _row(3, "c", [0, 0, 5]),
+        ]
+    )
+    results = index.search(np.array([2.0, 0.0, 0.0]), top_n=3)
+    assert [r[0] for r in results] == [1, 2, 3]
+    assert abs(results[0][1] - 1.0) < 1e-6
+    assert abs(results[1][1] - 2**-0.5) < 1e-6
+    assert abs(results[2][1]) < 1e-6
+
+    assert [r[0] for r in index.search(np.array([1.0, 0, 0]), top_n=3, min_similarity=0.9)] == [1]
+
+
+def test_duplicates_keep_latest_version_and_upserts_replace_rows():
+    index = _index(
+        [
+            _row(1, "same", [1, 0, 0], minutes=0),
+            _row(2, "same", [1, 0, 0], minutes=5),
+            _row(3, "other", [0.9, 0.1, 0]),
+        ]
+    )
+    assert [r[0] for r in index.search(np.array([1.0, 0, 0]), top_n=5)] == [2, 3]
+
+    # Row 3 changes content: updated in place, watermark advances
+    index._upsert([_row(3, "other", [0, 1, 0], minutes=10)])
+    index._update_canonical()
+    assert len(index) == 3
+    assert index.watermark == T0 + timedelta(minutes=10)
+    assert [r[0] for r in index.search(np.array([0, 1.0, 0]), top_n=1)] == [3]
+
+
+def test_updates_do_not_touch_the_published_view():
+    index = _index([_row(1, "a", [1, 0, 0]), _row(2, "b", [0, 1, 0])])
+    index._upsert([_row(3, "c", [0, 0, 1])])  # appended in place past the published rows
+    index._update_canonical()
+    view = index._view
+    published = view[0].copy()
+
+    index._upsert([_row(1, "a", [0, 0, 1], minutes=1)])
+    np.testing.assert_array_equal(view[0], published)
+    index._update_canonical()
+    assert index._view[0] is not view[0]
+    assert sorted(r[0] for r in index.search(np.array([0, 0, 1.0]), top_n=2)) == [1, 3]
+
+
+def test_retain_drops_deleted_rows_and_save_load_roundtrip(tmp_path):
+    index = _index([_row(i, f"h{i}", np.eye(3)[i % 3]) for i in range(1, 6)])
+    assert index._retain({1, 2, 4}) == 2
+    index._update_canonical()
+    assert sorted(r[0] for r in index.search(np.ones(3), top_n=10)) == [1, 2, 4]
+
+    index.save(tmp_path)
+    loaded = VectorIndex.load(tmp_path)
+    assert len(loaded) == 3
+    assert loaded.watermark == index.watermark
+    assert loaded.search(np.eye(3)[1], top_n=1)[0][0] == 1
+
+    # A memory-mapped index is copied on its first change
+    loaded._upsert([_row(9, "h9", [0, 0, 1], minutes=1)])
+    loaded._update_canonical()
+    assert len(loaded) == 4